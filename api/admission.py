@@ -0,0 +1,202 @@
+"""Contrôle d'admission : calculs concurrents bornés par vue et limite de débit par client.
+
+Chaque vue (espace de noms du cache : `standings`, `club_squad`, …) et l'export
+ont un nombre de calculs simultanés (ADMISSION_CONCURRENCY) et une file
+d'attente bornée (ADMISSION_QUEUE). Une requête qui trouve la file pleine, ou
+qui y attend plus de ADMISSION_TIMEOUT secondes, lève `Overloaded` : le cache
+sert alors la dernière valeur connue de la même clé, même d'une version
+précédente (`CACHE_STALE_TTL`), et à défaut l'API répond 503 avec
+`Retry-After`. Seuls les calculs sont limités : un succès du cache ne passe
+jamais par la file.
+
+`RateLimitMiddleware` applique en plus un seau à jetons par adresse client sur
+`/api/` (RATE_LIMIT requêtes par seconde, rafales de RATE_BURST) et répond 429.
+Derrière un proxy, lancer uvicorn avec `--proxy-headers` pour que l'adresse
+soit celle du client et non celle du proxy.
+"""
+import asyncio
+import json
+import os
+import time
+from contextlib import asynccontextmanager
+from math import ceil
+
+from api.metrics import registry as metrics
+
+ADMISSION_CONCURRENCY = int(os.getenv("ADMISSION_CONCURRENCY", "4"))  # 0 = pas de limite
+ADMISSION_QUEUE = int(os.getenv("ADMISSION_QUEUE", "32"))
+ADMISSION_TIMEOUT = float(os.getenv("ADMISSION_TIMEOUT", "2"))
+# Limites propres à certaines vues, ex. "export=1,player_profile=2"
+ADMISSION_LIMITS = os.getenv("ADMISSION_LIMITS", "export=2")
+
+RATE_LIMIT = float(os.getenv("RATE_LIMIT", "50"))  # jetons par seconde et par client, 0 = désactivé
+RATE_BURST = int(os.getenv("RATE_BURST", "100"))
+RATE_PREFIX = "/api/"
+MAX_CLIENTS = 10_000  # au-delà, les seaux pleins (clients inactifs) sont oubliés
+
+in_flight = metrics.gauge("fcsmtop_admission_in_flight", "Calculs en cours par vue.")
+queue_depth = metrics.gauge("fcsmtop_admission_queue_depth", "Requêtes en file d'attente par vue.")
+shed = metrics.counter(
+    "fcsmtop_admission_shed_total",
+    "Requêtes refusées par vue : reason=queue_full (file pleine) ou reason=timeout (attente trop longue).",
+)
+stale = metrics.counter("fcsmtop_admission_stale_total", "Requêtes refusées servies depuis une valeur périmée du cache.")
+rejected = metrics.counter("fcsmtop_admission_rejected_total", "Requêtes refusées sans valeur de repli (503).")
+rate_limited = metrics.counter("fcsmtop_rate_limited_total", "Requêtes rejetées par la limite de débit (429).")
+
+
+class Overloaded(Exception):
+    """La vue est saturée : réessayer dans `retry_after` secondes."""
+
+    def __init__(self, name: str, retry_after: int):
+        super().__init__(f"{name} saturé")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class Limiter:
+    """Sémaphore avec file d'attente bornée et attente maximale."""
+
+    def __init__(self, name: str, concurrency: int, queue: int, timeout: float):
+        self.name = name
+        self.concurrency, self.queue, self.timeout = concurrency, queue, timeout
+        self.active = self.waiting = 0
+        self._sem = asyncio.Semaphore(concurrency) if concurrency > 0 else None
+
+    @property
+    def retry_after(self) -> int:
+        return max(1, ceil(self.timeout))
+
+    def _refuse(self, reason: str) -> Overloaded:
+        shed.inc(query=self.name, reason=reason)
+        return Overloaded(self.name, self.retry_after)
+
+    async def acquire(self) -> None:
+        if self._sem is None:
+            return
+        if self._sem.locked():
+            if self.waiting >= self.queue:
+                raise self._refuse("queue_full")
+            self.waiting += 1
+            queue_depth.set(self.waiting, query=self.name)
+            try:
+                async with asyncio.timeout(self.timeout):
+                    await self._sem.acquire()
+            except TimeoutError:
+                raise self._refuse("timeout") from None
+            finally:
+                self.waiting -= 1
+                queue_depth.set(self.waiting, query=self.name)
+        else:
+            await self._sem.acquire()
+        self.active += 1
+        in_flight.set(self.active, query=self.name)
+
+    def release(self) -> None:
+        if self._sem is None:
+            return
+        self.active -= 1
+        in_flight.set(self.active, query=self.name)
+        self._sem.release()
+
+    @asynccontextmanager
+    async def slot(self):
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+
+def _overrides(spec: str) -> dict[str, int]:
+    pairs = (item.split("=", 1) for item in spec.split(",") if "=" in item)
+    return {name.strip(): int(value) for name, value in pairs}
+
+
+class Admission:
+    def __init__(self):
+        self._limiters: dict[str, Limiter] = {}
+        self.configure()
+
+    def configure(self, concurrency: int = None, queue: int = None, timeout: float = None, limits: str = None) -> None:
+        """(Re)définit les limites ; les limiteurs sont recréés à leur prochaine utilisation."""
+        self.concurrency = ADMISSION_CONCURRENCY if concurrency is None else concurrency
+        self.queue = ADMISSION_QUEUE if queue is None else queue
+        self.timeout = ADMISSION_TIMEOUT if timeout is None else timeout
+        self.overrides = _overrides(ADMISSION_LIMITS if limits is None else limits)
+        self._limiters.clear()
+
+    def limiter(self, name: str) -> Limiter:
+        limiter = self._limiters.get(name)
+        if limiter is None:
+            concurrency = self.overrides.get(name, self.concurrency)
+            limiter = self._limiters[name] = Limiter(name, concurrency, self.queue, self.timeout)
+        return limiter
+
+
+admission = Admission()
+
+
+class TokenBucket:
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, tokens: float, now: float):
+        self.tokens, self.updated = tokens, now
+
+
+class RateLimiter:
+    """Seaux à jetons par client, remplis à `rate` jetons/s jusqu'à `burst`."""
+
+    def __init__(self, rate: float = RATE_LIMIT, burst: int = RATE_BURST, max_clients: int = MAX_CLIENTS):
+        self.rate, self.burst, self.max_clients = rate, burst, max_clients
+        self._buckets: dict[str, TokenBucket] = {}
+
+    def take(self, client: str) -> float:
+        """Consomme un jeton : 0 si la requête passe, sinon l'attente avant le prochain jeton."""
+        now = time.monotonic()
+        bucket = self._buckets.get(client)
+        if bucket is None:
+            if len(self._buckets) >= self.max_clients:
+                self._prune(now)
+            bucket = self._buckets[client] = TokenBucket(self.burst, now)
+        else:
+            bucket.tokens = min(self.burst, bucket.tokens + (now - bucket.updated) * self.rate)
+            bucket.updated = now
+        if bucket.tokens >= 1:
+            bucket.tokens -= 1
+            return 0.0
+        return (1 - bucket.tokens) / self.rate
+
+    def _prune(self, now: float) -> None:
+        full = self.burst / self.rate
+        for client in [c for c, b in self._buckets.items() if now - b.updated >= full]:
+            del self._buckets[client]
+
+
+class RateLimitMiddleware:
+    """Middleware ASGI : 429 avec `Retry-After` quand un client dépasse son débit."""
+
+    def __init__(self, app, rate: float = RATE_LIMIT, burst: int = RATE_BURST):
+        self.app = app
+        self.limiter = RateLimiter(rate, burst) if rate > 0 else None
+
+    async def __call__(self, scope, receive, send):
+        if self.limiter is None or scope["type"] != "http" or not scope["path"].startswith(RATE_PREFIX):
+            return await self.app(scope, receive, send)
+        client = scope.get("client")
+        wait = self.limiter.take(client[0] if client else "-")
+        if not wait:
+            return await self.app(scope, receive, send)
+
+        rate_limited.inc()
+        body = json.dumps({"detail": "Trop de requêtes"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(max(1, ceil(wait))).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,162 @@
+"""Archive colonnaire des saisons closes : un fichier compressé par saison.
+
+Une saison terminée ne change plus ; `scripts/archive_season.py` la fige dans
+`ARCHIVE_DIR/<saison>.fcsa` et peut retirer ses lignes des tables vivantes
+(`matches`, `goals`, `assists`, `cards`), qui ne gardent que les saisons
+actives. Les lectures passent ensuite par ce fichier, ouvert en mémoire
+mappée (`mmap`) : seules les colonnes demandées sont lues et décompressées.
+
+Format :
+    b"FCSA\\x01" | longueur de l'en-tête (u32 LE) | en-tête JSON | blocs
+Chaque colonne est un bloc zlib des octets bruts d'un tableau NumPy ; l'en-tête
+donne par table le nombre de lignes et, par colonne, dtype, position et
+taille du bloc, ainsi que les ligues et équipes de la saison. Les valeurs
+NULL sont codées comme dans `api.columnar` (-1 pour un score ou une minute,
+NaT pour une date). Les tables sont complètes : `archive_season.py --restore`
+les réinsère à l'identique.
+
+Lire une archive demande NumPy ; sans lui, `has()` répond toujours non.
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import zlib
+from functools import cached_property
+from typing import Optional
+
+try:
+    import numpy as np
+except ImportError:  # sans NumPy, pas d'archive : tout passe par SQL
+    np = None
+
+ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", "./archives")
+MAGIC = b"FCSA\x01"
+SUFFIX = ".fcsa"
+LEVEL = 6
+
+# Colonnes archivées par table, dans l'ordre des modèles
+TABLES = {
+    "matches": ("id", "matchday", "match_date", "home_team_id", "away_team_id", "home_score", "away_score", "played"),
+    "goals": ("id", "match_id", "scorer_id", "minute", "own_goal", "penalty"),
+    "assists": ("id", "match_id", "player_id", "minute"),
+    "cards": ("id", "match_id", "player_id", "red", "minute"),
+}
+
+
+def path(season: str) -> str:
+    return os.path.join(ARCHIVE_DIR, f"{season}{SUFFIX}")
+
+
+def seasons() -> list[str]:
+    """Saisons archivées, la plus récente d'abord."""
+    if np is None or not os.path.isdir(ARCHIVE_DIR):
+        return []
+    return sorted((f[:-len(SUFFIX)] for f in os.listdir(ARCHIVE_DIR) if f.endswith(SUFFIX)), reverse=True)
+
+
+def has(season: str) -> bool:
+    return np is not None and os.path.isfile(path(season))
+
+
+def write(season: str, tables: dict[str, dict[str, "np.ndarray"]], leagues: list[str], teams: list[int]) -> dict:
+    """Écrit l'archive de `season` (fichier temporaire puis renommage) et renvoie son en-tête."""
+    blocks, layout, offset = [], {}, 0
+    digest = hashlib.sha256()
+    for table, columns in TABLES.items():
+        rows = len(tables[table][columns[0]])
+        layout[table] = {"rows": rows, "columns": {}}
+        for name in columns:
+            array = np.ascontiguousarray(tables[table][name])
+            block = zlib.compress(array.tobytes(), LEVEL)
+            layout[table]["columns"][name] = {"dtype": array.dtype.str, "offset": offset, "size": len(block)}
+            blocks.append(block)
+            digest.update(block)
+            offset += len(block)
+    header = {"season": season, "leagues": leagues, "teams": teams, "checksum": digest.hexdigest()[:16], "tables": layout}
+    raw_header = json.dumps(header, separators=(",", ":")).encode()
+
+    os.makedirs(ARCHIVE_DIR, exist_ok=True)
+    tmp = path(season) + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC + struct.pack("<I", len(raw_header)) + raw_header)
+        for block in blocks:
+            f.write(block)
+    os.replace(tmp, path(season))
+    _open.pop(season, None)
+    return header
+
+
+class SeasonArchive:
+    """Archive d'une saison ouverte en mémoire mappée ; colonnes décompressées à la demande."""
+
+    def __init__(self, file_path: str):
+        with open(file_path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{file_path} n'est pas une archive de saison")
+        (length,) = struct.unpack_from("<I", self._mm, len(MAGIC))
+        start = len(MAGIC) + 4
+        self.header = json.loads(self._mm[start:start + length])
+        self._data = memoryview(self._mm)[start + length:]
+        self.mtime = os.path.getmtime(file_path)
+
+    @property
+    def season(self) -> str:
+        return self.header["season"]
+
+    def column(self, table: str, name: str) -> "np.ndarray":
+        meta = self.header["tables"][table]["columns"][name]
+        raw = zlib.decompress(self._data[meta["offset"]:meta["offset"] + meta["size"]])
+        return np.frombuffer(raw, dtype=meta["dtype"])
+
+    def table(self, table: str, columns: Optional[tuple[str, ...]] = None) -> dict[str, "np.ndarray"]:
+        return {name: self.column(table, name) for name in columns or TABLES[table]}
+
+    @cached_property
+    def _player_totals(self) -> dict[int, dict]:
+        goals = self.table("goals", ("match_id", "scorer_id", "own_goal", "penalty"))
+        assists = self.table("assists", ("match_id", "player_id"))
+        cards = self.table("cards", ("match_id", "player_id", "red"))
+        scored = ~goals["own_goal"]
+
+        def per_player(players: "np.ndarray") -> dict[int, int]:
+            values, counts = np.unique(players, return_counts=True)
+            return dict(zip(values.tolist(), counts.tolist()))
+
+        stats = {
+            "goals": per_player(goals["scorer_id"][scored]),
+            "penalties": per_player(goals["scorer_id"][scored & goals["penalty"]]),
+            "assists": per_player(assists["player_id"]),
+            "yellow_cards": per_player(cards["player_id"][~cards["red"]]),
+            "red_cards": per_player(cards["player_id"][cards["red"]]),
+        }
+        # Matchs distincts avec au moins un événement du joueur
+        events = np.stack([
+            np.concatenate([goals["scorer_id"], assists["player_id"], cards["player_id"]]),
+            np.concatenate([goals["match_id"], assists["match_id"], cards["match_id"]]),
+        ], axis=1)
+        involved = per_player(np.unique(events, axis=0)[:, 0])
+        return {pid: {**{k: v.get(pid, 0) for k, v in stats.items()}, "matches": n} for pid, n in involved.items()}
+
+    def player_totals(self) -> dict[int, dict]:
+        """Totaux de la saison par joueur (mêmes règles que `api.services`), calculés une fois."""
+        return self._player_totals
+
+
+_open: dict[str, SeasonArchive] = {}
+
+
+def open_season(season: str) -> SeasonArchive:
+    """Archive de la saison, rouverte si le fichier a été réécrit depuis."""
+    archive = _open.get(season)
+    if archive is None or archive.mtime != os.path.getmtime(path(season)):
+        archive = _open[season] = SeasonArchive(path(season))
+    return archive
+
+
+def player_totals(season: str, player_ids: list[int]) -> dict[int, dict]:
+    """Totaux de saison des joueurs `player_ids` ayant au moins un événement."""
+    totals = open_season(season).player_totals()
+    return {pid: totals[pid] for pid in player_ids if pid in totals}
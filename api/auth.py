@@ -0,0 +1,23 @@
+"""Authentification des routes d'administration (jeton unique, en-tête `Authorization: Bearer`).
+
+Sans ADMIN_TOKEN défini, les routes protégées répondent 503 : l'API reste en
+lecture seule par défaut.
+"""
+import hmac
+import os
+from typing import Optional
+
+from fastapi import Depends, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+_bearer = HTTPBearer(auto_error=False)
+
+
+async def require_admin(credentials: Optional[HTTPAuthorizationCredentials] = Depends(_bearer)) -> None:
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=503, detail="Écritures désactivées (ADMIN_TOKEN non défini)")
+    if credentials is None or not hmac.compare_digest(credentials.credentials.encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=401, detail="Jeton d'administration invalide",
+                            headers={"WWW-Authenticate": "Bearer"})
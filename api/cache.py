@@ -0,0 +1,285 @@
+"""Cache de résultats partagé entre les workers d'un même hôte.
+
+Les clés incluent la version des données de la portée concernée — une saison,
+ou une ligue dans une saison (`api.seasons.league_scope`) : un `bump(scope)`
+rend d'un coup toutes les entrées de cette portée obsolètes. Les entrées d'une
+saison close n'expirent pas.
+Avec un backend partagé (`CACHE_URL=sqlite:///…`), ce compteur de version vit
+dans le même fichier pour tous les processus uvicorn — l'incrément est donc
+vu par chaque worker sans messagerie, au plus CACHE_VERSIONS_TTL secondes plus
+tard (immédiatement dans le processus qui l'a fait). Les accès à un backend
+bloquant (`blocking = True`) passent par un thread pour ne pas figer la boucle.
+
+Chaque calcul passe par le contrôle d'admission de sa vue (`api.admission`) ;
+une copie sans version de chaque valeur est gardée CACHE_STALE_TTL secondes et
+servie à la place d'un 503 quand la vue est saturée.
+
+Backends fournis :
+    memory://                       LRU local au processus, CACHE_MAX_ENTRIES entrées (défaut, dev)
+    sqlite:///./fcsmtop-cache.db    fichier SQLite en WAL partagé par les workers
+
+D'autres adaptateurs se branchent via `register_backend(scheme, factory)`.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Optional
+
+from fastapi.encoders import jsonable_encoder
+
+from api.admission import Overloaded, admission, stale
+from api.metrics import registry as metrics
+from api.seasons import CLOSED_TTL, closed, league_scope, season_of
+from api.singleflight import flights, in_session
+
+CACHE_URL = os.getenv("CACHE_URL", "memory://")
+CACHE_TTL = int(os.getenv("CACHE_TTL", "300"))
+CACHE_STALE_TTL = int(os.getenv("CACHE_STALE_TTL", "86400"))
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+CACHE_VERSIONS_TTL = float(os.getenv("CACHE_VERSIONS_TTL", "1"))
+
+ALL = "*"  # portée globale, incluse dans toutes les clés (ex. modification des équipes)
+
+# Vrai le temps d'un profil « à froid » (api/routers/admin.py) ou de la passe à froid de bench.run :
+# le cache est recalculé au lieu d'être lu
+skip_reads: ContextVar[bool] = ContextVar("fcsmtop_cache_skip_reads", default=False)
+
+requests = metrics.counter("fcsmtop_cache_requests_total", "Lectures du cache par espace de noms et résultat.")
+
+
+class CacheBackend:
+    """Interface minimale d'un backend : valeurs binaires avec TTL + compteurs de version."""
+
+    blocking = False  # vrai si get/set font des E/S : appelés hors de la boucle d'événements
+
+    def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, ttl: int) -> None:
+        raise NotImplementedError
+
+    def versions(self, scopes: tuple[str, ...]) -> dict[str, int]:
+        raise NotImplementedError
+
+    def bump(self, scope: str) -> int:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+
+class MemoryBackend(CacheBackend):
+    """LRU borné à CACHE_MAX_ENTRIES : après un `bump`, les entrées des versions
+    précédentes ne sont plus jamais lues et finissent évincées."""
+
+    PURGE_EVERY = 500
+
+    def __init__(self, url: str = "memory://", max_entries: int = CACHE_MAX_ENTRIES):
+        self._data: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._versions: dict[str, int] = {}
+        self.max_entries = max_entries
+        self._writes = 0
+
+    def get(self, key):
+        entry = self._data.get(key)
+        if entry is None or entry[0] < time.time():
+            self._data.pop(key, None)
+            return None
+        self._data.move_to_end(key)
+        return entry[1]
+
+    def set(self, key, value, ttl):
+        now = time.time()
+        self._data[key] = (now + ttl, value)
+        self._data.move_to_end(key)
+        self._writes += 1
+        if self._writes % self.PURGE_EVERY == 0:
+            for k in [k for k, (expires, _) in self._data.items() if expires < now]:
+                del self._data[k]
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def versions(self, scopes):
+        return {s: self._versions.get(s, 0) for s in scopes}
+
+    def bump(self, scope):
+        self._versions[scope] = self._versions.get(scope, 0) + 1
+        return self._versions[scope]
+
+    def clear(self):
+        self._data.clear()
+
+
+class SQLiteBackend(CacheBackend):
+    """Fichier SQLite en WAL : lectures concurrentes sans verrou, une écriture à la fois.
+
+    La table des versions est relue au plus toutes les CACHE_VERSIONS_TTL
+    secondes : un `bump` d'un autre processus peut donc servir l'ancienne
+    génération pendant cette fenêtre.
+    """
+
+    PURGE_EVERY = 500
+    blocking = True
+
+    def __init__(self, url: str, versions_ttl: float = CACHE_VERSIONS_TTL):
+        self.path = url.split("sqlite:///", 1)[1] or "fcsmtop-cache.db"
+        self._local = threading.local()
+        self._writes = 0
+        self.versions_ttl = versions_ttl
+        self._versions: dict[str, int] = {}
+        self._versions_read = 0.0
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        # Une connexion par (processus, thread) : jamais partagée à travers un fork
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value BLOB, expires REAL)")
+            conn.execute("CREATE TABLE IF NOT EXISTS versions (scope TEXT PRIMARY KEY, version INTEGER)")
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def get(self, key):
+        row = self._conn.execute("SELECT value, expires FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None or row[1] < time.time():
+            return None
+        return row[0]
+
+    def set(self, key, value, ttl):
+        now = time.time()
+        self._conn.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?)", (key, value, now + ttl))
+        self._writes += 1
+        if self._writes % self.PURGE_EVERY == 0:
+            self._conn.execute("DELETE FROM entries WHERE expires < ?", (now,))
+
+    def versions(self, scopes):
+        # Appelé à chaque requête : la table (une ligne par portée) est relue en entier, rarement
+        now = time.monotonic()
+        if now - self._versions_read > self.versions_ttl:
+            self._versions = dict(self._conn.execute("SELECT scope, version FROM versions").fetchall())
+            self._versions_read = now
+        return {s: self._versions.get(s, 0) for s in scopes}
+
+    def bump(self, scope):
+        conn = self._conn
+        conn.execute(
+            "INSERT INTO versions VALUES (?, 1) ON CONFLICT(scope) DO UPDATE SET version = version + 1",
+            (scope,),
+        )
+        version = conn.execute("SELECT version FROM versions WHERE scope = ?", (scope,)).fetchone()[0]
+        self._versions[scope] = version
+        return version
+
+    def clear(self):
+        self._conn.execute("DELETE FROM entries")
+
+
+_BACKENDS: dict[str, Callable[[str], CacheBackend]] = {
+    "memory": MemoryBackend,
+    "sqlite": SQLiteBackend,
+}
+
+
+def register_backend(scheme: str, factory: Callable[[str], CacheBackend]) -> None:
+    _BACKENDS[scheme] = factory
+
+
+def backend_from_url(url: str) -> CacheBackend:
+    scheme = url.split("://", 1)[0]
+    if scheme not in _BACKENDS:
+        raise ValueError(f"Backend de cache inconnu : {scheme!r} (disponibles : {', '.join(_BACKENDS)})")
+    return _BACKENDS[scheme](url)
+
+
+class Cache:
+    def __init__(self, backend: CacheBackend, ttl: int = CACHE_TTL):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = self.misses = 0
+
+    def key(self, namespace: str, scope: str, args: tuple) -> str:
+        v = self.backend.versions((scope, ALL))
+        return f"{namespace}:{scope}:v{v[scope]}.{v[ALL]}:{self._digest(args)}"
+
+    def stale_key(self, namespace: str, scope: str, args: tuple) -> str:
+        """Clé sans version : dernière valeur calculée, quelle que soit la version."""
+        return f"{namespace}:{scope}:stale:{self._digest(args)}"
+
+    @staticmethod
+    def _digest(args: tuple) -> str:
+        return hashlib.sha1(repr(args).encode()).hexdigest()[:16]
+
+    def version(self, scope: str) -> int:
+        return self.backend.versions((scope,))[scope]
+
+    def bump(self, scope: str = ALL) -> int:
+        """Invalide toutes les entrées de `scope` (une saison, ou tout le cache avec ALL)."""
+        return self.backend.bump(scope)
+
+    def bump_leagues(self, season: str, leagues) -> int:
+        """Après une écriture : invalide les ligues touchées et les vues transverses de la saison."""
+        for league in leagues:
+            self.backend.bump(league_scope(league, season))
+        return self.backend.bump(season)
+
+    def ttl_for(self, scope: str) -> int:
+        return CLOSED_TTL if closed(season_of(scope)) else self.ttl
+
+    async def _io(self, fn: Callable, *args) -> Any:
+        if self.backend.blocking:
+            return await asyncio.to_thread(fn, *args)
+        return fn(*args)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    async def get_or_compute(
+        self, namespace: str, scope: str, args: tuple, compute: Callable[[], Awaitable[Any]], ttl: int = None
+    ) -> Any:
+        key = self.key(namespace, scope, args)
+        raw = None if skip_reads.get() else await self._io(self.backend.get, key)
+        if raw is not None:
+            self.hits += 1
+            requests.inc(namespace=namespace, result="hit")
+            return json.loads(raw)
+        self.misses += 1
+        requests.inc(namespace=namespace, result="miss")
+
+        stale_key = self.stale_key(namespace, scope, args)
+
+        async def fill():
+            try:
+                async with admission.limiter(namespace).slot():
+                    value = jsonable_encoder(await compute())
+            except Overloaded:
+                raw = await self._io(self.backend.get, stale_key)
+                if raw is None:
+                    raise
+                stale.inc(query=namespace)
+                return json.loads(raw)
+            encoded = json.dumps(value, separators=(",", ":")).encode()
+            await self._io(self.backend.set, key, encoded, ttl or self.ttl_for(scope))
+            await self._io(self.backend.set, stale_key, encoded, CACHE_STALE_TTL)
+            return value
+
+        # Juste après une invalidation, les requêtes concurrentes partagent un seul recalcul
+        return await flights.do(key, fill, name=namespace)
+
+
+cache = Cache(backend_from_url(CACHE_URL))
+
+
+async def cached(scope: str, fn: Callable[..., Awaitable[Any]], *args) -> Any:
+    """Résultat de `fn(db, *args)` depuis le cache, calculé dans une session dédiée en cas d'absence."""
+    return await cache.get_or_compute(fn.__name__.lstrip("_"), scope, args, lambda: in_session(fn, *args))
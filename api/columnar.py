@@ -0,0 +1,561 @@
+"""Magasin colonnaire en mémoire (NumPy) pour les vues les plus lues.
+
+Classement, buteurs, passeurs, matchs et forme d'un club se réduisent à de
+l'arithmétique sur quelques centaines de matchs par saison. Plutôt que de
+relire et d'hydrater des lignes à chaque calcul, chaque saison est chargée une
+fois en tableaux (une colonne par champ : matchs, buts, passes, cartons) et les
+vues sont calculées par opérations vectorisées (masques, `bincount`, `lexsort`).
+
+Les colonnes sont partitionnées par (ligue, saison) : une ligue ou une saison
+de plus ne ralentit pas les vues des autres, et seule la saison courante est
+chargée au démarrage (les autres au premier besoin). La base reste la source
+de vérité : une partition est rechargée dès que sa version de cache change
+(`cache.bump_leagues(season, [league])`, ou `cache.bump(ALL)` qui recharge
+aussi les joueurs), quel que soit le processus qui a écrit, ou sur
+`store.invalidate()`. Une saison archivée (`api.archive`) est lue depuis son
+fichier et non plus en base. Les fonctions du bas de fichier ont les
+signatures de `api.services` et renvoient les mêmes lignes ; sans NumPy ou
+avec COLUMNAR_STORE=0, elles délèguent à la requête SQL, sauf pour une saison
+archivée, servie par le magasin dans tous les cas. Les analyses (tranches
+horaires, premier but, formes glissantes) restent calculées en SQL pour les
+saisons en base et ne passent par le magasin que pour une saison archivée.
+
+Écart assumé avec un magasin « patché » en place à chaque écriture : une
+écriture recharge toute la partition touchée (~300 matchs, quelques dizaines
+de ms, une fois par lot et non par requête), et un `bump(ALL)` relit aussi
+tous les joueurs. Patcher les tableaux depuis les lignes d'`apply_matchday`
+ne servirait qu'au worker qui a écrit (les autres ne voient que la version)
+et dupliquerait en NumPy le remplacement des événements d'un match mis à jour.
+"""
+import asyncio
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api import archive, models, services
+from api.cache import ALL, cache
+from api.seasons import CURRENT_SEASON, league_scope
+from api.services import DEFAULT_LEAGUE
+from api.shaping import Fields
+from api.teams import TeamInfo, registry as teams
+
+try:
+    import numpy as np
+except ImportError:  # NumPy est optionnel : les vues passent alors par SQL
+    np = None
+
+ENABLED = np is not None and os.getenv("COLUMNAR_STORE", "1") != "0"
+NO_SCORE = -1  # score NULL (match non joué)
+NO_MINUTE = -1  # minute NULL
+
+
+@dataclass
+class SeasonColumns:
+    """Une saison en colonnes ; les événements pointent vers leur match par indice."""
+    match_id: "np.ndarray"
+    matchday: "np.ndarray"
+    match_date: "np.ndarray"      # datetime64[D], NaT si inconnue
+    home: "np.ndarray"
+    away: "np.ndarray"
+    home_score: "np.ndarray"      # NO_SCORE si NULL
+    away_score: "np.ndarray"
+    played: "np.ndarray"
+    goal_id: "np.ndarray"
+    goal_match: "np.ndarray"
+    goal_scorer: "np.ndarray"
+    goal_minute: "np.ndarray"
+    goal_own: "np.ndarray"
+    goal_penalty: "np.ndarray"
+    assist_match: "np.ndarray"
+    assist_player: "np.ndarray"
+    card_match: "np.ndarray"
+    card_player: "np.ndarray"
+    card_red: "np.ndarray"
+    card_minute: "np.ndarray"     # NO_MINUTE si NULL
+
+    def team_totals(self) -> dict[int, dict]:
+        """Totaux de classement par équipe (matchs joués, scores NULL comptés 0 comme en SQL)."""
+        p = self.played
+        home, away = self.home[p], self.away[p]
+        hs, as_ = np.maximum(self.home_score[p], 0), np.maximum(self.away_score[p], 0)
+        if not home.size:
+            return {}
+        n = int(max(home.max(), away.max())) + 1
+
+        def per_team(home_weights, away_weights):
+            return (np.bincount(home, home_weights, n) + np.bincount(away, away_weights, n)).astype(np.int64)
+
+        played = per_team(None, None)
+        totals = {
+            "played": played,
+            "won": per_team(hs > as_, as_ > hs),
+            "drawn": per_team(hs == as_, hs == as_),
+            "lost": per_team(hs < as_, as_ < hs),
+            "goals_for": per_team(hs, as_),
+            "goals_against": per_team(as_, hs),
+        }
+        return {int(t): {k: int(v[t]) for k, v in totals.items()} for t in np.flatnonzero(played)}
+
+    def recent(self, team_id: int, last: int) -> list[dict]:
+        """Derniers matchs joués d'une équipe : date décroissante (NULL en dernier), puis id décroissant."""
+        idx = np.flatnonzero(self.played & ((self.home == team_id) | (self.away == team_id)))
+        dates = self.match_date[idx]
+        date_key = np.where(np.isnat(dates), np.iinfo(np.int64).min, dates.astype(np.int64))
+        idx = idx[np.lexsort((-self.match_id[idx], -date_key))][:last]
+        return [
+            {
+                "id": int(self.match_id[i]),
+                "matchday": int(self.matchday[i]),
+                "match_date": self.match_date[i].item(),
+                "home_team_id": int(self.home[i]),
+                "away_team_id": int(self.away[i]),
+                "home_score": None if self.home_score[i] == NO_SCORE else int(self.home_score[i]),
+                "away_score": None if self.away_score[i] == NO_SCORE else int(self.away_score[i]),
+            }
+            for i in idx
+        ]
+
+    def chronological(self, team_id: int) -> "np.ndarray":
+        """Indices des matchs joués d'une équipe par date (NULL d'abord, comme SQLite), journée puis id."""
+        idx = np.flatnonzero(self.played & ((self.home == team_id) | (self.away == team_id)))
+        dates = self.match_date[idx]
+        date_key = np.where(np.isnat(dates), np.iinfo(np.int64).min, dates.astype(np.int64))
+        return idx[np.lexsort((self.match_id[idx], self.matchday[idx], date_key))]
+
+    def rolling(self, team_id: int, window: int) -> list[dict]:
+        """Forme glissante d'une équipe sur `window` matchs (mêmes colonnes que `services.club_rolling`)."""
+        idx = self.chronological(team_id)
+        home = self.home[idx] == team_id
+        hs, as_ = np.maximum(self.home_score[idx], 0), np.maximum(self.away_score[idx], 0)
+        gf, ga = np.where(home, hs, as_), np.where(home, as_, hs)
+        points = np.where(gf > ga, 3, np.where(gf == ga, 1, 0))
+        count = _window_count(idx.size, window)
+        sum_gf, sum_ga, sum_points = (_window_sum(v, window) for v in (gf, ga, points))
+        return [
+            {
+                "id": int(self.match_id[m]),
+                "matchday": int(self.matchday[m]),
+                "match_date": self.match_date[m].item(),
+                "opponent_id": int(self.away[m] if home[i] else self.home[m]),
+                "goals_for": int(gf[i]),
+                "goals_against": int(ga[i]),
+                "points": int(points[i]),
+                "window_matches": int(count[i]),
+                "rolling_goals_for": int(sum_gf[i]) / int(count[i]),
+                "rolling_goals_against": int(sum_ga[i]) / int(count[i]),
+                "rolling_points": int(sum_points[i]),
+            }
+            for i, m in enumerate(idx)
+        ]
+
+    def player_rolling(self, player_id: int, team_id: int, window: int) -> list[dict]:
+        """Buts (hors CSC) et passes d'un joueur sur les matchs de son équipe (colonnes de `services.player_rolling`)."""
+        idx = self.chronological(team_id)
+        n = self.match_id.size
+        scored = (self.goal_scorer == player_id) & ~self.goal_own
+        goals = np.bincount(self.goal_match[scored], minlength=n)[idx]
+        assists = np.bincount(self.assist_match[self.assist_player == player_id], minlength=n)[idx]
+        count = _window_count(idx.size, window)
+        sum_goals, sum_assists = _window_sum(goals, window), _window_sum(assists, window)
+        return [
+            {
+                "id": int(self.match_id[m]),
+                "matchday": int(self.matchday[m]),
+                "match_date": self.match_date[m].item(),
+                "opponent_id": int(self.away[m] if self.home[m] == team_id else self.home[m]),
+                "goals": int(goals[i]),
+                "assists": int(assists[i]),
+                "window_matches": int(count[i]),
+                "rolling_goals": int(sum_goals[i]),
+                "rolling_assists": int(sum_assists[i]),
+            }
+            for i, m in enumerate(idx)
+        ]
+
+
+def _window_count(n: int, window: int) -> "np.ndarray":
+    return np.minimum(np.arange(1, n + 1), window)
+
+
+def _window_sum(values: "np.ndarray", window: int) -> "np.ndarray":
+    """Somme sur les `window` dernières valeurs (ROWS BETWEEN window - 1 PRECEDING AND CURRENT ROW)."""
+    total = np.cumsum(values, dtype=np.int64)
+    return total - np.concatenate([np.zeros(window, dtype=np.int64), total])[:total.size]
+
+
+def _bucket(minutes: "np.ndarray") -> "np.ndarray":
+    """Tranche de 15 minutes, mêmes règles que `services._bucket`."""
+    return np.where(minutes > 90, 5, np.where(minutes < 1, 0, (minutes - 1) // 15))
+
+
+def _archived(a: "archive.SeasonArchive", team_ids: list[int]) -> SeasonColumns:
+    """Colonnes d'une ligue lues dans l'archive de la saison (mêmes conventions que le chargement SQL)."""
+    m = a.table("matches")
+    keep = np.isin(m["home_team_id"], team_ids)
+    order = np.argsort(m["id"][keep], kind="stable")
+    m = {name: values[keep][order] for name, values in m.items()}
+    match_id = m["id"].astype(np.int64)
+
+    def events(table: str, columns: tuple[str, ...]) -> dict:
+        t = a.table(table, ("match_id", *columns))
+        mine = np.isin(t["match_id"], match_id)
+        return {"match": np.searchsorted(match_id, t["match_id"][mine]), **{c: t[c][mine] for c in columns}}
+
+    goals = events("goals", ("id", "scorer_id", "minute", "own_goal", "penalty"))
+    assists = events("assists", ("player_id",))
+    cards = events("cards", ("player_id", "red", "minute"))
+    return SeasonColumns(
+        match_id=match_id,
+        matchday=m["matchday"].astype(np.int64),
+        match_date=m["match_date"].astype("datetime64[D]"),
+        home=m["home_team_id"].astype(np.int64),
+        away=m["away_team_id"].astype(np.int64),
+        home_score=m["home_score"].astype(np.int64),
+        away_score=m["away_score"].astype(np.int64),
+        played=m["played"].astype(bool),
+        goal_id=goals["id"].astype(np.int64),
+        goal_match=goals["match"],
+        goal_scorer=goals["scorer_id"].astype(np.int64),
+        goal_minute=goals["minute"].astype(np.int64),
+        goal_own=goals["own_goal"].astype(bool),
+        goal_penalty=goals["penalty"].astype(bool),
+        assist_match=assists["match"],
+        assist_player=assists["player_id"].astype(np.int64),
+        card_match=cards["match"],
+        card_player=cards["player_id"].astype(np.int64),
+        card_red=cards["red"].astype(bool),
+        card_minute=cards["minute"].astype(np.int64),
+    )
+
+
+def _ranked(player_ids: "np.ndarray", limit: Optional[int]) -> tuple:
+    """(ids, effectifs, ordre, inverse) : `ordre` classe par effectif décroissant puis id croissant, comme en SQL."""
+    ids, inverse, counts = np.unique(player_ids, return_inverse=True, return_counts=True)
+    order = np.lexsort((ids, -counts))[:limit]
+    return ids, counts, order, inverse
+
+
+class LeagueStore:
+    def __init__(self):
+        self._seasons: dict[tuple[str, str], SeasonColumns] = {}  # (ligue, saison) -> colonnes
+        self._versions: dict[tuple[str, str], tuple[int, int]] = {}
+        self._players: dict[int, tuple[str, str]] = {}
+        self._player_team = np.zeros(0, dtype=np.int64) if np is not None else None
+        self._players_version: Optional[int] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return ENABLED
+
+    def invalidate(self, league: Optional[str] = None, season: Optional[str] = None) -> None:
+        """Force le rechargement d'une partition (ou de tout) à la prochaine lecture."""
+        if league is None:
+            self._versions.clear()
+            self._players_version = None
+        else:
+            self._versions.pop((league, season), None)
+
+    async def load(self, db: AsyncSession) -> None:
+        """Chargement au démarrage : joueurs puis la saison courante de chaque ligue."""
+        if not ENABLED:
+            return
+        await teams.ensure(db)
+        for league in teams.leagues():
+            await self.season(db, CURRENT_SEASON, league)
+
+    async def season(self, db: AsyncSession, season: str, league: str) -> Optional[SeasonColumns]:
+        """Colonnes à jour d'une ligue pour une saison (rechargées si une écriture a changé sa version)."""
+        if not ENABLED and not archive.has(season):
+            return None
+        key, partition = (league, season), league_scope(league, season)
+        versions = cache.backend.versions((partition, ALL))
+        current = (versions[partition], versions[ALL])
+        if self._versions.get(key) == current:
+            return self._seasons[key]
+        async with self._lock:
+            if self._versions.get(key) != current:
+                if self._players_version != current[1]:
+                    await self._load_players(db)
+                    self._players_version = current[1]
+                    self._versions = {k: v for k, v in self._versions.items() if v[1] == current[1]}
+                self._seasons[key] = await self._load_season(db, season, league)
+                self._versions[key] = current
+        return self._seasons[key]
+
+    async def _load_players(self, db: AsyncSession) -> None:
+        rows = (await db.execute(
+            select(models.Player.id, models.Player.first_name, models.Player.last_name, models.Player.team_id)
+        )).all()
+        player_team = np.full(max((r[0] for r in rows), default=-1) + 1, -1, dtype=np.int64)
+        for player_id, _, _, team_id in rows:
+            player_team[player_id] = team_id
+        self._players = {r[0]: (r[1], r[2]) for r in rows}
+        self._player_team = player_team
+
+    async def _load_season(self, db: AsyncSession, season: str, league: str) -> SeasonColumns:
+        M = models.Match
+        await teams.ensure(db)
+        if archive.has(season):
+            cols = _archived(archive.open_season(season), [t.id for t in teams.by_league(league)])
+            await self._check_players(db, cols)
+            return cols
+        # Les deux équipes d'un match sont de la même ligue : l'équipe à domicile suffit
+        in_partition = (M.season == season, M.home_team_id.in_([t.id for t in teams.by_league(league)]))
+        matches = (await db.execute(
+            select(M.id, M.matchday, M.match_date, M.home_team_id, M.away_team_id,
+                   M.home_score, M.away_score, M.played)
+            .where(*in_partition).order_by(M.id)
+        )).all()
+        match_id = np.array([m[0] for m in matches], dtype=np.int64)
+        goals = (await db.execute(
+            select(models.Goal.match_id, models.Goal.scorer_id, models.Goal.minute, models.Goal.own_goal,
+                   models.Goal.penalty, models.Goal.id)
+            .join(M, M.id == models.Goal.match_id).where(*in_partition)
+        )).all()
+        assists = (await db.execute(
+            select(models.Assist.match_id, models.Assist.player_id)
+            .join(M, M.id == models.Assist.match_id).where(*in_partition)
+        )).all()
+        cards = (await db.execute(
+            select(models.Card.match_id, models.Card.player_id, models.Card.card_type, models.Card.minute)
+            .join(M, M.id == models.Card.match_id).where(*in_partition)
+        )).all()
+
+        def column(rows, i, dtype, null=0):
+            return np.array([null if r[i] is None else r[i] for r in rows], dtype=dtype)
+
+        def match_index(rows):
+            return np.searchsorted(match_id, column(rows, 0, np.int64))
+
+        cols = SeasonColumns(
+            match_id=match_id,
+            matchday=column(matches, 1, np.int64),
+            match_date=np.array([m[2] or "NaT" for m in matches], dtype="datetime64[D]"),
+            home=column(matches, 3, np.int64),
+            away=column(matches, 4, np.int64),
+            home_score=column(matches, 5, np.int64, NO_SCORE),
+            away_score=column(matches, 6, np.int64, NO_SCORE),
+            played=column(matches, 7, bool, False),
+            goal_id=column(goals, 5, np.int64),
+            goal_match=match_index(goals),
+            goal_scorer=column(goals, 1, np.int64),
+            goal_minute=column(goals, 2, np.int64, NO_MINUTE),
+            goal_own=column(goals, 3, bool, False),
+            goal_penalty=column(goals, 4, bool, False),
+            assist_match=match_index(assists),
+            assist_player=column(assists, 1, np.int64),
+            card_match=match_index(cards),
+            card_player=column(cards, 1, np.int64),
+            card_red=np.array([r[2] == "red" for r in cards], dtype=bool),
+            card_minute=column(cards, 3, np.int64, NO_MINUTE),
+        )
+        await self._check_players(db, cols)
+        return cols
+
+    async def _check_players(self, db: AsyncSession, cols: SeasonColumns) -> None:
+        # Un joueur créé depuis le dernier chargement des joueurs : on les relit
+        referenced = np.concatenate([cols.goal_scorer, cols.assist_player, cols.card_player])
+        if referenced.size and not set(np.unique(referenced).tolist()) <= self._players.keys():
+            await self._load_players(db)
+
+    # ── Vues ──────────────────────────────────────────────────────────────────
+    def _team_of(self, player_ids: "np.ndarray") -> "np.ndarray":
+        return self._player_team[player_ids]
+
+    def _player_row(self, player_id: int, **values) -> dict:
+        first, last = self._players[player_id]
+        return {"id": player_id, "first_name": first, "last_name": last,
+                "team_id": int(self._player_team[player_id]), **values}
+
+    def scorers(self, cols: SeasonColumns, team_ids: list[int], limit: Optional[int]) -> list[dict]:
+        """Buts hors CSC par joueur des équipes `team_ids`, penalties et passes de la saison."""
+        keep = ~cols.goal_own & np.isin(self._team_of(cols.goal_scorer), team_ids)
+        ids, goals, order, inverse = _ranked(cols.goal_scorer[keep], limit)
+        penalties = np.bincount(inverse, cols.goal_penalty[keep], ids.size).astype(np.int64)
+        assists = np.bincount(cols.assist_player, minlength=self._player_team.size)[ids]
+        return [self._player_row(int(ids[i]), goals=int(goals[i]), penalties=int(penalties[i]),
+                                 assists=int(assists[i])) for i in order]
+
+    def assists(self, cols: SeasonColumns, team_ids: list[int], limit: Optional[int]) -> list[dict]:
+        keep = np.isin(self._team_of(cols.assist_player), team_ids)
+        ids, counts, order, _ = _ranked(cols.assist_player[keep], limit)
+        return [self._player_row(int(ids[i]), assists=int(counts[i])) for i in order]
+
+    def _scoring_team(self, cols: SeasonColumns) -> "np.ndarray":
+        """Équipe créditée de chaque but : celle du buteur, ou l'adversaire pour un c.s.c."""
+        team = self._team_of(cols.goal_scorer)
+        home, away = cols.home[cols.goal_match], cols.away[cols.goal_match]
+        return np.where(~cols.goal_own, team, np.where(team == home, away, home))
+
+    def timing(self, cols: SeasonColumns, team_id: int) -> dict[int, dict]:
+        """Buts marqués / encaissés dans les matchs de l'équipe et cartons de ses joueurs, par tranche."""
+        n = len(services.BUCKETS)
+        in_match = (cols.home[cols.goal_match] == team_id) | (cols.away[cols.goal_match] == team_id)
+        keep = in_match & (cols.goal_minute != NO_MINUTE)
+        ours = self._scoring_team(cols)[keep] == team_id
+        goal_bucket = _bucket(cols.goal_minute[keep])
+        scored = np.bincount(goal_bucket, ours, n)
+        conceded = np.bincount(goal_bucket, ~ours, n)
+        booked = (self._team_of(cols.card_player) == team_id) & (cols.card_minute != NO_MINUTE)
+        card_bucket = _bucket(cols.card_minute[booked])
+        red = cols.card_red[booked]
+        yellow_cards, red_cards = np.bincount(card_bucket, ~red, n), np.bincount(card_bucket, red, n)
+        return {
+            i: {"scored": int(scored[i]), "conceded": int(conceded[i]),
+                "yellow_cards": int(yellow_cards[i]), "red_cards": int(red_cards[i])}
+            for i in range(n)
+        }
+
+    def first_goal(self, cols: SeasonColumns, team_ids: list[int]) -> dict[int, dict]:
+        """Premier but, remontées et avances perdues par équipe (mêmes règles que `services.first_goal`).
+
+        Les buts sont triés par (match, minute, id) ; l'écart domicile courant
+        est une somme cumulée remise à zéro à chaque match.
+        """
+        timed = cols.goal_minute != NO_MINUTE
+        order = np.lexsort((cols.goal_id[timed], cols.goal_minute[timed], cols.goal_match[timed]))
+        match = cols.goal_match[timed][order]
+        scoring = self._scoring_team(cols)[timed][order]
+        n = cols.match_id.size
+        first_team = np.full(n, -1, dtype=np.int64)
+        min_diff, max_diff = np.zeros(n, dtype=np.int64), np.zeros(n, dtype=np.int64)
+        if match.size:
+            starts = np.flatnonzero(np.r_[True, match[1:] != match[:-1]])
+            running = np.cumsum(np.where(scoring == cols.home[match], 1, -1))
+            before = np.r_[0, running[starts[1:] - 1]]
+            diff = running - np.repeat(before, np.diff(np.r_[starts, match.size]))
+            first_team[match[starts]] = scoring[starts]
+            min_diff[match[starts]] = np.minimum.reduceat(diff, starts)
+            max_diff[match[starts]] = np.maximum.reduceat(diff, starts)
+
+        p = np.flatnonzero(cols.played)
+        hs, as_ = np.maximum(cols.home_score[p], 0), np.maximum(cols.away_score[p], 0)
+        team = np.concatenate([cols.home[p], cols.away[p]])
+        gf, ga = np.concatenate([hs, as_]), np.concatenate([as_, hs])
+        trailed = np.concatenate([min_diff[p] < 0, max_diff[p] > 0])
+        led = np.concatenate([max_diff[p] > 0, min_diff[p] < 0])
+        first = np.concatenate([first_team[p], first_team[p]])
+        mine = np.isin(team, team_ids)
+        team, gf, ga, trailed, led, first = (v[mine] for v in (team, gf, ga, trailed, led, first))
+        won, drawn = gf > ga, gf == ga
+        first_us, first_them = first == team, (first != -1) & (first != team)
+        size = int(team.max()) + 1 if team.size else 0
+
+        def total(weights):
+            return np.bincount(team, weights, size).astype(np.int64)
+
+        totals = {
+            "played": total(None),
+            "scored_first": total(first_us),
+            "won_after_scoring_first": total(first_us & won),
+            "conceded_first": total(first_them),
+            "won_after_conceding_first": total(first_them & won),
+            "comebacks": total(trailed & won),
+            "points_from_behind": total(np.where(trailed & won, 3, np.where(trailed & drawn, 1, 0))),
+            "leads_lost": total(led & ~won),
+        }
+        return {int(t): {k: int(v[t]) for k, v in totals.items()} for t in np.flatnonzero(totals["played"])}
+
+
+store = LeagueStore()
+
+
+# ── Mêmes signatures que api.services ─────────────────────────────────────────
+async def scorers(
+    db: AsyncSession, season: str, limit: int, league: str = DEFAULT_LEAGUE, fields: Fields = None,
+) -> list:
+    cols = await store.season(db, season, league)
+    if cols is None:
+        return await services.scorers(db, season, limit, league, fields)
+    await teams.ensure(db)
+    team_ids = [t.id for t in teams.by_league(league)]
+    return services.scorer_rows(store.scorers(cols, team_ids, limit), fields)
+
+
+async def assists(
+    db: AsyncSession, season: str, limit: int, league: str = DEFAULT_LEAGUE, fields: Fields = None,
+) -> list:
+    cols = await store.season(db, season, league)
+    if cols is None:
+        return await services.assists(db, season, limit, league, fields)
+    await teams.ensure(db)
+    team_ids = [t.id for t in teams.by_league(league)]
+    return services.assist_rows(store.assists(cols, team_ids, limit), fields)
+
+
+async def standings(db: AsyncSession, season: str, league: str = DEFAULT_LEAGUE, fields: Fields = None) -> list:
+    cols = await store.season(db, season, league)
+    if cols is None:
+        return await services.standings(db, season, league, fields)
+    await teams.ensure(db)
+    return services.standing_rows(cols.team_totals(), league, fields)
+
+
+async def club_scorers(db: AsyncSession, team: TeamInfo, season: str, fields: Fields = None) -> list:
+    cols = await store.season(db, season, team.league)
+    if cols is None:
+        return await services.club_scorers(db, team, season, fields)
+    return services.scorer_rows(store.scorers(cols, [team.id], None), fields, team)
+
+
+async def club_assists(db: AsyncSession, team: TeamInfo, season: str, fields: Fields = None) -> list:
+    cols = await store.season(db, season, team.league)
+    if cols is None:
+        return await services.club_assists(db, team, season, fields)
+    return services.assist_rows(store.assists(cols, [team.id], None), fields, team)
+
+
+async def club_matches(db: AsyncSession, team: TeamInfo, season: str, last: int, fields: Fields = None) -> list:
+    cols = await store.season(db, season, team.league)
+    if cols is None:
+        return await services.club_matches(db, team, season, last, fields)
+    return services.match_rows(team, cols.recent(team.id, last), fields)
+
+
+async def club_form(db: AsyncSession, team: TeamInfo, season: str, last: int, with_matches: bool = True):
+    cols = await store.season(db, season, team.league)
+    if cols is None:
+        return await services.club_form(db, team, season, last, with_matches)
+    return services.form_out(team, cols.recent(team.id, last), last, with_matches)
+
+
+# ── Analyses : SQL pour les saisons en base, magasin pour une saison archivée ──
+async def _archived_season(db: AsyncSession, season: str, league: str) -> Optional[SeasonColumns]:
+    return await store.season(db, season, league) if archive.has(season) else None
+
+
+async def club_timing(db: AsyncSession, team: TeamInfo, season: str, fields: Fields = None) -> list:
+    cols = await _archived_season(db, season, team.league)
+    if cols is None:
+        return await services.club_timing(db, team, season, fields)
+    return services.timing_rows(store.timing(cols, team.id), fields)
+
+
+async def first_goal(db: AsyncSession, season: str, league: str = DEFAULT_LEAGUE, fields: Fields = None) -> list:
+    cols = await _archived_season(db, season, league)
+    if cols is None:
+        return await services.first_goal(db, season, league, fields)
+    await teams.ensure(db)
+    return services.first_goal_rows(store.first_goal(cols, [t.id for t in teams.by_league(league)]), league, fields)
+
+
+async def club_rolling(db: AsyncSession, team: TeamInfo, season: str, window: int, fields: Fields = None) -> list:
+    cols = await _archived_season(db, season, team.league)
+    if cols is None:
+        return await services.club_rolling(db, team, season, window, fields)
+    return services.club_rolling_rows(cols.rolling(team.id, window), fields)
+
+
+async def player_rolling(db: AsyncSession, player_id: int, season: str, window: int, fields: Fields = None) -> Optional[list]:
+    if not archive.has(season):
+        return await services.player_rolling(db, player_id, season, window, fields)
+    team_id = await db.scalar(select(models.Player.team_id).where(models.Player.id == player_id))
+    if team_id is None:
+        return None
+    await teams.ensure(db)
+    cols = await store.season(db, season, teams.get(team_id).league)
+    return services.player_rolling_rows(cols.player_rolling(player_id, team_id, window), fields)
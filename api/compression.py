@@ -0,0 +1,171 @@
+"""Compression négociée des réponses HTTP (brotli si disponible, sinon gzip).
+
+- `CompressionMiddleware` compresse à la volée les réponses textuelles (JSON,
+  NDJSON, HTML, CSS, JS) au-delà d'un seuil ; les réponses en flux sont
+  compressées morceau par morceau, sans attendre la fin.
+- `PrecompressedStaticFiles` sert directement les variantes `.br` / `.gz`
+  produites par `scripts/build_static.py`, avec des en-têtes de cache
+  « immutable » pour les fichiers dont le nom contient un hash de contenu.
+"""
+import os
+import re
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import FileResponse
+from starlette.staticfiles import StaticFiles
+
+try:
+    import brotli
+except ImportError:  # brotli est optionnel : gzip seul reste disponible
+    brotli = None
+
+MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "1024"))
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5  # compromis CPU / taille pour du contenu dynamique
+
+COMPRESSIBLE_TYPES = (
+    "text/", "application/json", "application/javascript", "application/x-ndjson", "image/svg+xml",
+)
+IMMUTABLE = "public, max-age=31536000, immutable"
+HASHED_NAME = re.compile(r"\.[0-9a-f]{8}\.[a-z0-9]+$")
+SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+
+def supported_encodings() -> tuple[str, ...]:
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate(accept_encoding: str, available: tuple[str, ...] = None) -> Optional[str]:
+    """Choisit l'encodage préféré du client parmi `available` (brotli prioritaire à q égal)."""
+    available = available if available is not None else supported_encodings()
+    weights = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        weights[token.strip().lower()] = q
+    best, best_q = None, 0.0
+    for encoding in available:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class _Encoder:
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._c = brotli.Compressor(quality=BROTLI_QUALITY)
+        else:
+            self._c = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)  # wbits 31 = conteneur gzip
+
+    def chunk(self, data: bytes) -> bytes:
+        """Compresse et vide le tampon : le client reçoit les données sans attendre la fin du flux."""
+        if self.encoding == "br":
+            return self._c.process(data) + self._c.flush()
+        return self._c.compress(data) + self._c.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        if self.encoding == "br":
+            return self._c.process(data) + self._c.finish()
+        return self._c.compress(data) + self._c.flush()
+
+
+def _compressible(headers: MutableHeaders) -> bool:
+    content_type = headers.get("content-type", "")
+    return "content-encoding" not in headers and content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class CompressionMiddleware:
+    def __init__(self, app, minimum_size: int = MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            return await self.app(scope, receive, send)
+
+        start = None
+        encoder: Optional[_Encoder] = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start, encoder, passthrough
+            if message["type"] == "http.response.start":
+                start = message  # retardé jusqu'au premier morceau de corps
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                return await send(message)
+
+            body, more = message.get("body", b""), message.get("more_body", False)
+            if start is not None:
+                headers = MutableHeaders(raw=start["headers"])
+                small = not more and len(body) < self.minimum_size
+                if small or start["status"] in (204, 304) or not _compressible(headers):
+                    passthrough = True
+                    await send(start)
+                    start = None
+                    return await send(message)
+
+                encoder = _Encoder(encoding)
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                if "content-length" in headers:
+                    del headers["content-length"]
+                payload = encoder.chunk(body) if more else encoder.finish(body)
+                if not more:
+                    headers["Content-Length"] = str(len(payload))
+                await send(start)
+                start = None
+                return await send({"type": "http.response.body", "body": payload, "more_body": more})
+
+            payload = encoder.chunk(body) if more else encoder.finish(body)
+            await send({"type": "http.response.body", "body": payload, "more_body": more})
+
+        await self.app(scope, receive, send_wrapper)
+        if start is not None:  # réponse sans corps
+            await send(start)
+
+
+def precompressed_file(path: str, accept_encoding: str) -> tuple[str, Optional[str]]:
+    """(chemin à servir, encodage) : la variante précompressée si elle existe et convient au client."""
+    # Pas besoin du module brotli pour servir un .br déjà produit
+    available = tuple(e for e in ("br", "gzip") if os.path.isfile(path + SUFFIXES[e]))
+    encoding = negotiate(accept_encoding, available) if available else None
+    return (path + SUFFIXES[encoding], encoding) if encoding else (path, None)
+
+
+def page_response(path: str, accept_encoding: str) -> FileResponse:
+    """Page HTML (nom stable) : variante précompressée si possible, revalidation à chaque visite."""
+    served, encoding = precompressed_file(path, accept_encoding)
+    headers = {"Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return FileResponse(served, media_type="text/html", headers=headers)
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    async def get_response(self, path: str, scope):
+        response = await super().get_response(path, scope)
+        if not isinstance(response, FileResponse):
+            return response
+
+        full_path, _ = self.lookup_path(path)
+        served, encoding = precompressed_file(full_path, Headers(scope=scope).get("accept-encoding", ""))
+        if encoding:
+            response = FileResponse(served, media_type=response.media_type,
+                                    headers={"Content-Encoding": encoding})
+        response.headers["Vary"] = "Accept-Encoding"
+        if HASHED_NAME.search(path):
+            response.headers["Cache-Control"] = IMMUTABLE
+        return response
@@ -1,13 +1,135 @@
+import asyncio
+import logging
 import os
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 
+from api import metrics
+
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./fcsmtop.db")
+# Requêtes compilées gardées par SQLAlchemy (une par forme de requête et par dialecte)
+COMPILED_CACHE_SIZE = int(os.getenv("COMPILED_CACHE_SIZE", "1000"))
+# Instructions préparées gardées par connexion (asyncpg côté serveur, sqlite3 côté client)
+PREPARED_STATEMENT_CACHE_SIZE = int(os.getenv("PREPARED_STATEMENT_CACHE_SIZE", "500"))
+# Requêtes SQL plus lentes que ce seuil journalisées avec leur plan (0 = désactivé)
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "250"))
+SLOW_QUERY_KEEP = int(os.getenv("SLOW_QUERY_KEEP", "100"))
+
+logger = logging.getLogger("fcsmtop.slow_query")
+
+
+def make_engine(url: str = DATABASE_URL):
+    """Engine async avec caches de compilation et d'instructions préparées dimensionnés.
+
+    Les requêtes chaudes de `api.services` sont construites une fois par forme
+    avec des paramètres liés : leur SQL est identique d'un appel à l'autre, donc
+    compilé une fois par processus et préparé une fois par connexion.
+    """
+    connect_args = {}
+    if url.startswith("postgresql+asyncpg"):
+        connect_args["prepared_statement_cache_size"] = PREPARED_STATEMENT_CACHE_SIZE
+    elif url.startswith("sqlite"):
+        connect_args["cached_statements"] = PREPARED_STATEMENT_CACHE_SIZE
+    return create_async_engine(url, echo=False, query_cache_size=COMPILED_CACHE_SIZE, connect_args=connect_args)
+
 
-engine = create_async_engine(DATABASE_URL, echo=False)
+engine = make_engine()
 AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False)
 
 
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(engine.sync_engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    duration = time.perf_counter() - conn.info["query_start"].pop()
+    metrics.record_statement(duration)
+    if slow_queries.enabled and duration >= slow_queries.threshold and not conn.info.get("explaining"):
+        slow_queries.record(statement, None if executemany else parameters, duration)
+
+
+slow_total = metrics.registry.counter("fcsmtop_slow_queries_total", "Requêtes SQL au-delà de SLOW_QUERY_MS par route.")
+
+EXPLAIN = {"sqlite": "EXPLAIN QUERY PLAN ", "postgresql": "EXPLAIN "}
+
+
+class SlowQueryLog:
+    """Dernières requêtes lentes avec la route d'origine et leur plan d'exécution.
+
+    Le plan est demandé après coup, sur une autre connexion et avec les mêmes
+    paramètres (EXPLAIN sans ANALYZE : la requête n'est pas rejouée), une fois
+    par texte SQL. Les entrées sont aussi journalisées (`fcsmtop.slow_query`).
+    """
+
+    def __init__(self, threshold_ms: float = SLOW_QUERY_MS, keep: int = SLOW_QUERY_KEEP):
+        self.enabled = threshold_ms > 0
+        self.threshold = threshold_ms / 1000
+        self.entries: deque[dict] = deque(maxlen=keep)
+        self._plans: dict[str, Optional[list[str]]] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    def record(self, statement: str, parameters, duration: float) -> None:
+        route = metrics.current_route()
+        entry = {
+            "at": datetime.now(timezone.utc),
+            "route": route,
+            "duration_ms": round(duration * 1000, 2),
+            "statement": statement,
+            "parameters": None if parameters is None else repr(parameters)[:500],
+            "plan": self._plans.get(statement),
+        }
+        self.entries.append(entry)
+        slow_total.inc(route=route or "hors requête HTTP")
+        logger.warning("Requête lente : %.0f ms (%s)\n%s\nparamètres : %s",
+                       entry["duration_ms"], route or "hors requête HTTP", statement, entry["parameters"])
+        prefix = EXPLAIN.get(engine.dialect.name)
+        is_read = statement.lstrip().upper().startswith(("SELECT", "WITH"))
+        if statement not in self._plans and prefix and is_read and parameters is not None:
+            self._plans[statement] = None  # plan en cours de calcul
+            task = asyncio.get_running_loop().create_task(self._explain(prefix, statement, parameters, route))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _explain(self, prefix: str, statement: str, parameters, route: Optional[str]) -> None:
+        try:
+            async with engine.connect() as conn:
+                conn.info["explaining"] = True
+                try:
+                    rows = await conn.exec_driver_sql(prefix + statement, parameters)
+                    plan = [str(r[-1]) for r in rows]
+                finally:
+                    conn.info.pop("explaining", None)
+        except Exception as e:  # le plan est un plus : ne jamais faire échouer pour lui
+            plan = [f"EXPLAIN impossible : {type(e).__name__}: {e}"]
+        if len(self._plans) > self.entries.maxlen:
+            self._plans.clear()
+        self._plans[statement] = plan
+        for entry in self.entries:
+            if entry["statement"] == statement and entry["plan"] is None:
+                entry["plan"] = plan
+        logger.warning("Plan de la requête lente (%s) :\n%s", route or "hors requête HTTP", "\n".join(plan))
+
+    async def explained(self) -> None:
+        """Attend les plans en cours de calcul."""
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def recent(self, limit: Optional[int] = None) -> list[dict]:
+        """Requêtes lentes, la plus récente d'abord."""
+        return list(reversed(self.entries))[:limit]
+
+
+slow_queries = SlowQueryLog()
+
+
 class Base(DeclarativeBase):
     pass
 
@@ -17,6 +139,14 @@ async def get_db():
         yield session
 
 
+def _create_schema(conn) -> None:
+    Base.metadata.create_all(conn)
+    # create_all ne touche pas aux tables existantes : index ajoutés depuis leur création
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+
 async def init_db():
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_create_schema)
@@ -0,0 +1,92 @@
+"""Sondes de vivacité et de disponibilité pour l'orchestrateur et le répartiteur de charge.
+
+`/health/live` ne touche à rien : le processus répond, la boucle tourne.
+`/health/ready` mesure un aller-retour vers la base (prise d'une connexion du
+pool comprise : un pool épuisé se voit comme une sonde lente ou expirée),
+relève l'état du pool et du cache et la dernière journée jouée de la saison
+en cours. L'instance répond 503 si la base ne répond pas dans
+READY_DB_TIMEOUT, répond plus lentement que READY_MAX_DB_LATENCY_MS, ou si
+ses données ont plus de READY_MAX_AGE_DAYS jours (0 = pas de contrôle) : le
+répartiteur l'écarte sans la redémarrer.
+"""
+import asyncio
+import os
+import time
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import func, select, text
+
+from api import models, schemas
+from api.cache import cache
+from api.database import engine
+from api.seasons import CURRENT_SEASON
+
+READY_DB_TIMEOUT = float(os.getenv("READY_DB_TIMEOUT", "1"))
+READY_MAX_DB_LATENCY_MS = float(os.getenv("READY_MAX_DB_LATENCY_MS", "250"))
+READY_MAX_AGE_DAYS = int(os.getenv("READY_MAX_AGE_DAYS", "0"))
+
+
+def pool_status() -> schemas.PoolOut:
+    """Compteurs du pool SQLAlchemy (absents pour les pools sans file, ex. StaticPool)."""
+    pool = engine.sync_engine.pool
+    counts = {
+        name: getattr(pool, method)()
+        for name, method in (("size", "size"), ("checked_out", "checkedout"), ("checked_in", "checkedin"),
+                             ("overflow", "overflow"))
+        if hasattr(pool, method)
+    }
+    return schemas.PoolOut(pool=type(pool).__name__, **counts)
+
+
+def cache_stats() -> schemas.CacheStatsOut:
+    return schemas.CacheStatsOut(
+        backend=type(cache.backend).__name__, hits=cache.hits, misses=cache.misses, hit_rate=round(cache.hit_rate, 4),
+    )
+
+
+async def _probe() -> tuple[float, schemas.FreshnessOut]:
+    start = time.perf_counter()
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+        latency = (time.perf_counter() - start) * 1000
+        last = (await conn.execute(
+            select(func.max(models.Match.matchday), func.max(models.Match.match_date))
+            .where(models.Match.season == CURRENT_SEASON, models.Match.played.is_(True))
+        )).one()
+    age = (date.today() - last[1]).days if last[1] else None
+    return latency, schemas.FreshnessOut(season=CURRENT_SEASON, last_matchday=last[0], last_match_date=last[1], age_days=age)
+
+
+async def readiness(version: str) -> schemas.ReadinessOut:
+    problems: list[str] = []
+    latency: Optional[float] = None
+    freshness: Optional[schemas.FreshnessOut] = None
+    try:
+        async with asyncio.timeout(READY_DB_TIMEOUT):
+            latency, freshness = await _probe()
+    except TimeoutError:
+        busy = pool_status().checked_out
+        problems.append(f"base : pas de réponse en {READY_DB_TIMEOUT:g} s"
+                        + (f" ({busy} connexions du pool occupées)" if busy is not None else ""))
+    except Exception as e:  # base arrêtée, identifiants refusés… : l'instance n'est pas prête
+        problems.append(f"base : {type(e).__name__}")
+
+    if latency is not None and latency > READY_MAX_DB_LATENCY_MS:
+        problems.append(f"base lente : {latency:.0f} ms (max {READY_MAX_DB_LATENCY_MS:g} ms)")
+    if READY_MAX_AGE_DAYS and freshness is not None:
+        if freshness.age_days is None:
+            problems.append(f"données absentes : aucun match joué en {freshness.season}")
+        elif freshness.age_days > READY_MAX_AGE_DAYS:
+            problems.append(f"données anciennes : dernier match joué il y a {freshness.age_days} j (max {READY_MAX_AGE_DAYS})")
+
+    return schemas.ReadinessOut(
+        status="not_ready" if problems else "ready",
+        version=version,
+        problems=problems,
+        db=schemas.DbProbeOut(type=engine.dialect.name, ok=latency is not None,
+                              latency_ms=round(latency, 2) if latency is not None else None),
+        pool=pool_status(),
+        cache=cache_stats(),
+        freshness=freshness,
+    )
@@ -1,20 +1,36 @@
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 import os
 
-from api.database import init_db
-from api.routers import national, clubs
-from api.schemas import HealthOut
+from api import health as probes, metrics, services
+from api.admission import Overloaded, RateLimitMiddleware, rejected
+from api.cache import ALL, cached
+from api.columnar import store
+from api.search import index
+from api.compression import CompressionMiddleware, PrecompressedStaticFiles, page_response
+from api.database import AsyncSessionLocal, engine, init_db
+from api.routers import national, leagues, clubs, export, analytics, admin, players, search
+from api.schemas import HealthOut, ReadinessOut
+from api.seasons import ClosedSeasonMiddleware
+from api.teams import registry as teams
 
 APP_VERSION = "1.0.0"
 
 
+async def season_exists(season: str) -> bool:
+    """Saison en base ou archivée ; la liste est en cache et renouvelée à chaque `cache.bump(ALL)`."""
+    return season in await cached(ALL, services.seasons)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await init_db()
+    async with AsyncSessionLocal() as db:
+        await teams.ensure(db)
+        await store.load(db)
+        await index.ensure(db)
     yield
 
 
@@ -36,27 +52,77 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(ClosedSeasonMiddleware, exists=season_exists)
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(RateLimitMiddleware)
+app.add_middleware(metrics.MetricsMiddleware)
+
+
+@app.exception_handler(Overloaded)
+async def overloaded(request: Request, exc: Overloaded):
+    """Vue saturée sans valeur en cache à servir : 503, à réessayer plus tard."""
+    rejected.inc(query=exc.name)
+    return JSONResponse(
+        {"detail": "Service momentanément saturé, réessayer plus tard"},
+        status_code=503,
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
 
 app.include_router(national.router)
+app.include_router(leagues.router)
 app.include_router(clubs.router)
+app.include_router(export.router)
+app.include_router(analytics.router)
+app.include_router(players.router)
+app.include_router(search.router)
+app.include_router(admin.router)
 
-# Servir le frontend statique
+# Servir le frontend statique (build hashé + précompressé de web/dist/ s'il existe)
 web_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "web")
+if os.path.isdir(os.path.join(web_dir, "dist")):
+    web_dir = os.path.join(web_dir, "dist")
 if os.path.isdir(web_dir):
-    app.mount("/static", StaticFiles(directory=os.path.join(web_dir, "static")), name="static")
+    app.mount("/static", PrecompressedStaticFiles(directory=os.path.join(web_dir, "static")), name="static")
+    # Pages et JSON prérendus par scripts/prerender.py
+    for prefix in ("saisons", "data"):
+        if os.path.isdir(os.path.join(web_dir, prefix)):
+            app.mount(f"/{prefix}", PrecompressedStaticFiles(directory=os.path.join(web_dir, prefix), html=True), name=prefix)
 
     @app.get("/", include_in_schema=False)
-    async def root():
-        return FileResponse(os.path.join(web_dir, "index.html"))
+    async def root(request: Request):
+        return page_response(os.path.join(web_dir, "index.html"), request.headers.get("accept-encoding", ""))
 
     @app.get("/fcsm", include_in_schema=False)
-    async def fcsm_page():
-        return FileResponse(os.path.join(web_dir, "fcsm.html"))
+    async def fcsm_page(request: Request):
+        return page_response(os.path.join(web_dir, "fcsm.html"), request.headers.get("accept-encoding", ""))
 
 
 @app.get("/health", response_model=HealthOut, tags=["Système"])
 async def health():
-    """État de l'API."""
+    """État de l'API (sans accès à la base : voir /health/ready)."""
     db_url = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./fcsmtop.db")
     db_type = "postgresql" if "postgresql" in db_url else "sqlite"
     return HealthOut(status="ok", version=APP_VERSION, db=db_type)
+
+
+@app.get("/health/live", response_model=HealthOut, tags=["Système"])
+async def health_live():
+    """Vivacité : le processus répond (aucun accès à la base)."""
+    return HealthOut(status="ok", version=APP_VERSION, db=engine.dialect.name)
+
+
+@app.get("/health/ready", response_model=ReadinessOut, tags=["Système"],
+         responses={503: {"model": ReadinessOut, "description": "Instance à écarter du répartiteur"}})
+async def health_ready(response: Response):
+    """Disponibilité : latence de la base, pool, cache et fraîcheur des données (503 si l'instance est à écarter)."""
+    ready = await probes.readiness(APP_VERSION)
+    if ready.status != "ready":
+        response.status_code = 503
+    return ready
+
+
+@app.get("/metrics", response_class=PlainTextResponse, tags=["Système"])
+async def get_metrics():
+    """Métriques par route (latence, requêtes SQL, temps DB) au format Prometheus."""
+    return PlainTextResponse(metrics.registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,199 @@
+"""Métriques par route : latence, requêtes SQL et temps DB, au format Prometheus.
+
+Le middleware ouvre un `RequestStats` par requête HTTP (via un ContextVar) ;
+les événements SQLAlchemy branchés dans `api/database.py` y ajoutent chaque
+requête SQL exécutée. Les séries sont agrégées par gabarit de route
+(`/api/v1/clubs/{club}/form`) pour garder une cardinalité bornée.
+"""
+import logging
+import os
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+logger = logging.getLogger("fcsmtop.metrics")
+
+# Au-delà de ce nombre de requêtes SQL, la requête HTTP est signalée comme suspecte de N+1
+QUERY_BUDGET = int(os.getenv("QUERY_BUDGET", "10"))
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+STATEMENT_BUCKETS = (1, 2, 5, 10, 20, 50, 100)
+
+
+class RequestStats:
+    """Compteurs SQL de la requête HTTP en cours."""
+
+    __slots__ = ("statements", "db_time", "scope")
+
+    def __init__(self, scope=None):
+        self.statements = 0
+        self.db_time = 0.0
+        self.scope = scope
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("fcsmtop_request_stats", default=None)
+
+
+def current_stats() -> Optional[RequestStats]:
+    return _current.get()
+
+
+def current_route() -> Optional[str]:
+    """« GET /api/v1/clubs/{club}/squad » pour la requête HTTP en cours (ou celle qui a lancé le calcul)."""
+    stats = _current.get()
+    if stats is None or stats.scope is None:
+        return None
+    return f"{stats.scope['method']} {route_template(stats.scope)}"
+
+
+def record_statement(duration: float) -> None:
+    """Appelé par les événements SQLAlchemy après chaque exécution."""
+    stats = _current.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.db_time += duration
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+class Counter:
+    def __init__(self, name: str, help: str):
+        self.name, self.help = name, help
+        self.values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = tuple(sorted(labels.items()))
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        lines += [f"{self.name}{_labels(dict(k))} {v:g}" for k, v in self.values.items()]
+        return lines
+
+
+class Gauge(Counter):
+    def set(self, value: float, **labels) -> None:
+        self.values[tuple(sorted(labels.items()))] = value
+
+    def render(self) -> list[str]:
+        lines = super().render()
+        lines[1] = f"# TYPE {self.name} gauge"
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, buckets: tuple):
+        self.name, self.help, self.buckets = name, help, buckets
+        self.series: dict[tuple, list] = {}  # labels -> [compteurs par bucket, somme, total]
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(sorted(labels.items()))
+        s = self.series.get(key)
+        if s is None:
+            s = self.series[key] = [[0] * len(self.buckets), 0.0, 0]
+        for i, upper in enumerate(self.buckets):
+            if value <= upper:
+                s[0][i] += 1
+        s[1] += value
+        s[2] += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, (counts, total, n) in self.series.items():
+            labels = dict(key)
+            for upper, c in zip(self.buckets, counts):
+                lines.append(f"{self.name}_bucket{_labels({**labels, 'le': f'{upper:g}'})} {c}")
+            lines.append(f"{self.name}_bucket{_labels({**labels, 'le': '+Inf'})} {n}")
+            lines.append(f"{self.name}_sum{_labels(labels)} {total:g}")
+            lines.append(f"{self.name}_count{_labels(labels)} {n}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: dict[str, object] = {}
+
+    def _register(self, metric):
+        return self.metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, help: str) -> Counter:
+        return self._register(Counter(name, help))
+
+    def gauge(self, name: str, help: str) -> Gauge:
+        return self._register(Gauge(name, help))
+
+    def histogram(self, name: str, help: str, buckets: tuple) -> Histogram:
+        return self._register(Histogram(name, help, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics.values():
+            lines += metric.render()
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_requests = registry.counter("fcsmtop_http_requests_total", "Requêtes HTTP par route et statut.")
+http_latency = registry.histogram(
+    "fcsmtop_http_request_duration_seconds", "Latence des requêtes HTTP par route.", LATENCY_BUCKETS
+)
+db_statements = registry.histogram(
+    "fcsmtop_db_statements_per_request", "Requêtes SQL exécutées par requête HTTP.", STATEMENT_BUCKETS
+)
+db_seconds = registry.counter("fcsmtop_db_seconds_total", "Temps cumulé passé en base par route.")
+n_plus_one = registry.counter(
+    "fcsmtop_n_plus_one_suspects_total", "Requêtes HTTP dépassant le budget de requêtes SQL."
+)
+
+
+def route_template(scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    """Middleware ASGI : mesure chaque requête HTTP jusqu'au dernier octet envoyé."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats = RequestStats(scope)
+        token = _current.set(stats)
+        status = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            elapsed = time.perf_counter() - start
+            method, route = scope["method"], route_template(scope)
+            http_requests.inc(method=method, route=route, status=status)
+            http_latency.observe(elapsed, method=method, route=route)
+            db_statements.observe(stats.statements, method=method, route=route)
+            db_seconds.inc(stats.db_time, method=method, route=route)
+            if stats.statements > QUERY_BUDGET:
+                n_plus_one.inc(method=method, route=route)
+                logger.warning(
+                    "N+1 suspect : %s %s — %d requêtes SQL (budget %d), %.1f ms en base",
+                    method, route, stats.statements, QUERY_BUDGET, stats.db_time * 1000,
+                )
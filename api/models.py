@@ -1,6 +1,6 @@
 from datetime import date, datetime
 from typing import Optional
-from sqlalchemy import String, Integer, Date, DateTime, ForeignKey, Boolean
+from sqlalchemy import String, Integer, Date, DateTime, ForeignKey, Boolean, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from api.database import Base
 
@@ -12,7 +12,7 @@ class Team(Base):
     name: Mapped[str] = mapped_column(String(100), unique=True, index=True)
     short_name: Mapped[str] = mapped_column(String(10))
     city: Mapped[str] = mapped_column(String(100))
-    league: Mapped[str] = mapped_column(String(50), default="National")
+    league: Mapped[str] = mapped_column(String(50), default="National", index=True)
 
     players: Mapped[list["Player"]] = relationship(back_populates="team")
     home_matches: Mapped[list["Match"]] = relationship(foreign_keys="Match.home_team_id", back_populates="home_team")
@@ -29,7 +29,7 @@ class Player(Base):
     nationality: Mapped[str] = mapped_column(String(50), default="Français")
     birth_date: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
     number: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
-    team_id: Mapped[int] = mapped_column(ForeignKey("teams.id"))
+    team_id: Mapped[int] = mapped_column(ForeignKey("teams.id"), index=True)
 
     team: Mapped["Team"] = relationship(back_populates="players")
     goals: Mapped[list["Goal"]] = relationship(back_populates="scorer")
@@ -43,6 +43,11 @@ class Player(Base):
 
 class Match(Base):
     __tablename__ = "matches"
+    # Partition (saison, ligue) : les équipes d'une ligue filtrent une saison par index
+    __table_args__ = (
+        Index("ix_matches_season_home", "season", "home_team_id"),
+        Index("ix_matches_season_away", "season", "away_team_id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     season: Mapped[str] = mapped_column(String(10), index=True)
@@ -65,8 +70,8 @@ class Goal(Base):
     __tablename__ = "goals"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    match_id: Mapped[int] = mapped_column(ForeignKey("matches.id"))
-    scorer_id: Mapped[int] = mapped_column(ForeignKey("players.id"))
+    match_id: Mapped[int] = mapped_column(ForeignKey("matches.id"), index=True)
+    scorer_id: Mapped[int] = mapped_column(ForeignKey("players.id"), index=True)
     minute: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     own_goal: Mapped[bool] = mapped_column(Boolean, default=False)
     penalty: Mapped[bool] = mapped_column(Boolean, default=False)
@@ -79,8 +84,8 @@ class Assist(Base):
     __tablename__ = "assists"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    match_id: Mapped[int] = mapped_column(ForeignKey("matches.id"))
-    player_id: Mapped[int] = mapped_column(ForeignKey("players.id"))
+    match_id: Mapped[int] = mapped_column(ForeignKey("matches.id"), index=True)
+    player_id: Mapped[int] = mapped_column(ForeignKey("players.id"), index=True)
     minute: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
 
     match: Mapped["Match"] = relationship(back_populates="assists")
@@ -91,8 +96,8 @@ class Card(Base):
     __tablename__ = "cards"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    match_id: Mapped[int] = mapped_column(ForeignKey("matches.id"))
-    player_id: Mapped[int] = mapped_column(ForeignKey("players.id"))
+    match_id: Mapped[int] = mapped_column(ForeignKey("matches.id"), index=True)
+    player_id: Mapped[int] = mapped_column(ForeignKey("players.id"), index=True)
     card_type: Mapped[str] = mapped_column(String(10))  # "yellow" | "red"
     minute: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
 
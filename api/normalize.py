@@ -0,0 +1,231 @@
+"""Rapprochement de fiches joueurs issues de sources hétérogènes.
+
+Les sources écrivent les noms différemment (« Élie N'Gatta » / « Elie NGatta »,
+« Dylan Tavares dos Santos » / « Tavares Dos Santos Dylan », « B. Fofana »).
+Chaque fiche est ramenée à une clé canonique (club + nom) puis rangée dans un
+index haché : le rapprochement est en O(1) par fiche, donc linéaire sur le
+chargement complet, quel que soit le nombre de joueurs et de sources. Les
+joueurs déjà en base ancrent chacun leur propre entité (par id) : deux
+homonymes d'un même club ne sont jamais fusionnés, et une fiche qui pourrait
+désigner l'un ou l'autre est mise de côté comme ambiguë.
+
+Pour chaque champ, la valeur retenue est celle de la source la plus fraîche
+(journée « après J29 »), puis la plus prioritaire ; toute divergence, y
+compris entre deux fiches d'une même source, est consignée comme conflit à
+relire.
+"""
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Optional
+
+# Du plus au moins fiable à fraîcheur égale
+SOURCE_PRIORITY = {
+    "base": 5,          # fiches déjà validées en base
+    "fff": 4,
+    "foot-direct": 3,
+    "madeinfoot": 2,
+    "footmercato": 1,
+    "aiscore": 1,
+}
+MERGED_FIELDS = (
+    "first_name", "last_name", "team", "position", "nationality", "number",
+    "matches", "goals", "assists", "penalties", "xg", "note",
+)
+_MATCHDAY = re.compile(r"\bJ(\d+)\b")
+
+# Codes de poste des sources → libellés utilisés en base
+POSITIONS = {
+    "gk": "Gardien", "g": "Gardien", "gar": "Gardien", "gardien": "Gardien",
+    "def": "Défenseur", "d": "Défenseur", "defenseur": "Défenseur",
+    "mid": "Milieu", "m": "Milieu", "mil": "Milieu", "milieu": "Milieu",
+    "att": "Attaquant", "fw": "Attaquant", "a": "Attaquant", "attaquant": "Attaquant",
+}
+
+
+def strip_accents(value: str) -> str:
+    return unicodedata.normalize("NFKD", value).encode("ascii", "ignore").decode()
+
+
+def name_tokens(value: str) -> list[str]:
+    """« Élie N'Gatta » → ["elie", "ngatta"] ; traits d'union et points séparent, apostrophes collent."""
+    value = strip_accents(value).lower()
+    value = re.sub(r"['’`]", "", value)
+    return [t for t in re.split(r"[^a-z0-9]+", value) if t]
+
+
+def player_key(full_name: str) -> str:
+    """Clé indépendante de l'ordre prénom/nom, des accents et de la casse."""
+    return " ".join(sorted(name_tokens(full_name)))
+
+
+def initial_key(first_name: str, last_name: str) -> str:
+    """Clé de repli « b fofana » pour les formes abrégées (« B. Fofana »)."""
+    first = name_tokens(first_name)
+    return " ".join([first[0][0] if first else "", *name_tokens(last_name)]).strip()
+
+
+def parse_source(source: Optional[str]) -> tuple[int, int]:
+    """« Foot-Direct / MadeInFOOT — après J29 » → (fraîcheur 29, priorité 3)."""
+    if not source:
+        return 0, 0
+    freshness = int(m.group(1)) if (m := _MATCHDAY.search(source)) else 0
+    label = strip_accents(source).lower()
+    priority = max((p for name, p in SOURCE_PRIORITY.items() if name in label), default=0)
+    return freshness, priority
+
+
+def normalize_position(value: Optional[str]) -> Optional[str]:
+    if not value:
+        return value
+    return POSITIONS.get(strip_accents(value).strip().lower(), value)
+
+
+def split_name(full_name: str) -> tuple[str, str]:
+    first, _, last = full_name.strip().partition(" ")
+    return first, last
+
+
+@dataclass
+class SourceRecord:
+    source: str
+    values: dict[str, Any]
+    rank: tuple[int, int] = (0, 0)  # (fraîcheur, priorité)
+
+    @classmethod
+    def build(cls, source: str, values: dict[str, Any]) -> "SourceRecord":
+        kept = {k: v for k, v in values.items() if k in MERGED_FIELDS}
+        if "position" in kept:
+            kept["position"] = normalize_position(kept["position"])
+        return cls(source, kept, parse_source(source))
+
+    @property
+    def abbreviated(self) -> bool:
+        first = name_tokens(self.values.get("first_name", ""))
+        return len(first) == 1 and len(first[0]) == 1
+
+    @property
+    def full_name(self) -> str:
+        return f"{self.values.get('first_name', '')} {self.values.get('last_name', '')}".strip()
+
+
+@dataclass
+class Conflict:
+    key: str
+    field: str
+    chosen: Any
+    chosen_source: str
+    candidates: list[tuple[str, Any]]  # (source, valeur), une par fiche
+    player_id: Optional[int] = None
+
+    def as_dict(self) -> dict:
+        return {"player": self.key, "player_id": self.player_id, "field": self.field, "chosen": self.chosen,
+                "chosen_source": self.chosen_source,
+                "candidates": [{"source": s, "value": v} for s, v in self.candidates]}
+
+
+@dataclass
+class Entity:
+    key: str
+    player_id: Optional[int] = None  # joueur en base auquel l'entité est ancrée
+    records: list[SourceRecord] = field(default_factory=list)
+
+
+def team_key(team: Optional[str]) -> str:
+    return " ".join(name_tokens(team or ""))
+
+
+class Reconciler:
+    """Index haché des joueurs : `add()` en O(1), `merge()` linéaire en nombre de fiches.
+
+    `team_key` ramène le club d'une fiche à sa forme canonique (par défaut :
+    casse et accents ignorés ; `scripts/reconcile.py` résout aussi les noms et
+    surnoms de clubs vers leur code court).
+    """
+
+    def __init__(self, team_key: Callable[[Optional[str]], str] = team_key):
+        self.team_key = team_key
+        self._entities: list[Entity] = []
+        self._by_key: dict[str, Optional[Entity]] = {}  # None = homonymes du même club
+        self._by_initial: dict[str, Optional[Entity]] = {}  # None = forme abrégée ambiguë
+        self.ambiguous: list[dict] = []
+
+    def __len__(self) -> int:
+        return len(self._entities)
+
+    def _key(self, record: SourceRecord) -> str:
+        return f"{self.team_key(record.values.get('team'))}|{player_key(record.full_name)}"
+
+    def _initial_key(self, record: SourceRecord) -> str:
+        v = record.values
+        return f"{self.team_key(v.get('team'))}|{initial_key(v.get('first_name', ''), v.get('last_name', ''))}"
+
+    @staticmethod
+    def _register(index: dict, key: str, entity: Entity) -> None:
+        current = index.get(key, entity)
+        index[key] = entity if current is entity else None
+
+    def _new(self, key: str, player_id: Optional[int] = None) -> Entity:
+        entity = Entity(key, player_id)
+        self._entities.append(entity)
+        return entity
+
+    def add(self, source: str, values: dict[str, Any], player_id: Optional[int] = None) -> Optional[Entity]:
+        """Rattache une fiche ; `player_id` ancre une fiche de la base sur son propre joueur.
+
+        Retourne None si la fiche peut désigner plusieurs joueurs (consignée dans `ambiguous`).
+        """
+        if "first_name" not in values and "player" in values:
+            values = {**values, **dict(zip(("first_name", "last_name"), split_name(values["player"])))}
+        record = SourceRecord.build(source, values)
+        key = self._key(record)
+        if player_id is not None:
+            entity = self._new(key, player_id)
+        else:
+            entity = self._by_key.get(key)
+            if entity is None and key not in self._by_key and record.abbreviated:
+                # Prénom abrégé : rattachement seulement si l'initiale désigne un seul joueur du club
+                ikey = self._initial_key(record)
+                entity = self._by_initial.get(ikey)
+                if entity is None and ikey in self._by_initial:
+                    key = None
+            if entity is None and (key is None or key in self._by_key):
+                self.ambiguous.append({"source": source, "player": record.full_name, "team": values.get("team")})
+                return None
+            if entity is None:
+                entity = self._new(key)
+        entity.records.append(record)
+        self._register(self._by_key, entity.key, entity)
+        self._register(self._by_initial, self._initial_key(record), entity)
+        return entity
+
+    def add_many(self, source: str, rows: Iterable[dict]) -> None:
+        for row in rows:
+            self.add(row.get("source") or source, row)
+
+    def merge(self) -> tuple[list[dict], list[Conflict]]:
+        merged, conflicts = [], []
+        for entity in self._entities:
+            # Plus frais d'abord, puis plus prioritaire ; l'ordre d'arrivée départage
+            ordered = sorted(entity.records, key=lambda r: r.rank, reverse=True)
+            row = {"key": entity.key, "player_id": entity.player_id, "sources": [r.source for r in ordered]}
+            # Nom : la graphie complète la plus fiable, jamais une initiale si mieux est connu
+            named = next((r for r in ordered if not r.abbreviated), ordered[0])
+            row["first_name"] = named.values.get("first_name")
+            row["last_name"] = named.values.get("last_name")
+            for name in MERGED_FIELDS[2:]:
+                candidates = [(r.source, r.values[name]) for r in ordered if r.values.get(name) is not None]
+                if not candidates:
+                    row[name] = None
+                    continue
+                chosen_source, chosen = candidates[0]
+                row[name] = chosen
+                if len({_comparable(v) for _, v in candidates}) > 1:
+                    conflicts.append(Conflict(entity.key, name, chosen, chosen_source, candidates, entity.player_id))
+            merged.append(row)
+        return merged, conflicts
+
+
+def _comparable(value: Any) -> Any:
+    # « Montbéliard » / « montbeliard » : même valeur, pas un conflit
+    return " ".join(name_tokens(value)) if isinstance(value, str) else value
@@ -0,0 +1,91 @@
+"""Profil échantillonné d'une requête, sans dépendance ni débogueur.
+
+Un thread relève toutes les `interval` secondes la pile de chaque thread du
+processus (`sys._current_frames`) : la boucle asyncio, mais aussi les threads
+des pilotes (aiosqlite exécute SQLite dans le sien) quand ils ne sont pas
+bloqués sur un verrou ou une file Python. Chaque échantillon compte pour la
+fonction en haut de pile (temps propre) et pour toutes celles de la pile
+(temps cumulé). Chaque cadre porte sa ligne en cours : un thread bloqué dans
+un appel C (attente de travail ou exécution SQL) se reconnaît à sa ligne. Les
+piles repliées (« folded ») s'ouvrent telles quelles dans speedscope ou
+flamegraph.pl.
+
+La boucle est partagée : les requêtes concurrentes apparaissent aussi dans
+le profil. Une boucle en attente d'E/S apparaît dans `select`/`epoll`.
+"""
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAX_DEPTH = 128
+IDLE_FILES = ("threading.py", "queue.py")  # thread annexe bloqué sur un verrou ou une file : inactif
+
+
+def _label(frame) -> str:
+    """« fonction (fichier:ligne en cours) », chemins relatifs au dépôt ou à site-packages."""
+    code = frame.f_code
+    path = code.co_filename
+    if path.startswith(ROOT):
+        path = os.path.relpath(path, ROOT)
+    elif "site-packages" in path:
+        path = path.split("site-packages" + os.sep, 1)[1]
+    else:
+        path = os.path.basename(path)
+    return f"{code.co_name} ({path}:{frame.f_lineno})"
+
+
+class Sampler:
+    def __init__(self, interval: float = 0.001):
+        """À créer depuis le thread de la boucle, toujours échantillonné même inactif."""
+        self.interval = interval
+        self.loop_thread = threading.get_ident()
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="fcsmtop-profiler", daemon=True)
+
+    def _run(self) -> None:
+        me = threading.get_ident()
+        names = {}
+        while not self._stop.is_set():
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                if ident != self.loop_thread and os.path.basename(frame.f_code.co_filename) in IDLE_FILES:
+                    continue
+                if ident not in names:
+                    names = {t.ident: t.name for t in threading.enumerate()}
+                stack = []
+                while frame is not None and len(stack) < MAX_DEPTH:
+                    stack.append(_label(frame))
+                    frame = frame.f_back
+                stack.append(f"[{names.get(ident, ident)}]")
+                self.stacks[tuple(reversed(stack))] += 1
+            self.samples += 1
+            time.sleep(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    def top(self, limit: int = 30) -> list[dict]:
+        """Fonctions les plus échantillonnées : en haut de pile (self) et n'importe où dans la pile (total)."""
+        own, total = Counter(), Counter()
+        for stack, n in self.stacks.items():
+            own[stack[-1]] += n
+            for function in set(stack[1:]):
+                total[function] += n
+        return [
+            {"function": f, "self": own[f], "total": n}
+            for f, n in sorted(total.items(), key=lambda kv: (-own[kv[0]], -kv[1]))[:limit]
+        ]
+
+    def folded(self) -> str:
+        return "".join(f"{';'.join(stack)} {n}\n" for stack, n in self.stacks.most_common())
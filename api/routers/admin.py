@@ -0,0 +1,87 @@
+"""Administration (jeton requis) : saisie d'une journée complète en un seul lot, diagnostic des lenteurs."""
+import time
+from datetime import datetime, timezone
+from typing import Literal
+
+import httpx
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse
+from api import schemas, services
+from api.auth import require_admin
+from api.cache import cache, skip_reads
+from api.database import AsyncSessionLocal, slow_queries
+from api.profiling import Sampler
+from api.seasons import closed
+from api.teams import registry as teams
+
+router = APIRouter(prefix="/api/v1/admin", tags=["Administration"], dependencies=[Depends(require_admin)])
+
+
+@router.post("/matchdays", response_model=schemas.MatchdayResultOut)
+async def post_matchday(batch: schemas.MatchdayIn):
+    """Résultats, buts, passes et cartons d'une journée, validés puis écrits en une transaction.
+
+    Un match déjà en base (même saison, même affiche) est mis à jour et ses
+    événements remplacés. Un lot invalide est refusé en entier (422, liste des
+    erreurs) sans rien écrire. Une saison close est figée (409).
+    """
+    if closed(batch.season):
+        raise HTTPException(status_code=409, detail=f"Saison {batch.season} close : ses données ne sont plus modifiables")
+    async with AsyncSessionLocal() as db:
+        try:
+            result = await services.apply_matchday(db, batch)
+        except services.BatchError as e:
+            raise HTTPException(status_code=422, detail=e.errors)
+    # Un seul rafraîchissement pour tout le lot : seules les ligues du lot sont
+    # invalidées dans le cache et rechargées dans le magasin colonnaire
+    leagues = {teams.resolve(m.home).league for m in batch.matches}
+    version = cache.bump_leagues(batch.season, leagues)
+    return schemas.MatchdayResultOut(**result, data_version=version)
+
+
+@router.get("/profile", response_model=schemas.ProfileOut,
+            responses={200: {"content": {"text/plain": {}}, "description": "Profil JSON, ou piles repliées"}})
+async def profile_request(
+    request: Request,
+    path: str = Query(..., description="Requête GET à profiler, ex. /api/v1/clubs/FCSM/squad?season=2024"),
+    interval_ms: float = Query(1.0, ge=0.1, le=100, description="Période d'échantillonnage"),
+    cold: bool = Query(False, description="Ignore le cache : le résultat est recalculé (puis réécrit)"),
+    format: Literal["json", "folded"] = Query("json", description="folded : piles repliées (speedscope, flamegraph.pl)"),
+):
+    """Exécute `path` dans ce processus sous échantillonnage de pile et renvoie son profil.
+
+    Le profil couvre tout le processus pendant la requête (voir `api.profiling`) ;
+    les requêtes SQL lentes survenues pendant la mesure sont jointes avec leur plan.
+    """
+    if not path.startswith("/") or path.startswith(router.prefix):
+        raise HTTPException(status_code=422, detail=f"path : chemin absolu attendu, hors {router.prefix}")
+    started = datetime.now(timezone.utc)
+    token = skip_reads.set(cold)
+    try:
+        transport = httpx.ASGITransport(app=request.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://profile") as client:
+            with Sampler(interval_ms / 1000) as sampler:
+                t0 = time.perf_counter()
+                response = await client.get(path)
+                duration = time.perf_counter() - t0
+    finally:
+        skip_reads.reset(token)
+
+    if format == "folded":
+        return PlainTextResponse(sampler.folded())
+    await slow_queries.explained()
+    return schemas.ProfileOut(
+        path=path,
+        status=response.status_code,
+        duration_ms=round(duration * 1000, 2),
+        interval_ms=interval_ms,
+        samples=sampler.samples,
+        top=sampler.top(),
+        slow_queries=[q for q in slow_queries.recent() if q["at"] >= started],
+    )
+
+
+@router.get("/slow-queries", response_model=list[schemas.SlowQueryOut])
+async def get_slow_queries(limit: int = Query(50, ge=1, le=1000)):
+    """Dernières requêtes SQL au-delà de SLOW_QUERY_MS : route d'origine, durée, paramètres et plan."""
+    return slow_queries.recent(limit)
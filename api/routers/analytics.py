@@ -0,0 +1,60 @@
+"""Analyses à partir des minutes des buts et cartons : tranches horaires,
+premier but et remontées, forme glissante. Tout est agrégé en base (fonctions
+de fenêtrage SQL), ou lu dans l'archive pour une saison archivée, et mis en
+cache par version de saison."""
+from fastapi import APIRouter, Depends, HTTPException, Query
+from api import columnar, schemas
+from api.cache import cached
+from api.seasons import CURRENT_SEASON, league_scope
+from api.routers.clubs import _get_team
+from api.shaping import Shape, sparse
+
+router = APIRouter(prefix="/api/v1/analytics", tags=["Analyses"])
+
+LEAGUE = "National"
+
+
+@router.get("/clubs/{club}/timing", response_model=list[schemas.TimingBucketOut])
+async def get_club_timing(
+    club: str,
+    season: str = Query(CURRENT_SEASON),
+    shape: Shape = Depends(sparse(schemas.TimingBucketOut)),
+):
+    """Buts marqués / encaissés et cartons d'un club par tranche de 15 minutes."""
+    team = await _get_team(club)
+    return shape.respond(await cached(league_scope(team.league, season), columnar.club_timing, team, season, shape.fields))
+
+
+@router.get("/clubs/{club}/rolling", response_model=list[schemas.TeamRollingOut])
+async def get_club_rolling(
+    club: str,
+    season: str = Query(CURRENT_SEASON),
+    window: int = Query(5, ge=1, le=38, description="Nombre de matchs de la fenêtre glissante"),
+    shape: Shape = Depends(sparse(schemas.TeamRollingOut)),
+):
+    """Forme glissante d'un club, match après match (moyennes de buts, points sur la fenêtre)."""
+    team = await _get_team(club)
+    return shape.respond(await cached(league_scope(team.league, season), columnar.club_rolling, team, season, window, shape.fields))
+
+
+@router.get("/national/first-goal", response_model=list[schemas.FirstGoalOut])
+async def get_first_goal(
+    season: str = Query(CURRENT_SEASON),
+    shape: Shape = Depends(sparse(schemas.FirstGoalOut)),
+):
+    """Premier but, victoires après avoir été mené et avances perdues, par équipe du National."""
+    return shape.respond(await cached(league_scope(LEAGUE, season), columnar.first_goal, season, LEAGUE, shape.fields))
+
+
+@router.get("/players/{player_id}/rolling", response_model=list[schemas.PlayerRollingOut])
+async def get_player_rolling(
+    player_id: int,
+    season: str = Query(CURRENT_SEASON),
+    window: int = Query(5, ge=1, le=38),
+    shape: Shape = Depends(sparse(schemas.PlayerRollingOut)),
+):
+    """Buts et passes d'un joueur sur une fenêtre glissante de matchs de son équipe."""
+    rows = await cached(season, columnar.player_rolling, player_id, season, window, shape.fields)
+    if rows is None:
+        raise HTTPException(status_code=404, detail=f"Joueur {player_id} introuvable")
+    return shape.respond(rows)
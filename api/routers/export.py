@@ -0,0 +1,252 @@
+"""Export en flux des données brutes d'une ou plusieurs saisons.
+
+Les lignes sont lues par lots via un curseur côté serveur et encodées au fil
+de l'eau : la mémoire reste constante quel que soit le volume exporté et le
+premier octet part avant la fin de la requête SQL. Une saison archivée
+(`api.archive`) est lue dans son fichier, avec les mêmes colonnes et le même
+ordre. Le nombre d'exports simultanés est borné par le contrôle d'admission
+(vue `export`).
+"""
+import csv
+import io
+import json
+from typing import AsyncIterator, Literal, Optional
+
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.orm import aliased
+
+from api.admission import admission
+from api.database import AsyncSessionLocal
+from api import archive, models
+from api.teams import registry as teams
+
+try:
+    import numpy as np
+except ImportError:  # sans NumPy, pas d'archive (`archive.seasons()` est vide) : tout passe par SQL
+    np = None
+
+router = APIRouter(prefix="/api/v1/export", tags=["Export"])
+
+BATCH_SIZE = 500
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+    "columnar": "application/x-ndjson",
+}
+EXTENSIONS = {"ndjson": "ndjson", "csv": "csv", "columnar": "columns.ndjson"}
+
+
+def _matches_stmt():
+    # Même disposition de colonnes que data/matches.csv
+    home, away = aliased(models.Team), aliased(models.Team)
+    return (
+        select(
+            models.Match.matchday,
+            models.Match.match_date.label("date"),
+            home.name.label("home_team"),
+            away.name.label("away_team"),
+            models.Match.home_score,
+            models.Match.away_score,
+            models.Match.season,
+        )
+        .join(home, home.id == models.Match.home_team_id)
+        .join(away, away.id == models.Match.away_team_id)
+        .order_by(models.Match.season, models.Match.matchday, models.Match.id)
+    )
+
+
+def _event_stmt(event, player_col, *extra):
+    return (
+        select(
+            models.Match.season,
+            models.Match.matchday,
+            models.Match.match_date.label("date"),
+            event.match_id,
+            models.Team.name.label("team"),
+            (models.Player.first_name + " " + models.Player.last_name).label("player"),
+            event.minute,
+            *extra,
+        )
+        .join(models.Match, models.Match.id == event.match_id)
+        .join(models.Player, models.Player.id == player_col)
+        .join(models.Team, models.Team.id == models.Player.team_id)
+        .order_by(models.Match.season, models.Match.matchday, event.match_id, event.id)
+    )
+
+
+DATASETS = {
+    "matches": _matches_stmt,
+    "goals": lambda: _event_stmt(models.Goal, models.Goal.scorer_id, models.Goal.penalty, models.Goal.own_goal),
+    "assists": lambda: _event_stmt(models.Assist, models.Assist.player_id),
+    "cards": lambda: _event_stmt(models.Card, models.Card.player_id, models.Card.card_type),
+}
+
+
+async def _partitions(stmt) -> AsyncIterator[tuple[list[str], list]]:
+    """Lit le résultat par lots depuis un curseur côté serveur.
+
+    La session est ouverte dans le générateur : elle vit aussi longtemps que
+    le flux HTTP, indépendamment du cycle de vie des dépendances FastAPI.
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(stmt.execution_options(yield_per=BATCH_SIZE))
+        columns = list(result.keys())
+        async for rows in result.partitions():
+            yield columns, rows
+
+
+# Colonnes propres à chaque jeu d'événements dans l'archive : joueur, puis colonnes ajoutées après `minute`
+EVENT_COLUMNS = {
+    "goals": ("scorer_id", ("penalty", "own_goal")),
+    "assists": ("player_id", ()),
+    "cards": ("player_id", ("red",)),
+}
+
+
+def _nullable(value):
+    """Entier archivé : -1 code NULL (score, minute)."""
+    return None if value == -1 else int(value)
+
+
+def _date(value):
+    return None if np.isnat(value) else value.astype("datetime64[D]").item()
+
+
+async def _archived_partitions(dataset: str, season: str) -> AsyncIterator[tuple[list[str], list]]:
+    """Mêmes colonnes et même ordre que `DATASETS[dataset]`, lus dans l'archive de la saison.
+
+    Seul l'ordre de tri (un tableau d'indices) est calculé d'avance : les lignes
+    sont construites lot par lot, après fermeture de la session.
+    """
+    a = archive.open_season(season)
+    m = a.table("matches")
+    by_id = np.argsort(m["id"], kind="stable")
+    m = {name: values[by_id] for name, values in m.items()}
+    if dataset == "matches":
+        async with AsyncSessionLocal() as db:
+            await teams.ensure(db)
+        columns = ["matchday", "date", "home_team", "away_team", "home_score", "away_score", "season"]
+        order = np.lexsort((m["id"], m["matchday"]))
+
+        def row(i):
+            return (int(m["matchday"][i]), _date(m["match_date"][i]), teams.name(int(m["home_team_id"][i])),
+                    teams.name(int(m["away_team_id"][i])), _nullable(m["home_score"][i]),
+                    _nullable(m["away_score"][i]), season)
+    else:
+        player_col, extra = EVENT_COLUMNS[dataset]
+        t = a.table(dataset, ("id", "match_id", player_col, "minute", *extra))
+        # Comme la jointure SQL : nom et club actuels du joueur ; un joueur supprimé disparaît de l'export
+        async with AsyncSessionLocal() as db:
+            await teams.ensure(db)
+            players = {
+                pid: (f"{first} {last}", team_id)
+                for pid, first, last, team_id in await db.execute(
+                    select(models.Player.id, models.Player.first_name, models.Player.last_name, models.Player.team_id)
+                    .where(models.Player.id.in_(np.unique(t[player_col]).tolist()))
+                )
+            }
+        match = np.searchsorted(m["id"], t["match_id"])
+        columns = ["season", "matchday", "date", "match_id", "team", "player", "minute",
+                   *("card_type" if c == "red" else c for c in extra)]
+        order = np.lexsort((t["id"], t["match_id"], m["matchday"][match]))
+        order = order[np.isin(t[player_col][order], list(players))]
+
+        def row(i):
+            name, team_id = players[int(t[player_col][i])]
+            flags = [bool(t[c][i]) for c in extra]
+            if dataset == "cards":
+                flags = ["red" if flags[0] else "yellow"]
+            j = match[i]
+            return (season, int(m["matchday"][j]), _date(m["match_date"][j]), int(t["match_id"][i]),
+                    teams.name(team_id), name, _nullable(t["minute"][i]), *flags)
+
+    for start in range(0, order.size, BATCH_SIZE):
+        yield columns, [row(i) for i in order[start:start + BATCH_SIZE]]
+
+
+async def _dataset_partitions(dataset: str, season: Optional[str]) -> AsyncIterator[tuple[list[str], list]]:
+    """Lots d'une saison, ou de toutes dans l'ordre des saisons ; une saison archivée est lue dans son fichier."""
+    stmt = DATASETS[dataset]()
+    archived = archive.seasons()
+    if season is not None:
+        sources = [_archived_partitions(dataset, season) if season in archived
+                   else _partitions(stmt.where(models.Match.season == season))]
+    elif not archived:
+        sources = [_partitions(stmt)]
+    else:
+        async with AsyncSessionLocal() as db:
+            live = set(await db.scalars(select(models.Match.season).distinct()))
+        sources = [_archived_partitions(dataset, s) if s in archived else _partitions(stmt.where(models.Match.season == s))
+                   for s in sorted(live | set(archived))]
+    for source in sources:
+        async for part in source:
+            yield part
+
+
+def _json_value(value):
+    return value.isoformat() if hasattr(value, "isoformat") else value
+
+
+async def _encode(dataset: str, season: Optional[str], fmt: str) -> AsyncIterator[str]:
+    header_sent = False
+    async for columns, rows in _dataset_partitions(dataset, season):
+        if fmt == "ndjson":
+            yield "".join(
+                json.dumps({c: _json_value(v) for c, v in zip(columns, row)}, ensure_ascii=False) + "\n"
+                for row in rows
+            )
+        elif fmt == "csv":
+            buf = io.StringIO()
+            writer = csv.writer(buf, lineterminator="\n")
+            if not header_sent:
+                writer.writerow(columns)
+                header_sent = True
+            writer.writerows(rows)
+            yield buf.getvalue()
+        else:
+            # Un objet {colonne: [valeurs]} par lot
+            block = {c: [_json_value(v) for v in values] for c, values in zip(columns, zip(*rows))}
+            yield json.dumps(block, ensure_ascii=False) + "\n"
+
+    if fmt == "csv" and not header_sent:
+        yield ",".join(c.name for c in DATASETS[dataset]().selected_columns) + "\n"
+
+
+class _AdmittedResponse(StreamingResponse):
+    """Flux qui rend sa place d'admission quand la réponse se termine.
+
+    Le `finally` couvre aussi une erreur pendant l'encodage et un client parti
+    avant le premier octet (le générateur n'est alors jamais démarré).
+    """
+
+    def __init__(self, content, limiter, **kwargs):
+        super().__init__(content, **kwargs)
+        self.limiter = limiter
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self.limiter.release()
+
+
+@router.get("/{dataset}")
+async def export_dataset(
+    dataset: Literal["matches", "goals", "assists", "cards"],
+    season: Optional[str] = Query(None, description="Saison (ex: 2025) — toutes si absent"),
+    format: Literal["ndjson", "csv", "columnar"] = Query("ndjson"),
+):
+    """Export en flux d'un jeu de données (matchs, buts, passes, cartons)."""
+    # Place réservée avant l'envoi des en-têtes (503 possible), libérée après le dernier octet
+    limiter = admission.limiter("export")
+    await limiter.acquire()
+    filename = f"{dataset}-{season or 'all'}.{EXTENSIONS[format]}"
+    return _AdmittedResponse(
+        _encode(dataset, season, format),
+        limiter,
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
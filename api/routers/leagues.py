@@ -0,0 +1,71 @@
+"""Lectures par ligue : /api/v1/leagues/{league}/… (ex. « national », « national-2-a », « ligue-2 »).
+
+Chaque (ligue, saison) a sa portée de cache et sa partition du magasin
+colonnaire : une écriture dans une ligue ne touche pas les autres.
+"""
+from dataclasses import asdict
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from api import columnar, schemas, services
+from api.cache import ALL, cached
+from api.seasons import CURRENT_SEASON, league_scope
+from api.shaping import Shape, sparse
+from api.teams import registry as teams
+
+router = APIRouter(prefix="/api/v1/leagues", tags=["Ligues"])
+
+
+async def _get_league(league: str) -> str:
+    await teams.ensure()
+    name = teams.resolve_league(league)
+    if name is None:
+        raise HTTPException(status_code=404, detail=f"Ligue '{league}' introuvable ({', '.join(teams.leagues())})")
+    return name
+
+
+@router.get("", response_model=list[schemas.LeagueOut])
+async def get_leagues(shape: Shape = Depends(sparse(schemas.LeagueOut))):
+    """Ligues présentes en base, avec leurs saisons."""
+    return shape.respond(shape.select(await cached(ALL, services.leagues)))
+
+
+@router.get("/{league}/clubs", response_model=list[schemas.TeamBase])
+async def get_league_clubs(league: str, shape: Shape = Depends(sparse(schemas.TeamBase))):
+    """Clubs d'une ligue."""
+    name = await _get_league(league)
+    return shape.respond(shape.select([asdict(t) for t in sorted(teams.by_league(name), key=lambda t: t.name)]))
+
+
+@router.get("/{league}/classement", response_model=list[schemas.StandingOut])
+async def get_league_classement(
+    league: str,
+    season: str = Query(CURRENT_SEASON),
+    shape: Shape = Depends(sparse(schemas.StandingOut)),
+):
+    """Classement d'une ligue pour une saison."""
+    name = await _get_league(league)
+    return shape.respond(await cached(league_scope(name, season), columnar.standings, season, name, shape.fields))
+
+
+@router.get("/{league}/buteurs", response_model=list[schemas.ScorerOut])
+async def get_league_buteurs(
+    league: str,
+    season: str = Query(CURRENT_SEASON),
+    limit: int = Query(20, le=50),
+    shape: Shape = Depends(sparse(schemas.ScorerOut)),
+):
+    """Meilleurs buteurs d'une ligue pour une saison."""
+    name = await _get_league(league)
+    return shape.respond(await cached(league_scope(name, season), columnar.scorers, season, limit, name, shape.fields))
+
+
+@router.get("/{league}/passeurs", response_model=list[schemas.AssistOut])
+async def get_league_passeurs(
+    league: str,
+    season: str = Query(CURRENT_SEASON),
+    limit: int = Query(20, le=50),
+    shape: Shape = Depends(sparse(schemas.AssistOut)),
+):
+    """Meilleurs passeurs d'une ligue pour une saison."""
+    name = await _get_league(league)
+    return shape.respond(await cached(league_scope(name, season), columnar.assists, season, limit, name, shape.fields))
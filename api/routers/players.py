@@ -0,0 +1,19 @@
+from fastapi import APIRouter, Query, HTTPException
+from api import schemas, services
+from api.cache import cached
+from api.seasons import CURRENT_SEASON
+
+router = APIRouter(prefix="/api/v1/players", tags=["Joueurs"])
+
+
+@router.get("/{player_id}", response_model=schemas.PlayerProfileOut)
+async def get_player(player_id: int, season: str = Query(CURRENT_SEASON)):
+    """Fiche d'un joueur : totaux de la saison et historique saison par saison.
+
+    Mise en cache sur la version de `season` : l'historique des saisons passées,
+    qui ne bouge plus, suit le TTL du cache.
+    """
+    profile = await cached(season, services.player_profile, player_id, season)
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"Joueur {player_id} introuvable")
+    return profile
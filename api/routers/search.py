@@ -0,0 +1,20 @@
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, Query
+from api import schemas
+from api.search import index
+from api.shaping import Shape, sparse
+
+router = APIRouter(prefix="/api/v1/search", tags=["Recherche"])
+
+
+@router.get("", response_model=list[schemas.SearchResultOut])
+async def search(
+    q: str = Query(..., min_length=2, description="Nom (ou partie) d'un joueur, d'un club ou d'une ville"),
+    kind: Optional[Literal["club", "player"]] = Query(None, description="Restreindre aux clubs ou aux joueurs"),
+    limit: int = Query(10, ge=1, le=50),
+    shape: Shape = Depends(sparse(schemas.SearchResultOut)),
+):
+    """Recherche tolérante aux accents et aux fautes de frappe (« evreux », « Sochau », « ngatta »)."""
+    await index.ensure()
+    return shape.respond(shape.select(index.search(q, limit, kind)))
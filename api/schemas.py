@@ -1,6 +1,6 @@
-from datetime import date
-from typing import Optional
-from pydantic import BaseModel, computed_field
+from datetime import date, datetime
+from typing import Literal, Optional
+from pydantic import BaseModel, Field, computed_field
 
 
 class TeamBase(BaseModel):
@@ -82,7 +82,7 @@ class MatchOut(BaseModel):
 class FormOut(BaseModel):
     club: str
     last_n: int
-    matches: list[MatchOut]
+    matches: Optional[list[MatchOut]] = None  # omis avec ?include=
     form_string: str  # e.g. "WWDLW"
     wins: int
     draws: int
@@ -93,7 +93,217 @@ class FormOut(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class TimingBucketOut(BaseModel):
+    bucket: str  # "1-15", "16-30", … "76-90+"
+    scored: int
+    conceded: int
+    yellow_cards: int
+    red_cards: int
+
+
+class FirstGoalOut(BaseModel):
+    team: str
+    team_short: str
+    played: int
+    scored_first: int
+    won_after_scoring_first: int
+    conceded_first: int
+    won_after_conceding_first: int
+    comebacks: int  # victoires après avoir été mené au score
+    points_from_behind: int
+    leads_lost: int  # matchs non gagnés après avoir mené
+
+
+class TeamRollingOut(BaseModel):
+    match_id: int
+    matchday: int
+    match_date: Optional[date]
+    opponent: str
+    goals_for: int
+    goals_against: int
+    points: int
+    window_matches: int
+    rolling_goals_for: float  # moyenne sur la fenêtre
+    rolling_goals_against: float
+    rolling_points: int  # total sur la fenêtre
+
+
+class PlayerRollingOut(BaseModel):
+    match_id: int
+    matchday: int
+    match_date: Optional[date]
+    opponent: str
+    goals: int
+    assists: int
+    window_matches: int
+    rolling_goals: int
+    rolling_assists: int
+
+
+class SearchResultOut(BaseModel):
+    kind: str  # "club" | "player"
+    id: int
+    label: str
+    detail: str  # club du joueur, ou ville et ligue du club
+    score: float  # part des trigrammes de la requête retrouvés (1 = tous)
+
+
+class LeagueOut(BaseModel):
+    name: str
+    slug: str  # pour /api/v1/leagues/{league}/… (ex. « national-2-a »)
+    teams: int
+    seasons: list[str]  # la plus récente d'abord
+
+
+class PlayerSeasonOut(BaseModel):
+    season: str
+    goals: int  # hors CSC
+    penalties: int
+    assists: int
+    yellow_cards: int
+    red_cards: int
+    matches: int  # matchs avec au moins un but, une passe ou un carton
+
+
+class SquadPlayerOut(BaseModel):
+    player_id: int
+    full_name: str
+    position: str
+    number: Optional[int]
+    nationality: str
+    goals: int
+    penalties: int
+    assists: int
+    yellow_cards: int
+    red_cards: int
+    matches: int
+
+
+class PlayerProfileOut(BaseModel):
+    player_id: int
+    full_name: str
+    position: str
+    number: Optional[int]
+    nationality: str
+    birth_date: Optional[date]
+    team: str
+    team_short: str
+    season: PlayerSeasonOut  # saison demandée (zéros si le joueur n'y apparaît pas)
+    history: list[PlayerSeasonOut]  # saisons avec au moins un événement, la plus récente d'abord
+
+
+# ── Saisie d'une journée (écriture par lot) ─────────────────────────────────
+class GoalIn(BaseModel):
+    player_id: int
+    minute: Optional[int] = Field(None, ge=0, le=130)
+    own_goal: bool = False
+    penalty: bool = False
+
+
+class AssistIn(BaseModel):
+    player_id: int
+    minute: Optional[int] = Field(None, ge=0, le=130)
+
+
+class CardIn(BaseModel):
+    player_id: int
+    card_type: Literal["yellow", "red"]
+    minute: Optional[int] = Field(None, ge=0, le=130)
+
+
+class MatchResultIn(BaseModel):
+    home: str  # code ou nom du club, comme dans les routes /clubs/{club}
+    away: str
+    home_score: int = Field(ge=0)
+    away_score: int = Field(ge=0)
+    match_date: Optional[date] = None  # défaut : date de la journée
+    goals: list[GoalIn] = []
+    assists: list[AssistIn] = []
+    cards: list[CardIn] = []
+
+
+class MatchdayIn(BaseModel):
+    season: str
+    matchday: int = Field(ge=1)
+    match_date: Optional[date] = None
+    matches: list[MatchResultIn] = Field(min_length=1)
+
+
+class MatchdayResultOut(BaseModel):
+    season: str
+    matchday: int
+    matches_created: int
+    matches_updated: int
+    goals: int
+    assists: int
+    cards: int
+    data_version: int  # version de cache de la saison après écriture
+
+
 class HealthOut(BaseModel):
     status: str
     version: str
     db: str
+
+
+class DbProbeOut(BaseModel):
+    type: str
+    ok: bool
+    latency_ms: Optional[float] = None  # aller-retour SELECT 1 (connexion du pool comprise)
+
+
+class PoolOut(BaseModel):
+    pool: str  # classe du pool SQLAlchemy
+    size: Optional[int] = None
+    checked_out: Optional[int] = None
+    checked_in: Optional[int] = None
+    overflow: Optional[int] = None
+
+
+class CacheStatsOut(BaseModel):
+    backend: str
+    hits: int
+    misses: int
+    hit_rate: float
+
+
+class FreshnessOut(BaseModel):
+    season: str
+    last_matchday: Optional[int] = None  # dernière journée jouée en base
+    last_match_date: Optional[date] = None
+    age_days: Optional[int] = None
+
+
+class ReadinessOut(BaseModel):
+    status: Literal["ready", "not_ready"]
+    version: str
+    problems: list[str]  # vide quand l'instance est prête
+    db: DbProbeOut
+    pool: PoolOut
+    cache: CacheStatsOut
+    freshness: Optional[FreshnessOut] = None
+
+
+class SlowQueryOut(BaseModel):
+    at: datetime
+    route: Optional[str] = None  # « GET /api/v1/clubs/{club}/squad », absente hors requête HTTP
+    duration_ms: float
+    statement: str
+    parameters: Optional[str] = None
+    plan: Optional[list[str]] = None  # EXPLAIN (QUERY PLAN), rempli juste après la requête
+
+
+class ProfileFunctionOut(BaseModel):
+    function: str  # « nom (fichier:ligne) »
+    self: int  # échantillons où la fonction est en haut de pile
+    total: int  # échantillons où elle est dans la pile
+
+
+class ProfileOut(BaseModel):
+    path: str
+    status: int  # statut HTTP de la requête profilée
+    duration_ms: float
+    interval_ms: float
+    samples: int
+    top: list[ProfileFunctionOut]
+    slow_queries: list[SlowQueryOut]  # requêtes lentes survenues pendant la mesure
@@ -0,0 +1,157 @@
+"""Recherche approximative de joueurs et de clubs dans un index trigrammes en mémoire.
+
+Noms de joueurs, noms de clubs, codes, villes et surnoms sont normalisés
+(`api.normalize` : accents, casse, apostrophes — « Évreux », « Béziers »,
+« N'Gatta ») puis découpés en trigrammes, chaque mot étant bordé d'espaces pour
+favoriser les débuts de mots. Une requête ne lit que les listes de ses propres
+trigrammes : pas de `LIKE '%…%'`, et une faute de frappe ne fait perdre que
+quelques trigrammes (« Sochau », « Bezier », « Ngata » trouvent leur cible).
+
+L'index est mis à jour par différence : après une écriture sur `players` ou
+`teams` dans ce processus, ou un `cache.bump(ALL)` d'un autre processus, seules
+les fiches ajoutées, modifiées ou supprimées sont réindexées.
+"""
+import asyncio
+from collections import Counter
+from dataclasses import dataclass
+from math import ceil
+from typing import Optional
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.dml import UpdateBase
+
+from api import models
+from api.cache import ALL, cache
+from api.database import AsyncSessionLocal, engine
+from api.normalize import name_tokens
+from api.teams import ALIASES, registry as teams
+
+MIN_SCORE = 0.5  # part minimale des trigrammes de la requête retrouvés dans la fiche
+
+
+def trigrams(text: str) -> frozenset[str]:
+    grams = set()
+    for token in name_tokens(text):
+        padded = f"  {token} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+@dataclass(frozen=True)
+class SearchEntry:
+    kind: str  # "club" | "player"
+    id: int
+    label: str
+    detail: str
+    text: str  # texte indexé (nom, et pour un club code, ville et surnoms)
+
+
+class SearchIndex:
+    def __init__(self):
+        self._entries: dict[tuple[str, int], SearchEntry] = {}
+        self._grams: dict[tuple[str, int], frozenset[str]] = {}
+        self._postings: dict[str, set[tuple[str, int]]] = {}
+        self._version: Optional[int] = None
+        self._stale = True
+        self._lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def invalidate(self) -> None:
+        self._stale = True
+
+    def _remove(self, key: tuple[str, int]) -> None:
+        del self._entries[key]
+        for gram in self._grams.pop(key):
+            postings = self._postings[gram]
+            postings.discard(key)
+            if not postings:
+                del self._postings[gram]
+
+    def _add(self, entry: SearchEntry) -> None:
+        key = (entry.kind, entry.id)
+        self._entries[key] = entry
+        self._grams[key] = grams = trigrams(entry.text)
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(key)
+
+    def update(self, entries: list[SearchEntry]) -> int:
+        """Remplace le contenu par `entries` en ne découpant et réindexant que les fiches changées."""
+        wanted = {(e.kind, e.id): e for e in entries}
+        changed = 0
+        for key in [k for k in self._entries if k not in wanted]:
+            self._remove(key)
+            changed += 1
+        for key, entry in wanted.items():
+            if self._entries.get(key) != entry:
+                if key in self._entries:
+                    self._remove(key)
+                self._add(entry)
+                changed += 1
+        return changed
+
+    async def _load(self, db: AsyncSession) -> list[SearchEntry]:
+        await teams.ensure(db)
+        aliases: dict[str, list[str]] = {}
+        for alias, short in ALIASES.items():
+            aliases.setdefault(short, []).append(alias)
+        entries = [
+            SearchEntry("club", t.id, t.name, f"{t.city} — {t.league}",
+                        " ".join([t.name, t.short_name, t.city, *aliases.get(t.short_name, [])]))
+            for t in teams.all()
+        ]
+        players = await db.execute(
+            select(models.Player.id, models.Player.first_name, models.Player.last_name, models.Player.team_id)
+        )
+        for player_id, first, last, team_id in players:
+            label = f"{first} {last}"
+            entries.append(SearchEntry("player", player_id, label, teams.short_name(team_id), label))
+        return entries
+
+    async def ensure(self, db: Optional[AsyncSession] = None) -> None:
+        """Met l'index à jour si une écriture a eu lieu depuis le dernier chargement."""
+        version = cache.version(ALL)
+        if not self._stale and version == self._version:
+            return
+        async with self._lock:
+            if not self._stale and version == self._version:
+                return
+            self._stale = False
+            if db is not None:
+                self.update(await self._load(db))
+            else:
+                async with AsyncSessionLocal() as own:
+                    self.update(await self._load(own))
+            self._version = version
+
+    def search(self, query: str, limit: int = 10, kind: Optional[str] = None) -> list[dict]:
+        """Fiches classées par part des trigrammes de la requête retrouvés, puis par proximité de longueur."""
+        q = trigrams(query)
+        if not q:
+            return []
+        shared = Counter()
+        for gram in q:
+            shared.update(self._postings.get(gram, ()))
+        need = ceil(len(q) * MIN_SCORE)
+        hits = []
+        for key, n in shared.items():
+            if n < need or (kind and key[0] != kind):
+                continue
+            entry = self._entries[key]
+            hits.append((n / len(q), 2 * n / (len(q) + len(self._grams[key])), entry))
+        hits.sort(key=lambda h: (-h[0], -h[1], h[2].label))
+        return [
+            {"kind": e.kind, "id": e.id, "label": e.label, "detail": e.detail, "score": round(score, 3)}
+            for score, _, e in hits[:limit]
+        ]
+
+
+index = SearchIndex()
+
+
+@event.listens_for(engine.sync_engine, "after_execute")
+def _invalidate_on_write(conn, clauseelement, multiparams, params, execution_options, result):
+    if isinstance(clauseelement, UpdateBase) and clauseelement.table in (models.Player.__table__, models.Team.__table__):
+        index.invalidate()
@@ -0,0 +1,74 @@
+"""Saison courante, saisons closes et partition du cache par (ligue, saison).
+
+Les lectures d'une ligue (classement, buteurs, clubs, colonnes du magasin
+`api.columnar`) sont mises en cache sous la portée « saison/ligue » : une
+journée de National 2 saisie par l'API n'invalide ni le cache ni les colonnes
+du National. Les vues transverses (fiche joueur, forme d'un joueur) restent
+sous la portée de la saison, incrémentée elle aussi à chaque écriture.
+
+Une saison antérieure à CURRENT_SEASON est close : l'API refuse d'y écrire,
+ses réponses restent en cache sans expiration (seule une correction hors
+ligne, qui fait `cache.bump(ALL)`, les renouvelle) et sont servies avec
+`Cache-Control: immutable` si la saison existe (en base ou archivée) : une
+saison encore absente ne doit pas figer une réponse vide chez les clients.
+"""
+import os
+from typing import Awaitable, Callable
+from urllib.parse import parse_qs
+
+from starlette.datastructures import MutableHeaders
+
+from api.admission import Overloaded
+
+CURRENT_SEASON = os.getenv("CURRENT_SEASON", "2025")
+CLOSED_TTL = 365 * 24 * 3600
+
+IMMUTABLE = f"public, max-age={CLOSED_TTL}, immutable"
+# Lectures paramétrées par ?season= dont le résultat ne dépend que de la saison
+IMMUTABLE_PREFIXES = ("/api/v1/leagues/", "/api/v1/national/", "/api/v1/clubs/", "/api/v1/analytics/")
+
+
+def closed(season: str) -> bool:
+    """Saison terminée (les saisons sont des années : « 2024 » < « 2025 »)."""
+    return len(season) == len(CURRENT_SEASON) and season < CURRENT_SEASON
+
+
+def league_scope(league: str, season: str) -> str:
+    """Portée de cache d'une ligue pour une saison."""
+    return f"{season}/{league}"
+
+
+def season_of(scope_name: str) -> str:
+    return scope_name.split("/", 1)[0]
+
+
+class ClosedSeasonMiddleware:
+    """Ajoute `Cache-Control: immutable` aux lectures réussies d'une saison close existante.
+
+    `exists` dit si une saison a des données ; elle est fournie par l'application
+    (ce module ne dépend ni de la base ni du cache).
+    """
+
+    def __init__(self, app, exists: Callable[[str], Awaitable[bool]]):
+        self.app = app
+        self.exists = exists
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET" or not scope["path"].startswith(IMMUTABLE_PREFIXES):
+            return await self.app(scope, receive, send)
+        season = parse_qs(scope["query_string"].decode()).get("season", [""])[-1]
+        if not closed(season):
+            return await self.app(scope, receive, send)
+        try:
+            known = await self.exists(season)
+        except Overloaded:  # existence inconnue : réponse servie sans en-tête plutôt que refusée
+            known = False
+        if not known:
+            return await self.app(scope, receive, send)
+
+        async def send_with_header(message):
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                MutableHeaders(scope=message)["Cache-Control"] = IMMUTABLE
+            await send(message)
+
+        await self.app(scope, receive, send_with_header)
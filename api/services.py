@@ -0,0 +1,971 @@
+"""Requêtes métier partagées par l'API et le CLI.
+
+Chaque fonction reçoit une session et renvoie des lignes typées (schémas
+Pydantic), ou des dicts réduits aux champs demandés quand `fields` est
+fourni (voir `api.shaping`). Les routers y ajoutent le cache et la mise en
+forme HTTP, le CLI l'affichage Rich : une optimisation ou une correction
+faite ici profite aux deux.
+
+Les requêtes chaudes sont construites une seule fois par forme (champs
+demandés) avec des paramètres liés (`bindparam`) : un appel ne reconstruit
+ni ne recompile rien, et le SQL émis, toujours identique, reste préparé par
+connexion (voir `api.database.make_engine`).
+"""
+from functools import lru_cache
+from typing import Optional
+
+from sqlalchemy import bindparam, case, delete, func, insert, literal, or_, select, union_all, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from api import archive, models, schemas
+from api.shaping import Fields, project, wants
+from api.teams import TeamInfo, league_slug, registry as teams
+
+DEFAULT_LEAGUE = "National"
+
+
+async def _league_team_ids(db: AsyncSession, league: str) -> list[int]:
+    await teams.ensure(db)
+    return [t.id for t in teams.by_league(league)]
+
+
+async def scorers(
+    db: AsyncSession, season: str, limit: int, league: str = DEFAULT_LEAGUE, fields: Fields = None,
+) -> list:
+    """Meilleurs buteurs d'une ligue (buts hors CSC, penalties, passes décisives de la saison)."""
+    team_ids = await _league_team_ids(db, league)
+    stmt = _scorers_stmt(
+        wants(fields, "full_name"), wants(fields, "team", "team_short"), wants(fields, "penalties"),
+        wants(fields, "assists"),
+    )
+    rows = (await db.execute(stmt, {"season": season, "team_ids": team_ids, "limit": limit})).mappings().all()
+    return scorer_rows(rows, fields)
+
+
+def _scorer_columns(names: bool, penalties: bool) -> tuple[list, object]:
+    goals = func.count(models.Goal.id).filter(models.Goal.own_goal.is_(False))
+    columns = [models.Player.id, goals.label("goals")]
+    if names:
+        columns += [models.Player.first_name, models.Player.last_name]
+    if penalties:
+        columns.append(func.count(models.Goal.id).filter(models.Goal.penalty.is_(True)).label("penalties"))
+    return columns, goals
+
+
+@lru_cache(maxsize=None)
+def _scorers_stmt(names: bool, team: bool, penalties: bool, with_assists: bool):
+    columns, goals = _scorer_columns(names, penalties)
+    if team:
+        columns.append(models.Player.team_id)
+    if with_assists:
+        # Sous-requête corrélée : une jointure sur les passes multiplierait les buts
+        assist_match = aliased(models.Match)
+        columns.append(
+            select(func.count(models.Assist.id))
+            .join(assist_match, assist_match.id == models.Assist.match_id)
+            .where(models.Assist.player_id == models.Player.id, assist_match.season == bindparam("season"))
+            .correlate(models.Player)
+            .scalar_subquery()
+            .label("assists")
+        )
+    return (
+        select(*columns)
+        .join(models.Goal, models.Goal.scorer_id == models.Player.id)
+        .join(models.Match, models.Match.id == models.Goal.match_id)
+        .where(
+            models.Match.season == bindparam("season"),
+            models.Goal.own_goal.is_(False),
+            models.Player.team_id.in_(bindparam("team_ids", expanding=True)),
+        )
+        .group_by(models.Player.id)
+        .order_by(goals.desc(), models.Player.id)
+        .limit(bindparam("limit"))
+    )
+
+
+def scorer_rows(rows, fields: Fields, team: Optional[TeamInfo] = None) -> list:
+    """Lignes de buteurs classées (id, goals [, first_name, last_name, team_id, penalties, assists])."""
+    return project([
+        {
+            "rank": i + 1,
+            "player_id": r["id"],
+            "full_name": f"{r.get('first_name')} {r.get('last_name')}",
+            "team": team.name if team else teams.name(r.get("team_id")),
+            "team_short": team.short_name if team else teams.short_name(r.get("team_id")),
+            "goals": r["goals"],
+            "assists": 0 if team else r.get("assists", 0),
+            "penalties": r.get("penalties", 0),
+        }
+        for i, r in enumerate(rows)
+    ], fields, schemas.ScorerOut)
+
+
+async def assists(
+    db: AsyncSession, season: str, limit: int, league: str = DEFAULT_LEAGUE, fields: Fields = None,
+) -> list:
+    """Meilleurs passeurs décisifs d'une ligue."""
+    team_ids = await _league_team_ids(db, league)
+    stmt = _assists_stmt(wants(fields, "full_name"), wants(fields, "team"))
+    rows = (await db.execute(stmt, {"season": season, "team_ids": team_ids, "limit": limit})).mappings().all()
+    return assist_rows(rows, fields)
+
+
+def _assist_columns(names: bool) -> tuple[list, object]:
+    count = func.count(models.Assist.id)
+    columns = [models.Player.id, count.label("assists")]
+    if names:
+        columns += [models.Player.first_name, models.Player.last_name]
+    return columns, count
+
+
+@lru_cache(maxsize=None)
+def _assists_stmt(names: bool, team: bool):
+    columns, count = _assist_columns(names)
+    if team:
+        columns.append(models.Player.team_id)
+    return (
+        select(*columns)
+        .join(models.Assist, models.Assist.player_id == models.Player.id)
+        .join(models.Match, models.Match.id == models.Assist.match_id)
+        .where(
+            models.Match.season == bindparam("season"),
+            models.Player.team_id.in_(bindparam("team_ids", expanding=True)),
+        )
+        .group_by(models.Player.id)
+        .order_by(count.desc(), models.Player.id)
+        .limit(bindparam("limit"))
+    )
+
+
+def assist_rows(rows, fields: Fields, team: Optional[TeamInfo] = None) -> list:
+    """Lignes de passeurs classées (id, assists [, first_name, last_name, team_id])."""
+    return project([
+        {
+            "rank": i + 1,
+            "player_id": r["id"],
+            "full_name": f"{r.get('first_name')} {r.get('last_name')}",
+            "team": team.name if team else teams.name(r.get("team_id")),
+            "assists": r["assists"],
+        }
+        for i, r in enumerate(rows)
+    ], fields, schemas.AssistOut)
+
+
+async def standings(db: AsyncSession, season: str, league: str = DEFAULT_LEAGUE, fields: Fields = None) -> list:
+    """Classement d'une ligue en une requête : chaque match compté du point de vue des deux équipes."""
+    await teams.ensure(db)
+    totals = {r["team_id"]: r for r in (await db.execute(_standings_stmt(), {"season": season})).mappings().all()}
+    return standing_rows(totals, league, fields)
+
+
+@lru_cache(maxsize=None)
+def _standings_stmt():
+    played = (models.Match.season == bindparam("season"), models.Match.played.is_(True))
+    home_score, away_score = func.coalesce(models.Match.home_score, 0), func.coalesce(models.Match.away_score, 0)
+    sides = union_all(
+        select(models.Match.home_team_id.label("team_id"), home_score.label("gf"), away_score.label("ga")).where(*played),
+        select(models.Match.away_team_id.label("team_id"), away_score.label("gf"), home_score.label("ga")).where(*played),
+    ).subquery()
+    return select(
+        sides.c.team_id,
+        func.count().label("played"),
+        func.sum(case((sides.c.gf > sides.c.ga, 1), else_=0)).label("won"),
+        func.sum(case((sides.c.gf == sides.c.ga, 1), else_=0)).label("drawn"),
+        func.sum(case((sides.c.gf < sides.c.ga, 1), else_=0)).label("lost"),
+        func.sum(sides.c.gf).label("goals_for"),
+        func.sum(sides.c.ga).label("goals_against"),
+    ).group_by(sides.c.team_id)
+
+
+def standing_rows(totals: dict, league: str, fields: Fields) -> list:
+    """Classement d'une ligue à partir des totaux par équipe (played, won, drawn, lost, goals_for, goals_against)."""
+    table = []
+    for team in teams.by_league(league):
+        r = totals.get(team.id, {})
+        w, d, gf, ga = r.get("won", 0), r.get("drawn", 0), r.get("goals_for", 0), r.get("goals_against", 0)
+        table.append({
+            "team": team.name,
+            "team_short": team.short_name,
+            "played": r.get("played", 0),
+            "won": w,
+            "drawn": d,
+            "lost": r.get("lost", 0),
+            "goals_for": gf,
+            "goals_against": ga,
+            "goal_diff": gf - ga,
+            "points": w * 3 + d,
+        })
+
+    table.sort(key=lambda x: (-x["points"], -x["goal_diff"], -x["goals_for"]))
+    return project([{"rank": i + 1, **s} for i, s in enumerate(table)], fields, schemas.StandingOut)
+
+
+async def club_scorers(db: AsyncSession, team: TeamInfo, season: str, fields: Fields = None) -> list:
+    stmt = _club_scorers_stmt(wants(fields, "full_name"), wants(fields, "penalties"))
+    rows = (await db.execute(stmt, {"team_id": team.id, "season": season})).mappings().all()
+    return scorer_rows(rows, fields, team)
+
+
+@lru_cache(maxsize=None)
+def _club_scorers_stmt(names: bool, penalties: bool):
+    columns, goals = _scorer_columns(names, penalties)
+    return (
+        select(*columns)
+        .join(models.Goal, models.Goal.scorer_id == models.Player.id)
+        .join(models.Match, models.Match.id == models.Goal.match_id)
+        .where(
+            models.Player.team_id == bindparam("team_id"),
+            models.Match.season == bindparam("season"),
+            models.Goal.own_goal.is_(False),
+        )
+        .group_by(models.Player.id)
+        .order_by(goals.desc(), models.Player.id)
+    )
+
+
+async def club_assists(db: AsyncSession, team: TeamInfo, season: str, fields: Fields = None) -> list:
+    stmt = _club_assists_stmt(wants(fields, "full_name"))
+    rows = (await db.execute(stmt, {"team_id": team.id, "season": season})).mappings().all()
+    return assist_rows(rows, fields, team)
+
+
+@lru_cache(maxsize=None)
+def _club_assists_stmt(names: bool):
+    columns, count = _assist_columns(names)
+    return (
+        select(*columns)
+        .join(models.Assist, models.Assist.player_id == models.Player.id)
+        .join(models.Match, models.Match.id == models.Assist.match_id)
+        .where(models.Player.team_id == bindparam("team_id"), models.Match.season == bindparam("season"))
+        .group_by(models.Player.id)
+        .order_by(count.desc(), models.Player.id)
+    )
+
+
+def _match_columns(with_details: bool) -> list:
+    # Équipes et scores suffisent pour le résultat et la forme ; le reste n'est lu que s'il est renvoyé
+    columns = [
+        models.Match.home_team_id, models.Match.away_team_id, models.Match.home_score, models.Match.away_score,
+    ]
+    if with_details:
+        columns += [models.Match.id, models.Match.matchday, models.Match.match_date]
+    return columns
+
+
+@lru_cache(maxsize=None)
+def _recent_matches_stmt(with_details: bool):
+    """Derniers matchs joués d'une équipe (paramètres team_id, season, last)."""
+    team_id = bindparam("team_id")
+    return (
+        select(*_match_columns(with_details))
+        .where(
+            or_(models.Match.home_team_id == team_id, models.Match.away_team_id == team_id),
+            models.Match.season == bindparam("season"),
+            models.Match.played.is_(True),
+        )
+        .order_by(models.Match.match_date.desc(), models.Match.id.desc())
+        .limit(bindparam("last"))
+    )
+
+
+async def _recent_matches(db: AsyncSession, team: TeamInfo, season: str, last: int, with_details: bool) -> list:
+    params = {"team_id": team.id, "season": season, "last": last}
+    return (await db.execute(_recent_matches_stmt(with_details), params)).mappings().all()
+
+
+def _result(team: TeamInfo, m) -> tuple[int, int, str]:
+    """(buts pour, buts contre, W/D/L) du point de vue de `team`."""
+    is_home = m["home_team_id"] == team.id
+    gf = (m["home_score"] if is_home else m["away_score"]) or 0
+    ga = (m["away_score"] if is_home else m["home_score"]) or 0
+    return gf, ga, "W" if gf > ga else ("D" if gf == ga else "L")
+
+
+async def club_matches(db: AsyncSession, team: TeamInfo, season: str, last: int, fields: Fields = None) -> list:
+    rows = await _recent_matches(db, team, season, last, wants(fields, "id", "matchday", "match_date"))
+    return match_rows(team, rows, fields)
+
+
+def match_rows(team: TeamInfo, rows, fields: Fields) -> list:
+    """Matchs du point de vue de `team` (home/away_team_id, scores [, id, matchday, match_date])."""
+    out = []
+    for m in rows:
+        scored = m["home_score"] is not None and m["away_score"] is not None
+        out.append({
+            "id": m.get("id"),
+            "matchday": m.get("matchday"),
+            "match_date": m.get("match_date"),
+            "home_team": teams.name(m["home_team_id"]),
+            "away_team": teams.name(m["away_team_id"]),
+            "home_score": m["home_score"],
+            "away_score": m["away_score"],
+            "result": _result(team, m)[2] if scored else None,
+        })
+
+    return project(out, fields, schemas.MatchOut)
+
+
+async def club_form(
+    db: AsyncSession, team: TeamInfo, season: str, last: int, with_matches: bool = True,
+) -> schemas.FormOut:
+    rows = await _recent_matches(db, team, season, last, with_matches)
+    return form_out(team, rows, last, with_matches)
+
+
+def form_out(team: TeamInfo, rows, last: int, with_matches: bool) -> schemas.FormOut:
+    """Forme calculée sur les matchs joués, du plus récent au plus ancien."""
+    match_outs = []
+    form_chars = []
+    wins = draws = losses = gf_total = ga_total = 0
+
+    for m in rows:
+        gf, ga, result = _result(team, m)
+        gf_total += gf
+        ga_total += ga
+        form_chars.append(result)
+        if result == "W":
+            wins += 1
+        elif result == "D":
+            draws += 1
+        else:
+            losses += 1
+        if with_matches:
+            match_outs.append(schemas.MatchOut(
+                id=m["id"], matchday=m["matchday"], match_date=m["match_date"],
+                home_team=teams.name(m["home_team_id"]), away_team=teams.name(m["away_team_id"]),
+                home_score=m["home_score"], away_score=m["away_score"],
+                result=result,
+            ))
+
+    return schemas.FormOut(
+        club=team.name,
+        last_n=last,
+        matches=match_outs if with_matches else None,
+        form_string="".join(form_chars),
+        wins=wins,
+        draws=draws,
+        losses=losses,
+        goals_scored=gf_total,
+        goals_conceded=ga_total,
+    )
+
+
+FINGERPRINT_TABLES = ("matches", "goals", "assists")
+
+
+async def season_fingerprint(db: AsyncSession, season: str) -> dict[str, tuple]:
+    """Empreinte légère des données d'une saison, par table (agrégats sur index, sans lire les lignes).
+
+    Détecte les écritures de n'importe quel processus (scraper, seed, API) : une
+    empreinte inchangée signifie que les vues qui en dépendent sont à jour.
+    Une saison archivée a pour empreinte, pour chaque table, la somme de
+    contrôle de son fichier (mêmes clés : les appelants indexent par table).
+    """
+    if archive.has(season):
+        checksum = archive.open_season(season).header["checksum"]
+        return {table: ("archive", checksum) for table in FINGERPRINT_TABLES}
+    matches = (await db.execute(
+        select(
+            func.count(models.Match.id),
+            func.count(models.Match.id).filter(models.Match.played.is_(True)),
+            func.max(models.Match.id),
+            # Pondéré par l'id : une correction de score (2-1 → 1-2) change aussi l'empreinte
+            func.sum(models.Match.home_score * models.Match.id),
+            func.sum(models.Match.away_score * models.Match.id),
+        ).where(models.Match.season == season)
+    )).one()
+    goals = (await db.execute(
+        select(func.count(models.Goal.id), func.max(models.Goal.id), func.sum(models.Goal.scorer_id))
+        .join(models.Match, models.Match.id == models.Goal.match_id)
+        .where(models.Match.season == season)
+    )).one()
+    assists = (await db.execute(
+        select(func.count(models.Assist.id), func.max(models.Assist.id), func.sum(models.Assist.player_id))
+        .join(models.Match, models.Match.id == models.Assist.match_id)
+        .where(models.Match.season == season)
+    )).one()
+    return dict(zip(FINGERPRINT_TABLES, (tuple(matches), tuple(goals), tuple(assists))))
+
+
+async def club_fingerprints(db: AsyncSession, season: str) -> dict[int, tuple]:
+    """Empreinte par club (matchs joués à domicile ou à l'extérieur, buts et passes de ses joueurs).
+
+    Même principe que `season_fingerprint`, ventilé par équipe en trois
+    requêtes groupées : seules les vues des clubs dont l'empreinte change sont
+    à recalculer.
+    """
+    if archive.has(season):
+        header = archive.open_season(season).header
+        return {team_id: ("archive", header["checksum"]) for team_id in header["teams"]}
+    M = models.Match
+    sides = union_all(
+        select(M.home_team_id.label("team_id"), M.id, M.home_score, M.away_score, M.played).where(M.season == season),
+        select(M.away_team_id.label("team_id"), M.id, M.home_score, M.away_score, M.played).where(M.season == season),
+    ).subquery()
+    matches = await db.execute(
+        select(
+            sides.c.team_id, func.count(), func.count().filter(sides.c.played.is_(True)), func.max(sides.c.id),
+            func.sum(sides.c.home_score * sides.c.id), func.sum(sides.c.away_score * sides.c.id),
+        ).group_by(sides.c.team_id)
+    )
+    out = {team_id: tuple(rest) for team_id, *rest in matches}
+    for event, player_column in ((models.Goal, models.Goal.scorer_id), (models.Assist, models.Assist.player_id)):
+        rows = await db.execute(
+            select(models.Player.team_id, func.count(event.id), func.max(event.id), func.sum(player_column))
+            .join(models.Player, models.Player.id == player_column)
+            .join(M, M.id == event.match_id)
+            .where(M.season == season)
+            .group_by(models.Player.team_id)
+        )
+        for team_id, *rest in rows:
+            out[team_id] = out.get(team_id, ()) + (event.__tablename__, *rest)
+    return out
+
+
+async def seasons(db: AsyncSession) -> list[str]:
+    """Saisons présentes en base ou archivées, la plus récente d'abord."""
+    rows = await db.scalars(select(models.Match.season).distinct())
+    return sorted({*rows, *archive.seasons()}, reverse=True)
+
+
+async def leagues(db: AsyncSession) -> list[schemas.LeagueOut]:
+    """Ligues et saisons présentes en base (l'équipe à domicile donne la ligue d'un match)."""
+    await teams.ensure(db)
+    rows = await db.execute(
+        select(models.Team.league, models.Match.season)
+        .join(models.Match, models.Match.home_team_id == models.Team.id)
+        .distinct()
+    )
+    by_league: dict[str, list[str]] = {}
+    for league, season in rows:
+        by_league.setdefault(league, []).append(season)
+    for season in archive.seasons():
+        for league in archive.open_season(season).header["leagues"]:
+            by_league.setdefault(league, []).append(season)
+    return [
+        schemas.LeagueOut(name=league, slug=league_slug(league), teams=len(teams.by_league(league)),
+                          seasons=sorted(by_league.get(league, []), reverse=True))
+        for league in teams.leagues()
+    ]
+
+
+# ── Analyses temporelles (fonctions de fenêtrage SQL) ──────────────────────────
+BUCKETS = ["1-15", "16-30", "31-45", "46-60", "61-75", "76-90+"]
+
+
+def _bucket(minute):
+    """Tranche de 15 minutes (0 → 5) ; temps additionnel rattaché à la dernière tranche de la mi-temps."""
+    return case((minute > 90, 5), (minute < 1, 0), else_=(minute - 1) // 15)
+
+
+def _scoring_team():
+    """Équipe créditée d'un but : celle du buteur, ou l'adversaire pour un c.s.c."""
+    return case(
+        (models.Goal.own_goal.is_(False), models.Player.team_id),
+        (models.Player.team_id == models.Match.home_team_id, models.Match.away_team_id),
+        else_=models.Match.home_team_id,
+    )
+
+
+def _side_filter(team: TeamInfo):
+    return or_(models.Match.home_team_id == team.id, models.Match.away_team_id == team.id)
+
+
+async def club_timing(db: AsyncSession, team: TeamInfo, season: str, fields: Fields = None) -> list:
+    """Buts marqués / encaissés et cartons reçus par tranche de 15 minutes (agrégés en base)."""
+    scoring = _scoring_team()
+    bucket = _bucket(models.Goal.minute).label("bucket")
+    goal_rows = await db.execute(
+        select(
+            bucket,
+            func.count().filter(scoring == team.id).label("scored"),
+            func.count().filter(scoring != team.id).label("conceded"),
+        )
+        .select_from(models.Goal)
+        .join(models.Match, models.Match.id == models.Goal.match_id)
+        .join(models.Player, models.Player.id == models.Goal.scorer_id)
+        .where(models.Match.season == season, _side_filter(team), models.Goal.minute.is_not(None))
+        .group_by(bucket)
+    )
+    totals = {r.bucket: {"scored": r.scored, "conceded": r.conceded} for r in goal_rows}
+
+    if wants(fields, "yellow_cards", "red_cards"):
+        card_bucket = _bucket(models.Card.minute).label("bucket")
+        card_rows = await db.execute(
+            select(
+                card_bucket,
+                func.count().filter(models.Card.card_type == "yellow").label("yellow"),
+                func.count().filter(models.Card.card_type == "red").label("red"),
+            )
+            .select_from(models.Card)
+            .join(models.Match, models.Match.id == models.Card.match_id)
+            .join(models.Player, models.Player.id == models.Card.player_id)
+            .where(models.Match.season == season, models.Player.team_id == team.id, models.Card.minute.is_not(None))
+            .group_by(card_bucket)
+        )
+        for r in card_rows:
+            totals.setdefault(r.bucket, {}).update(yellow_cards=r.yellow, red_cards=r.red)
+    return timing_rows(totals, fields)
+
+
+def timing_rows(totals: dict[int, dict], fields: Fields) -> list:
+    """Tranches horaires à partir des totaux par indice de tranche (scored, conceded, yellow_cards, red_cards)."""
+    return project([
+        {
+            "bucket": label,
+            "scored": totals.get(i, {}).get("scored", 0),
+            "conceded": totals.get(i, {}).get("conceded", 0),
+            "yellow_cards": totals.get(i, {}).get("yellow_cards", 0),
+            "red_cards": totals.get(i, {}).get("red_cards", 0),
+        }
+        for i, label in enumerate(BUCKETS)
+    ], fields, schemas.TimingBucketOut)
+
+
+async def first_goal(db: AsyncSession, season: str, league: str = DEFAULT_LEAGUE, fields: Fields = None) -> list:
+    """Premier but, remontées et avances perdues par équipe.
+
+    Le score courant de chaque match est reconstitué en base : ROW_NUMBER()
+    désigne le premier but, SUM() OVER (… ROWS UNBOUNDED PRECEDING) l'écart
+    domicile après chaque but. Seuls les agrégats par équipe remontent.
+    """
+    team_ids = await _league_team_ids(db, league)
+    scoring = _scoring_team()
+    order = (models.Goal.minute, models.Goal.id)
+    events = (
+        select(
+            models.Goal.match_id,
+            scoring.label("team_id"),
+            func.row_number().over(partition_by=models.Goal.match_id, order_by=order).label("seq"),
+            func.sum(case((scoring == models.Match.home_team_id, 1), else_=-1))
+            .over(partition_by=models.Goal.match_id, order_by=order, rows=(None, 0))
+            .label("home_diff"),
+        )
+        .join(models.Match, models.Match.id == models.Goal.match_id)
+        .join(models.Player, models.Player.id == models.Goal.scorer_id)
+        .where(models.Match.season == season, models.Goal.minute.is_not(None))
+        .subquery()
+    )
+    per_match = (
+        select(
+            events.c.match_id,
+            func.max(case((events.c.seq == 1, events.c.team_id))).label("first_team"),
+            func.min(events.c.home_diff).label("min_diff"),
+            func.max(events.c.home_diff).label("max_diff"),
+        )
+        .group_by(events.c.match_id)
+        .subquery()
+    )
+
+    def side(team_col, gf, ga, trailed, led):
+        return (
+            select(
+                team_col.label("team_id"),
+                gf.label("gf"),
+                ga.label("ga"),
+                per_match.c.first_team,
+                trailed.label("trailed"),
+                led.label("led"),
+            )
+            .select_from(models.Match)
+            .outerjoin(per_match, per_match.c.match_id == models.Match.id)
+            .where(models.Match.season == season, models.Match.played.is_(True), team_col.in_(team_ids))
+        )
+
+    home_score, away_score = func.coalesce(models.Match.home_score, 0), func.coalesce(models.Match.away_score, 0)
+    min_diff, max_diff = func.coalesce(per_match.c.min_diff, 0), func.coalesce(per_match.c.max_diff, 0)
+    sides = union_all(
+        side(models.Match.home_team_id, home_score, away_score, min_diff < 0, max_diff > 0),
+        side(models.Match.away_team_id, away_score, home_score, max_diff > 0, min_diff < 0),
+    ).subquery()
+
+    won, drawn = sides.c.gf > sides.c.ga, sides.c.gf == sides.c.ga
+    first_us = sides.c.first_team == sides.c.team_id
+    first_them = sides.c.first_team != sides.c.team_id
+
+    def total(condition):
+        return func.sum(case((condition, 1), else_=0))
+
+    stmt = select(
+        sides.c.team_id,
+        func.count().label("played"),
+        total(first_us).label("scored_first"),
+        total(first_us & won).label("won_after_scoring_first"),
+        total(first_them).label("conceded_first"),
+        total(first_them & won).label("won_after_conceding_first"),
+        total(sides.c.trailed & won).label("comebacks"),
+        func.sum(case((sides.c.trailed & won, 3), (sides.c.trailed & drawn, 1), else_=0)).label("points_from_behind"),
+        total(sides.c.led & ~won).label("leads_lost"),
+    ).group_by(sides.c.team_id)
+    totals = {r["team_id"]: dict(r) for r in (await db.execute(stmt)).mappings().all()}
+    return first_goal_rows(totals, league, fields)
+
+
+def first_goal_rows(totals: dict[int, dict], league: str, fields: Fields) -> list:
+    """Premier but et remontées des équipes d'une ligue à partir des totaux par équipe."""
+    out = []
+    for team in teams.by_league(league):
+        r = totals.get(team.id, {})
+        out.append({
+            "team": team.name,
+            "team_short": team.short_name,
+            **{k: r.get(k) or 0 for k in schemas.FirstGoalOut.model_fields if k not in ("team", "team_short")},
+        })
+    out.sort(key=lambda x: (-x["points_from_behind"], -x["comebacks"], x["team"]))
+    return project(out, fields, schemas.FirstGoalOut)
+
+
+def _window(order, size: int) -> dict:
+    return {"order_by": order, "rows": (-(size - 1), 0)}
+
+
+async def club_rolling(db: AsyncSession, team: TeamInfo, season: str, window: int, fields: Fields = None) -> list:
+    """Forme glissante sur `window` matchs : moyennes de buts et total de points calculés en base."""
+    is_home = models.Match.home_team_id == team.id
+    gf = case((is_home, func.coalesce(models.Match.home_score, 0)), else_=func.coalesce(models.Match.away_score, 0))
+    ga = case((is_home, func.coalesce(models.Match.away_score, 0)), else_=func.coalesce(models.Match.home_score, 0))
+    points = case((gf > ga, 3), (gf == ga, 1), else_=0)
+    frame = _window((models.Match.match_date, models.Match.matchday, models.Match.id), window)
+    stmt = (
+        select(
+            models.Match.id,
+            models.Match.matchday,
+            models.Match.match_date,
+            case((is_home, models.Match.away_team_id), else_=models.Match.home_team_id).label("opponent_id"),
+            gf.label("goals_for"),
+            ga.label("goals_against"),
+            points.label("points"),
+            func.count().over(**frame).label("window_matches"),
+            func.avg(gf).over(**frame).label("rolling_goals_for"),
+            func.avg(ga).over(**frame).label("rolling_goals_against"),
+            func.sum(points).over(**frame).label("rolling_points"),
+        )
+        .where(_side_filter(team), models.Match.season == season, models.Match.played.is_(True))
+        .order_by(models.Match.match_date, models.Match.matchday, models.Match.id)
+    )
+    return club_rolling_rows((await db.execute(stmt)).mappings().all(), fields)
+
+
+def club_rolling_rows(rows, fields: Fields) -> list:
+    """Forme glissante (id, matchday, match_date, opponent_id, scores, points et agrégats de fenêtre)."""
+    return project([
+        {
+            "match_id": r["id"],
+            "matchday": r["matchday"],
+            "match_date": r["match_date"],
+            "opponent": teams.name(r["opponent_id"]),
+            "goals_for": r["goals_for"],
+            "goals_against": r["goals_against"],
+            "points": r["points"],
+            "window_matches": r["window_matches"],
+            "rolling_goals_for": round(float(r["rolling_goals_for"]), 2),
+            "rolling_goals_against": round(float(r["rolling_goals_against"]), 2),
+            "rolling_points": r["rolling_points"],
+        }
+        for r in rows
+    ], fields, schemas.TeamRollingOut)
+
+
+async def player_rolling(db: AsyncSession, player_id: int, season: str, window: int, fields: Fields = None) -> Optional[list]:
+    """Buts et passes d'un joueur sur les `window` derniers matchs de son équipe, match après match."""
+    team_id = await db.scalar(select(models.Player.team_id).where(models.Player.id == player_id))
+    if team_id is None:
+        return None
+    per_match = {
+        name: (
+            select(model.match_id, func.count().label("n"))
+            .where(player_col == player_id, *extra)
+            .group_by(model.match_id)
+            .subquery(name)
+        )
+        for name, model, player_col, extra in (
+            ("g", models.Goal, models.Goal.scorer_id, (models.Goal.own_goal.is_(False),)),
+            ("a", models.Assist, models.Assist.player_id, ()),
+        )
+    }
+    goals = func.coalesce(per_match["g"].c.n, 0)
+    assists = func.coalesce(per_match["a"].c.n, 0)
+    is_home = models.Match.home_team_id == team_id
+    frame = _window((models.Match.match_date, models.Match.matchday, models.Match.id), window)
+    stmt = (
+        select(
+            models.Match.id,
+            models.Match.matchday,
+            models.Match.match_date,
+            case((is_home, models.Match.away_team_id), else_=models.Match.home_team_id).label("opponent_id"),
+            goals.label("goals"),
+            assists.label("assists"),
+            func.count().over(**frame).label("window_matches"),
+            func.sum(goals).over(**frame).label("rolling_goals"),
+            func.sum(assists).over(**frame).label("rolling_assists"),
+        )
+        .outerjoin(per_match["g"], per_match["g"].c.match_id == models.Match.id)
+        .outerjoin(per_match["a"], per_match["a"].c.match_id == models.Match.id)
+        .where(
+            or_(models.Match.home_team_id == team_id, models.Match.away_team_id == team_id),
+            models.Match.season == season,
+            models.Match.played.is_(True),
+        )
+        .order_by(models.Match.match_date, models.Match.matchday, models.Match.id)
+    )
+    rows = (await db.execute(stmt)).mappings().all()
+    await teams.ensure(db)
+    return player_rolling_rows(rows, fields)
+
+
+def player_rolling_rows(rows, fields: Fields) -> list:
+    """Buts et passes d'un joueur match après match, avec leurs sommes sur la fenêtre."""
+    return project([
+        {
+            "match_id": r["id"],
+            "matchday": r["matchday"],
+            "match_date": r["match_date"],
+            "opponent": teams.name(r["opponent_id"]),
+            "goals": r["goals"],
+            "assists": r["assists"],
+            "window_matches": r["window_matches"],
+            "rolling_goals": r["rolling_goals"],
+            "rolling_assists": r["rolling_assists"],
+        }
+        for r in rows
+    ], fields, schemas.PlayerRollingOut)
+
+
+# ── Fiches joueurs ───────────────────────────────────────────────────────────
+POSITION_ORDER = {"Gardien": 0, "Défenseur": 1, "Milieu": 2, "Attaquant": 3}
+
+
+def _player_events(players, season: Optional[str] = None):
+    """Buts, passes et cartons des joueurs `players` (ids ou sous-requête) mis bout à bout, avec leur saison.
+
+    `season` peut être une valeur ou un `bindparam`.
+    """
+    zero = literal(0)
+    goal = case((models.Goal.own_goal.is_(False), 1), else_=0)
+    penalty = case((models.Goal.own_goal.is_(False) & models.Goal.penalty.is_(True), 1), else_=0)
+    # Filtre posé dans chaque branche : SQLite ne le pousse pas à travers l'UNION
+    parts = [
+        select(models.Goal.scorer_id.label("player_id"), models.Goal.match_id, goal.label("goal"),
+               penalty.label("penalty"), zero.label("assist"), zero.label("yellow"), zero.label("red"))
+        .where(models.Goal.scorer_id.in_(players)),
+        select(models.Assist.player_id, models.Assist.match_id, zero, zero, literal(1), zero, zero)
+        .where(models.Assist.player_id.in_(players)),
+        select(models.Card.player_id, models.Card.match_id, zero, zero, zero,
+               case((models.Card.card_type == "yellow", 1), else_=0),
+               case((models.Card.card_type == "red", 1), else_=0))
+        .where(models.Card.player_id.in_(players)),
+    ]
+    events = union_all(*parts).subquery("ev")
+    stmt = select(events, models.Match.season).join(models.Match, models.Match.id == events.c.match_id)
+    if season is not None:
+        stmt = stmt.where(models.Match.season == season)
+    return stmt.subquery("events")
+
+
+def _player_totals(events) -> list:
+    def total(column):
+        return func.coalesce(func.sum(column), 0)
+    return [
+        total(events.c.goal).label("goals"),
+        total(events.c.penalty).label("penalties"),
+        total(events.c.assist).label("assists"),
+        total(events.c.yellow).label("yellow_cards"),
+        total(events.c.red).label("red_cards"),
+        func.count(func.distinct(events.c.match_id)).label("matches"),
+    ]
+
+
+NO_TOTALS = {"goals": 0, "penalties": 0, "assists": 0, "yellow_cards": 0, "red_cards": 0, "matches": 0}
+
+
+def _totals_out(r) -> dict:
+    return {k: r[k] for k in NO_TOTALS}
+
+
+async def club_squad(db: AsyncSession, team: TeamInfo, season: str, fields: Fields = None) -> list:
+    """Effectif d'un club avec les totaux de saison de chaque joueur, en une seule requête groupée."""
+    rows = (await db.execute(_squad_stmt(), {"team_id": team.id, "season": season})).mappings().all()
+    # Saison archivée : l'effectif vient de la base, les totaux du fichier
+    archived = archive.player_totals(season, [r["id"] for r in rows]) if archive.has(season) else None
+    return project([
+        {
+            "player_id": r["id"],
+            "full_name": f"{r['first_name']} {r['last_name']}",
+            "position": r["position"],
+            "number": r["number"],
+            "nationality": r["nationality"],
+            **(_totals_out(r) if archived is None else archived.get(r["id"], NO_TOTALS)),
+        }
+        for r in rows
+    ], fields, schemas.SquadPlayerOut)
+
+
+@lru_cache(maxsize=None)
+def _squad_stmt():
+    in_team = models.Player.team_id == bindparam("team_id")
+    events = _player_events(select(models.Player.id).where(in_team), bindparam("season"))
+    position = case(POSITION_ORDER, value=models.Player.position, else_=len(POSITION_ORDER))
+    return (
+        select(
+            models.Player.id, models.Player.first_name, models.Player.last_name, models.Player.position,
+            models.Player.number, models.Player.nationality, *_player_totals(events),
+        )
+        .outerjoin(events, events.c.player_id == models.Player.id)
+        .where(in_team)
+        .group_by(models.Player.id)
+        .order_by(position, models.Player.number.is_(None), models.Player.number, models.Player.last_name)
+    )
+
+
+async def player_profile(db: AsyncSession, player_id: int, season: str) -> Optional[schemas.PlayerProfileOut]:
+    """Fiche d'un joueur : totaux de `season` et historique par saison, en une seule requête groupée."""
+    rows = (await db.execute(_profile_stmt(), {"player_id": player_id})).mappings().all()
+    if not rows:
+        return None
+    await teams.ensure(db)
+    p = rows[0]
+    by_season = {r["season"]: _totals_out(r) for r in rows if r["season"] is not None}
+    for archived in archive.seasons():
+        totals = archive.player_totals(archived, [player_id])
+        if totals:
+            by_season[archived] = totals[player_id]
+    history = [schemas.PlayerSeasonOut(season=s, **by_season[s]) for s in sorted(by_season, reverse=True)]
+    current = next((h for h in history if h.season == season), schemas.PlayerSeasonOut(season=season, **NO_TOTALS))
+    return schemas.PlayerProfileOut(
+        player_id=p["id"],
+        full_name=f"{p['first_name']} {p['last_name']}",
+        position=p["position"],
+        number=p["number"],
+        nationality=p["nationality"],
+        birth_date=p["birth_date"],
+        team=teams.name(p["team_id"]),
+        team_short=teams.short_name(p["team_id"]),
+        season=current,
+        history=history,
+    )
+
+
+@lru_cache(maxsize=None)
+def _profile_stmt():
+    player_id = bindparam("player_id")
+    events = _player_events([player_id])
+    return (
+        select(
+            models.Player.id, models.Player.first_name, models.Player.last_name, models.Player.position,
+            models.Player.number, models.Player.nationality, models.Player.birth_date, models.Player.team_id,
+            events.c.season, *_player_totals(events),
+        )
+        .outerjoin(events, events.c.player_id == models.Player.id)
+        .where(models.Player.id == player_id)
+        .group_by(models.Player.id, events.c.season)
+        .order_by(events.c.season.desc())
+    )
+
+
+# ── Écritures par lot ──────────────────────────────────────────────────────────
+class BatchError(ValueError):
+    """Lot refusé avant toute écriture ; `errors` liste chaque problème trouvé."""
+
+    def __init__(self, errors: list[str]):
+        super().__init__("; ".join(errors))
+        self.errors = errors
+
+
+def _check_match(i: int, m: schemas.MatchResultIn, home: TeamInfo, away: TeamInfo, player_team: dict) -> list[str]:
+    where = f"matches[{i}] {home.short_name}-{away.short_name}"
+    errors = []
+    scored = {home.id: 0, away.id: 0}
+    for kind, events in (("goals", m.goals), ("assists", m.assists), ("cards", m.cards)):
+        for j, e in enumerate(events):
+            team_id = player_team.get(e.player_id)
+            if team_id is None:
+                errors.append(f"{where} {kind}[{j}] : joueur {e.player_id} inconnu")
+            elif team_id not in scored:
+                errors.append(f"{where} {kind}[{j}] : le joueur {e.player_id} ne joue pas pour ces équipes")
+            elif kind == "goals":
+                # Un CSC est crédité à l'adversaire
+                scored[(away if team_id == home.id else home).id if e.own_goal else team_id] += 1
+    if m.goals and (scored[home.id], scored[away.id]) != (m.home_score, m.away_score):
+        errors.append(f"{where} : buteurs {scored[home.id]}-{scored[away.id]} ≠ score {m.home_score}-{m.away_score}")
+    return errors
+
+
+async def apply_matchday(db: AsyncSession, batch: schemas.MatchdayIn) -> dict:
+    """Valide puis écrit une journée entière (résultats + événements) dans une seule transaction.
+
+    Tout est vérifié avant la première écriture (clubs, joueurs, cohérence
+    buteurs/score) ; un lot invalide lève `BatchError` sans rien modifier. Les
+    matchs déjà en base (même saison, même affiche) sont mis à jour et leurs
+    événements remplacés : renvoyer un lot corrigé est idempotent. Les
+    écritures sont groupées (un INSERT/UPDATE par table pour tout le lot).
+    """
+    await teams.ensure(db)
+    errors, pairs = [], []
+    for i, m in enumerate(batch.matches):
+        home, away = teams.resolve(m.home), teams.resolve(m.away)
+        if home is None or away is None:
+            errors.append(f"matches[{i}] : club inconnu ({m.home if home is None else m.away})")
+        elif home.id == away.id:
+            errors.append(f"matches[{i}] : {home.short_name} ne peut pas se recevoir")
+        pairs.append((home, away))
+
+    player_ids = {e.player_id for m in batch.matches for e in (*m.goals, *m.assists, *m.cards)}
+    player_team = dict((await db.execute(
+        select(models.Player.id, models.Player.team_id).where(models.Player.id.in_(player_ids))
+    )).all()) if player_ids else {}
+    for i, (m, (home, away)) in enumerate(zip(batch.matches, pairs)):
+        if home and away and home.id != away.id:
+            errors += _check_match(i, m, home, away, player_team)
+    seen = [(h.id, a.id) for h, a in pairs if h and a]
+    if len(set(seen)) != len(seen):
+        errors.append("affiche présente plusieurs fois dans le lot")
+    if errors:
+        raise BatchError(errors)
+
+    M = models.Match
+    existing = dict(((h, a), match_id) for match_id, h, a in (await db.execute(
+        select(M.id, M.home_team_id, M.away_team_id)
+        .where(M.season == batch.season, M.home_team_id.in_({h for h, _ in seen}))
+    )).all())
+
+    def match_values(m, home, away) -> dict:
+        values = {
+            "season": batch.season, "matchday": batch.matchday,
+            "home_team_id": home.id, "away_team_id": away.id,
+            "home_score": m.home_score, "away_score": m.away_score, "played": True,
+        }
+        # Sans date dans le lot, un match existant garde la sienne
+        if m.match_date or batch.match_date or (home.id, away.id) not in existing:
+            values["match_date"] = m.match_date or batch.match_date
+        return values
+
+    to_update = [(m, h, a) for m, (h, a) in zip(batch.matches, pairs) if (h.id, a.id) in existing]
+    to_insert = [(m, h, a) for m, (h, a) in zip(batch.matches, pairs) if (h.id, a.id) not in existing]
+    match_ids = {}
+    if to_update:
+        await db.execute(update(M), [{"id": existing[(h.id, a.id)], **match_values(m, h, a)} for m, h, a in to_update])
+        updated_ids = [existing[(h.id, a.id)] for _, h, a in to_update]
+        for event in (models.Goal, models.Assist, models.Card):
+            await db.execute(delete(event).where(event.match_id.in_(updated_ids)))
+        match_ids.update(zip((id(m) for m, _, _ in to_update), updated_ids))
+    if to_insert:
+        new_ids = await db.scalars(
+            insert(M).returning(M.id, sort_by_parameter_order=True),
+            [match_values(m, h, a) for m, h, a in to_insert],
+        )
+        match_ids.update(zip((id(m) for m, _, _ in to_insert), new_ids))
+
+    goals = [{"match_id": match_ids[id(m)], "scorer_id": g.player_id, "minute": g.minute,
+              "own_goal": g.own_goal, "penalty": g.penalty} for m in batch.matches for g in m.goals]
+    assists = [{"match_id": match_ids[id(m)], **a.model_dump()} for m in batch.matches for a in m.assists]
+    cards = [{"match_id": match_ids[id(m)], **c.model_dump()} for m in batch.matches for c in m.cards]
+    for event, rows in ((models.Goal, goals), (models.Assist, assists), (models.Card, cards)):
+        if rows:
+            await db.execute(insert(event), rows)
+    await db.commit()
+    return {
+        "season": batch.season, "matchday": batch.matchday,
+        "matches_created": len(to_insert), "matches_updated": len(to_update),
+        "goals": len(goals), "assists": len(assists), "cards": len(cards),
+    }
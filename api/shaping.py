@@ -0,0 +1,78 @@
+"""Réponses allégées : sélection de champs (`fields=`) et encodage compact.
+
+    ?fields=team_short,points      ne renvoie que ces champs, dans cet ordre
+    ?compact=true                  {"fields": [...], "rows": [[...], ...]}
+
+Les fonctions de calcul reçoivent la liste des champs demandés et ne
+sélectionnent que les colonnes nécessaires : la taille de la réponse et le
+travail de la base diminuent ensemble. La liste fait partie des arguments,
+donc de la clé de cache.
+"""
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from fastapi import HTTPException, Query
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+Fields = Optional[tuple[str, ...]]
+
+
+def parse_fields(raw: Optional[str], model: type[BaseModel]) -> Fields:
+    """`"a,b"` → `("a", "b")` après validation contre le schéma ; None = tous les champs."""
+    if not raw:
+        return None
+    fields = tuple(dict.fromkeys(f.strip() for f in raw.split(",") if f.strip()))
+    unknown = [f for f in fields if f not in model.model_fields]
+    if unknown:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Champ(s) inconnu(s) : {', '.join(unknown)} (disponibles : {', '.join(model.model_fields)})",
+        )
+    return fields or None
+
+
+def wants(fields: Fields, *names: str) -> bool:
+    """Vrai si l'un des champs `names` est demandé (toujours vrai sans sélection)."""
+    return fields is None or any(n in fields for n in names)
+
+
+def project(rows: list[dict], fields: Fields, model: type[BaseModel]) -> list:
+    """Lignes complètes validées par le schéma, ou dicts réduits aux champs demandés."""
+    if fields is None:
+        return [model(**r) for r in rows]
+    return [{f: r[f] for f in fields} for r in rows]
+
+
+@dataclass(frozen=True)
+class Shape:
+    model: type[BaseModel]
+    fields: Fields = None
+    compact: bool = False
+
+    def select(self, rows: list[dict]) -> list[dict]:
+        """Lignes complètes déjà en mémoire (sans calcul à alléger), réduites aux champs demandés."""
+        if self.fields is None:
+            return rows
+        return [{f: r[f] for f in self.fields} for r in rows]
+
+    def respond(self, rows: list) -> Any:
+        """Sans option, renvoie les lignes telles quelles (validées par `response_model`)."""
+        if self.fields is None and not self.compact:
+            return rows
+        if not self.compact:
+            return JSONResponse(rows)
+        names = list(self.fields or self.model.model_fields)
+        return JSONResponse({"fields": names, "rows": [[r[f] for f in names] for r in rows]})
+
+
+def sparse(model: type[BaseModel]):
+    """Dépendance FastAPI : paramètres `fields` et `compact` d'un endpoint de liste."""
+
+    def dependency(
+        fields: Optional[str] = Query(None, description=f"Champs à renvoyer, séparés par des virgules ({', '.join(model.model_fields)})"),
+        compact: bool = Query(False, description="Encodage compact : noms de colonnes + tableau de lignes"),
+    ) -> Shape:
+        return Shape(model, parse_fields(fields, model), compact)
+
+    return dependency
@@ -0,0 +1,56 @@
+"""Coalescence des requêtes identiques concurrentes (« single-flight »).
+
+Quand des centaines de clients demandent le même classement dans la même
+seconde, une seule exécution a lieu : les appels identiques qui arrivent
+pendant qu'elle est en vol attendent son résultat au lieu de relancer les
+mêmes requêtes SQL. Le calcul ouvre sa propre session, indépendante de la
+requête HTTP qui l'a déclenché : l'annulation d'un client n'interrompt pas
+les autres. Point d'entrée unique : `api.cache.cached`, qui coalesce sur la
+clé de cache versionnée.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+from api.database import AsyncSessionLocal
+from api.metrics import registry as metrics
+
+calls = metrics.counter(
+    "fcsmtop_singleflight_calls_total",
+    "Appels coalescés par requête : role=leader (exécuté) ou role=coalesced (résultat partagé).",
+)
+
+
+class SingleFlight:
+    def __init__(self):
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]], name: str = "") -> Any:
+        task = self._inflight.get(key)
+        if task is not None:
+            calls.inc(query=name, role="coalesced")
+        else:
+            calls.inc(query=name, role="leader")
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        # shield : un appelant annulé ne doit pas annuler le calcul partagé
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Future) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # marque l'exception comme lue si tous les appelants sont partis
+
+
+flights = SingleFlight()
+
+
+async def in_session(fn: Callable[..., Awaitable[Any]], *args) -> Any:
+    """Exécute `fn(db, *args)` dans une session dédiée."""
+    async with AsyncSessionLocal() as db:
+        return await fn(db, *args)
+
@@ -0,0 +1,161 @@
+"""Registre des équipes en mémoire, partagé par tout le processus.
+
+Les équipes ne changent quasiment jamais : on les charge une fois (au
+démarrage de l'API, ou au premier besoin côté CLI) et on les résout ensuite
+sans aller-retour en base, par id, code court, nom, ville ou alias, sans
+tenir compte de la casse ni des accents. Toute écriture SQL validée (après
+commit) sur la table `teams` dans ce processus, ou un `cache.bump(ALL)`
+d'un autre processus, invalide le registre, rechargé à la demande suivante.
+"""
+import asyncio
+import re
+import unicodedata
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.dml import UpdateBase
+
+from api.database import AsyncSessionLocal, engine
+from api import models
+from api.cache import ALL, cache
+
+# Surnoms usuels → code court
+ALIASES = {
+    "sochaux": "FCSM",
+    "fcsochaux": "FCSM",
+    "redstar": "RST",
+}
+
+
+@dataclass(frozen=True)
+class TeamInfo:
+    id: int
+    name: str
+    short_name: str
+    city: str
+    league: str
+
+
+def normalize_key(value: str) -> str:
+    """« Évreux FC 27 » → « evreuxfc27 »."""
+    ascii_value = unicodedata.normalize("NFKD", value).encode("ascii", "ignore").decode()
+    return re.sub(r"[^a-z0-9]", "", ascii_value.lower())
+
+
+def league_slug(league: str) -> str:
+    """« National 2 A » → « national-2-a » (résolu par `resolve_league`)."""
+    ascii_value = unicodedata.normalize("NFKD", league).encode("ascii", "ignore").decode()
+    return re.sub(r"[^a-z0-9]+", "-", ascii_value.lower()).strip("-")
+
+
+class TeamRegistry:
+    def __init__(self):
+        self._by_id: dict[int, TeamInfo] = {}
+        self._by_key: dict[str, TeamInfo] = {}
+        self._version: Optional[int] = None
+        self._stale = True
+        self._lock = asyncio.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return not self._stale
+
+    async def load(self, db: AsyncSession) -> None:
+        rows = (await db.execute(select(models.Team))).scalars().all()
+        by_id = {t.id: TeamInfo(t.id, t.name, t.short_name, t.city, t.league) for t in rows}
+
+        by_key: dict[str, TeamInfo] = {}
+        # Du moins prioritaire au plus prioritaire : un code court l'emporte toujours sur une ville homonyme
+        cities: dict[str, list[TeamInfo]] = {}
+        for t in by_id.values():
+            cities.setdefault(normalize_key(t.city), []).append(t)
+        for key, teams in cities.items():
+            if len(teams) == 1:
+                by_key[key] = teams[0]
+        by_short = {t.short_name.upper(): t for t in by_id.values()}
+        for alias, short in ALIASES.items():
+            if short in by_short:
+                by_key[alias] = by_short[short]
+        for t in by_id.values():
+            by_key[normalize_key(t.name)] = t
+        for t in by_id.values():
+            by_key[normalize_key(t.short_name)] = t
+
+        self._by_id, self._by_key = by_id, by_key
+
+    async def ensure(self, db: Optional[AsyncSession] = None) -> None:
+        """Charge le registre s'il est vide ou invalidé (un seul rechargement concurrent)."""
+        version = cache.version(ALL)
+        if not self._stale and version == self._version:
+            return
+        async with self._lock:
+            if not self._stale and version == self._version:
+                return
+            self._stale = False
+            if db is not None:
+                await self.load(db)
+            else:
+                async with AsyncSessionLocal() as own:
+                    await self.load(own)
+            self._version = version
+
+    def invalidate(self) -> None:
+        self._stale = True
+
+    def get(self, team_id: int) -> Optional[TeamInfo]:
+        return self._by_id.get(team_id)
+
+    def name(self, team_id: int, default: str = "") -> str:
+        team = self._by_id.get(team_id)
+        return team.name if team else default
+
+    def short_name(self, team_id: int, default: str = "") -> str:
+        team = self._by_id.get(team_id)
+        return team.short_name if team else default
+
+    def resolve(self, club: str) -> Optional[TeamInfo]:
+        return self._by_key.get(normalize_key(club))
+
+    def all(self) -> list[TeamInfo]:
+        return list(self._by_id.values())
+
+    def by_league(self, league: str) -> list[TeamInfo]:
+        return [t for t in self._by_id.values() if t.league == league]
+
+    def leagues(self) -> list[str]:
+        return sorted({t.league for t in self._by_id.values()})
+
+    def resolve_league(self, league: str) -> Optional[str]:
+        """« national », « National 2 A », « national2a » → nom exact de la ligue."""
+        key = normalize_key(league)
+        return next((name for name in self.leagues() if normalize_key(name) == key), None)
+
+
+registry = TeamRegistry()
+
+
+_TEAMS_WRITTEN = "fcsmtop_teams_written"
+
+
+@event.listens_for(engine.sync_engine, "after_execute")
+def _mark_team_write(conn, clauseelement, multiparams, params, execution_options, result):
+    # Les requêtes ORM passent une table annotée : on compare donc par nom.
+    if isinstance(clauseelement, UpdateBase) and clauseelement.table.name == models.Team.__tablename__:
+        conn.info[_TEAMS_WRITTEN] = True
+
+
+@event.listens_for(engine.sync_engine, "rollback")
+def _forget_team_write(conn):
+    conn.info.pop(_TEAMS_WRITTEN, None)
+
+
+@event.listens_for(engine.sync_engine.pool, "checkin")
+def _invalidate_on_team_write(dbapi_connection, connection_record):
+    # La connexion revient au pool après le commit : invalider avant exposerait
+    # une fenêtre où un `ensure()` concurrent rechargerait les anciennes lignes
+    # sous la nouvelle version ALL, et les y garderait.
+    if connection_record is not None and connection_record.info.pop(_TEAMS_WRITTEN, False):
+        registry.invalidate()
+        cache.bump(ALL)  # les noms d'équipe sont repris dans toutes les réponses
@@ -0,0 +1 @@
+"""Suite de benchmark de l'API et du CLI (voir bench/run.py)."""
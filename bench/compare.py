@@ -0,0 +1,67 @@
+"""Compare deux résultats de benchmark et signale les régressions.
+
+Usage :
+    python -m bench.compare bench/results/abc1234.json bench/results/def5678.json --threshold 0.2
+
+Code de sortie 1 si une route régresse : p95 au-delà du seuil relatif, plus de
+requêtes SQL par requête HTTP, ou nouvelles erreurs.
+"""
+import argparse
+import json
+import sys
+
+from rich.console import Console
+from rich.table import Table
+from rich import box
+
+
+def _load(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(base: dict, head: dict, threshold: float) -> tuple[list[tuple], bool]:
+    rows, regressed = [], False
+    for section in ("api", "api_cold", "cli"):
+        for name, new in head.get(section, {}).items():
+            old = base.get(section, {}).get(name)
+            if old is None:
+                rows.append((section, name, None, new["p95_ms"], None, new.get("queries_per_request"), "nouveau"))
+                continue
+            ratio = new["p95_ms"] / old["p95_ms"] - 1 if old["p95_ms"] else 0.0
+            q_old, q_new = old.get("queries_per_request"), new.get("queries_per_request")
+            reasons = []
+            if ratio > threshold:
+                reasons.append(f"p95 {ratio:+.0%}")
+            if q_old is not None and q_new is not None and q_new > q_old:
+                reasons.append("SQL/req ↑")
+            if new["errors"] > old["errors"]:
+                reasons.append("erreurs ↑")
+            regressed |= bool(reasons)
+            rows.append((section, name, old["p95_ms"], new["p95_ms"], q_old, q_new, ", ".join(reasons) or "ok"))
+    return rows, regressed
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Compare deux fichiers de résultats de bench.run")
+    p.add_argument("base")
+    p.add_argument("head")
+    p.add_argument("--threshold", type=float, default=0.2, help="Régression relative tolérée sur le p95")
+    args = p.parse_args(argv)
+
+    base, head = _load(args.base), _load(args.head)
+    rows, regressed = compare(base, head, args.threshold)
+
+    t = Table(title=f"Bench {base['meta']['commit']} → {head['meta']['commit']}", box=box.ROUNDED)
+    for col in ("", "Route / commande", "p95 avant", "p95 après", "SQL avant", "SQL après", "Verdict"):
+        t.add_column(col)
+    fmt = lambda v: "—" if v is None else f"{v:g}"
+    for section, name, p_old, p_new, q_old, q_new, verdict in rows:
+        style = "red" if verdict not in ("ok", "nouveau") else None
+        t.add_row(section, name, fmt(p_old), fmt(p_new), fmt(q_old), fmt(q_new), verdict, style=style)
+    Console().print(t)
+    sys.exit(1 if regressed else 0)
+
+
+if __name__ == "__main__":
+    main()
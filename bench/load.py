@@ -0,0 +1,192 @@
+"""Test de charge : pic de requêtes non cachées, avec et sans contrôle d'admission.
+
+Usage :
+    python -m bench.load
+    python -m bench.load --leagues 3 --seasons 4 --clients 64 --concurrency 4 --queue 16 --timeout 0.5
+
+Scénarios, chacun joué sans puis avec contrôle d'admission :
+    invalidation   le cache vient d'être invalidé (journée saisie) : la
+                   dernière valeur connue de chaque vue existe encore
+    froid          cache vide : aucune valeur de repli
+
+Chaque client (adresse distincte) demande d'un coup des effectifs et des
+fiches joueurs tous différents, donc tous à calculer. Sans admission, toutes
+les requêtes s'empilent sur le pool de connexions et la latence de chacune
+croît avec la taille du pic ; avec admission, le surplus est servi périmé ou
+refusé (503) immédiatement et les requêtes admises restent rapides.
+Un dernier scénario envoie une rafale depuis un seul client pour montrer la
+limite de débit (429) sans effet sur un client voisin.
+"""
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from bench.run import percentile
+
+
+def _totals(counter) -> float:
+    return sum(counter.values.values())
+
+
+async def spike(clients: list, urls: list[str]) -> dict:
+    """Toutes les URL d'un coup, réparties entre les clients ; statuts et latences."""
+    from api import admission as A
+
+    statuses: Counter = Counter()
+    latencies: dict[int, list[float]] = {}
+    stale0 = _totals(A.stale)
+    depth = 0
+    done = False
+
+    async def sample():
+        nonlocal depth
+        while not done:
+            depth = max(depth, int(_totals(A.queue_depth)))
+            await asyncio.sleep(0.005)
+
+    async def one(client, url):
+        start = time.perf_counter()
+        r = await client.get(url)
+        statuses[r.status_code] += 1
+        latencies.setdefault(r.status_code, []).append((time.perf_counter() - start) * 1000)
+
+    sampler = asyncio.ensure_future(sample())
+    start = time.perf_counter()
+    await asyncio.gather(*(one(clients[i % len(clients)], url) for i, url in enumerate(urls)))
+    wall = time.perf_counter() - start
+    done = True
+    await sampler
+
+    ok = latencies.get(200, [])
+    refused = latencies.get(503, [])
+    return {
+        "requests": len(urls),
+        "fresh": statuses[200] - int(_totals(A.stale) - stale0),
+        "stale": int(_totals(A.stale) - stale0),
+        "503": statuses[503],
+        "other": sum(n for s, n in statuses.items() if s not in (200, 503)),
+        "p50_ms": percentile(ok, 0.50),
+        "p99_ms": percentile(ok, 0.99),
+        "max_ms": max(ok, default=0.0),
+        "p99_503_ms": percentile(refused, 0.99),
+        "queue_peak": depth,
+        "wall_s": wall,
+    }
+
+
+def _row(scenario: str, mode: str, r: dict) -> str:
+    return (f"  {scenario:<13}{mode:<6}{r['fresh']:>6}{r['stale']:>7}{r['503']:>6}{r['other']:>6}"
+            f"{r['p50_ms']:>10.1f}{r['p99_ms']:>10.1f}{r['max_ms']:>10.1f}{r['p99_503_ms']:>10.1f}"
+            f"{r['queue_peak']:>7}{r['wall_s']:>8.2f}")
+
+
+async def run(args) -> None:
+    import httpx
+    from sqlalchemy import select
+
+    from api.admission import admission, rate_limited
+    from api.cache import ALL, cache
+    from api.database import AsyncSessionLocal
+    from api.main import app
+    from api.models import Player
+    from api.teams import registry as teams
+
+    async with app.router.lifespan_context(app):
+        async with AsyncSessionLocal() as db:
+            player_ids = list(await db.scalars(select(Player.id)))
+        seasons = [str(int(args.season) - i) for i in range(args.seasons)]
+        urls = [f"/api/v1/clubs/{t.short_name}/squad?season={s}" for t in teams.all() for s in seasons]
+        urls += [f"/api/v1/players/{pid}?season={random.choice(seasons)}"
+                 for pid in random.sample(player_ids, min(len(player_ids), args.players))]
+        random.shuffle(urls)
+
+        def client(i: int) -> httpx.AsyncClient:
+            address = (f"10.0.{i // 250}.{i % 250}", 4000)
+            transport = httpx.ASGITransport(app=app, raise_app_exceptions=False, client=address)
+            return httpx.AsyncClient(transport=transport, base_url="http://load")
+
+        clients = [client(i) for i in range(args.clients)]
+        print(f"🎯 {len(urls)} URL distinctes, {args.clients} clients — admission : "
+              f"{args.concurrency} calculs/vue, file {args.queue}, attente {args.timeout} s")
+        print(f"  {'scénario':<13}{'mode':<6}{'frais':>6}{'périmé':>7}{'503':>6}{'autre':>6}"
+              f"{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}{'p99 503':>10}{'file':>7}{'durée':>8}")
+        for scenario in ("invalidation", "froid"):
+            for mode in ("off", "on"):
+                admission.configure(concurrency=args.concurrency if mode == "on" else 0,
+                                    queue=args.queue, timeout=args.timeout)
+                cache.backend.clear()
+                if scenario == "invalidation":
+                    for i, url in enumerate(urls):  # dernière valeur connue de chaque vue
+                        await clients[i % len(clients)].get(url)
+                cache.bump(ALL)
+                print(_row(scenario, mode, await spike(clients, urls)))
+
+        # Limite de débit : un client en rafale sur une vue en cache, un voisin au rythme normal
+        admission.configure()
+        url = urls[0]
+        await clients[0].get(url)
+        limited0 = _totals(rate_limited)
+        burst = Counter()
+        neighbour = Counter()
+
+        async def flood():
+            for _ in range(args.burst // 32):
+                for r in await asyncio.gather(*(clients[0].get(url) for _ in range(32))):
+                    burst[r.status_code] += 1
+
+        async def polite():
+            for _ in range(20):
+                neighbour[(await clients[1].get(url)).status_code] += 1
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(flood(), polite())
+        print(f"🚦 Rafale d'un client : {dict(burst)} ({int(_totals(rate_limited) - limited0)} × 429) — "
+              f"client voisin : {dict(neighbour)}")
+        for c in clients:
+            await c.aclose()
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Test de charge du contrôle d'admission")
+    p.add_argument("--leagues", type=int, default=3)
+    p.add_argument("--teams", type=int, default=18, help="Équipes par ligue")
+    p.add_argument("--seasons", type=int, default=2)
+    p.add_argument("--season", default="2025", help="Dernière saison générée")
+    p.add_argument("--players", type=int, default=200, help="Fiches joueurs demandées pendant le pic")
+    p.add_argument("--clients", type=int, default=32)
+    p.add_argument("--concurrency", type=int, default=4, help="Calculs simultanés par vue (mode on)")
+    p.add_argument("--queue", type=int, default=16, help="File d'attente par vue (mode on)")
+    p.add_argument("--timeout", type=float, default=0.5, help="Attente maximale en file (s)")
+    p.add_argument("--burst", type=int, default=320, help="Requêtes de la rafale d'un seul client")
+    p.add_argument("--seed", type=int, default=42)
+    args = p.parse_args(argv)
+    random.seed(args.seed)
+
+    tmpdir = tempfile.mkdtemp(prefix="fcsmtop-load-")
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(tmpdir, 'load.db')}"
+    os.environ["CACHE_URL"] = "memory://"
+    os.environ.setdefault("QUERY_BUDGET", "1000000")
+
+    from scripts.generate_data import generate
+
+    volumes = asyncio.run(generate(leagues=args.leagues, teams=args.teams, seasons=args.seasons,
+                                   last_season=int(args.season), seed=args.seed, reset=True, verbose=False))
+    print(f"📦 Données synthétiques : {volumes}")
+    try:
+        asyncio.run(run(args))
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,18 +4,26 @@ Usage :
     python cli/main.py buteurs --club FCSM
     python cli/main.py classement
     python cli/main.py form --club FCSM --last 5
+    python cli/main.py search "ngatta"
+    python cli/main.py watch --club FCSM
+    python cli/main.py report --club FCSM --club ORL --format markdown -o rapport.md
 
 Fonctionne sans serveur API — accès direct à la base SQLite.
 """
-import os, sys
+import asyncio, json, os, sys
+from datetime import datetime
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///./fcsmtop.db")
 
 import typer
-from rich.console import Console
+from rich.console import Console, Group
+from rich.columns import Columns
+from rich.live import Live
 from rich.table import Table
 from rich import box
 
+from api.database import AsyncSessionLocal
+from api.seasons import CURRENT_SEASON
 from cli import db as DB
 
 app = typer.Typer(
@@ -25,24 +33,8 @@ app = typer.Typer(
 console = Console()
 
 
-@app.command()
-def buteurs(
-    league: str = typer.Option(None, "--league", "-l", help="Ligue : national"),
-    club: str  = typer.Option(None, "--club",   "-c", help="Club : FCSM, ORL…"),
-    season: str = typer.Option("2025", "--season", "-s"),
-    top: int    = typer.Option(15, "--top", "-n"),
-):
-    """⚽ Top buteurs (National ou club)."""
-    if not club and not league:
-        console.print("[yellow]Précise --league national ou --club FCSM[/yellow]")
-        raise typer.Exit()
-
-    data = DB.buteurs(league=league, club=club, season=season, limit=top)
-
-    if not data:
-        console.print("[red]Aucun résultat.[/red]"); return
-
-    title = f"⚽ Buteurs {'FCSM' if club else 'Championnat National'} — Saison {season}"
+# ── Tables Rich (partagées par les commandes et le mode watch) ────────────────
+def _buteurs_table(data: list[dict], title: str) -> Table:
     t = Table(title=title, box=box.ROUNDED, header_style="bold yellow", show_lines=False)
     t.add_column("#",       width=4,  style="dim")
     t.add_column("Joueur",  style="bold")
@@ -51,47 +43,27 @@ def buteurs(
     t.add_column("(pen.)",  justify="right", style="dim")
     t.add_column("P.D.",    justify="right", style="cyan")
 
-    for r in data[:top]:
+    for r in data:
         t.add_row(str(r["rank"]), r["full_name"], r["team_short"],
                   str(r["goals"]),
                   str(r["penalties"]) if r["penalties"] else "—",
                   str(r["assists"]))
-
-    console.print(t)
+    return t
 
 
-@app.command()
-def passeurs(
-    league: str  = typer.Option(None,   "--league", "-l"),
-    club: str    = typer.Option(None,   "--club",   "-c"),
-    season: str  = typer.Option("2025", "--season", "-s"),
-    top: int     = typer.Option(10,     "--top",    "-n"),
-):
-    """🎯 Top passeurs décisifs."""
-    data = DB.passeurs(club=club, season=season, limit=top)
-    if not data:
-        console.print("[red]Aucun résultat.[/red]"); return
-
-    title = f"🎯 Passeurs {'FCSM' if club else 'National'} — Saison {season}"
+def _passeurs_table(data: list[dict], title: str) -> Table:
     t = Table(title=title, box=box.ROUNDED, header_style="bold cyan")
     t.add_column("#",        width=4, style="dim")
     t.add_column("Joueur",   style="bold")
     t.add_column("Club")
     t.add_column("Passes D.", justify="right", style="cyan bold")
 
-    for r in data[:top]:
+    for r in data:
         t.add_row(str(r["rank"]), r["full_name"], r["team"], str(r["assists"]))
+    return t
 
-    console.print(t)
-
-
-@app.command()
-def classement(season: str = typer.Option("2025", "--season", "-s")):
-    """📊 Classement du Championnat National."""
-    data = DB.classement(season=season)
-    if not data:
-        console.print("[red]Aucun résultat.[/red]"); return
 
+def _classement_table(data: list[dict], season: str) -> Table:
     t = Table(title=f"📊 Classement National — Saison {season}", box=box.ROUNDED, header_style="bold white")
     t.add_column("#",   width=4, style="dim")
     t.add_column("Équipe", style="bold")
@@ -113,22 +85,11 @@ def classement(season: str = typer.Option("2025", "--season", "-s")):
             f"{r['goal_diff']:+d}", str(r["points"]),
             style=style,
         )
+    return t
 
-    console.print(t)
-
-
-@app.command()
-def matches(
-    club: str   = typer.Option("FCSM",  "--club",   "-c"),
-    season: str = typer.Option("2025",  "--season", "-s"),
-    last: int   = typer.Option(10,      "--last",   "-n"),
-):
-    """📅 Derniers matchs d'un club."""
-    data = DB.matches(club=club, season=season, last=last)
-    if not data:
-        console.print("[red]Aucun résultat.[/red]"); return
 
-    t = Table(title=f"📅 Matchs {club.upper()} — {season}", box=box.ROUNDED, header_style="bold white")
+def _matches_table(data: list[dict], title: str) -> Table:
+    t = Table(title=title, box=box.ROUNDED, header_style="bold white")
     t.add_column("J.",  width=4)
     t.add_column("Date", width=12)
     t.add_column("Domicile", style="bold")
@@ -145,24 +106,89 @@ def matches(
         away = away.replace("Villefranche Beaujolais", "Villefranche").replace("Bergerac Périgord FC", "Bergerac")
         t.add_row(
             str(m["matchday"]),
-            m["match_date"][:10],
+            (m["match_date"] or "")[:10],
             home,
             f"{m.get('home_score','?')} - {m.get('away_score','?')}",
             away,
             icons.get(m.get("result", ""), "—"),
         )
+    return t
 
-    console.print(t)
+
+@app.command()
+def buteurs(
+    league: str = typer.Option(None, "--league", "-l", help="Ligue : national"),
+    club: str  = typer.Option(None, "--club",   "-c", help="Club : FCSM, ORL…"),
+    season: str = typer.Option(CURRENT_SEASON, "--season", "-s"),
+    top: int    = typer.Option(15, "--top", "-n"),
+):
+    """⚽ Top buteurs (National ou club)."""
+    if not club and not league:
+        console.print("[yellow]Précise --league national ou --club FCSM[/yellow]")
+        raise typer.Exit()
+
+    data = DB.buteurs(league=league, club=club, season=season, limit=top)
+
+    if not data:
+        console.print("[red]Aucun résultat.[/red]"); return
+
+    title = f"⚽ Buteurs {'FCSM' if club else 'Championnat National'} — Saison {season}"
+    console.print(_buteurs_table(data[:top], title))
+
+
+@app.command()
+def passeurs(
+    league: str  = typer.Option(None,   "--league", "-l"),
+    club: str    = typer.Option(None,   "--club",   "-c"),
+    season: str  = typer.Option(CURRENT_SEASON, "--season", "-s"),
+    top: int     = typer.Option(10,     "--top",    "-n"),
+):
+    """🎯 Top passeurs décisifs."""
+    data = DB.passeurs(league=league, club=club, season=season, limit=top)
+    if not data:
+        console.print("[red]Aucun résultat.[/red]"); return
+
+    title = f"🎯 Passeurs {'FCSM' if club else 'National'} — Saison {season}"
+    console.print(_passeurs_table(data[:top], title))
+
+
+@app.command()
+def classement(
+    season: str = typer.Option(CURRENT_SEASON, "--season", "-s"),
+    league: str = typer.Option(None,   "--league", "-l", help="Ligue (défaut : National)"),
+):
+    """📊 Classement du Championnat National (ou d'une autre ligue)."""
+    data = DB.classement(season=season, league=league)
+    if not data:
+        console.print("[red]Aucun résultat.[/red]"); return
+
+    console.print(_classement_table(data, season))
+
+
+@app.command()
+def matches(
+    club: str   = typer.Option("FCSM",  "--club",   "-c"),
+    season: str = typer.Option(CURRENT_SEASON, "--season", "-s"),
+    last: int   = typer.Option(10,      "--last",   "-n"),
+):
+    """📅 Derniers matchs d'un club."""
+    data = DB.matches(club=club, season=season, last=last)
+    if not data:
+        console.print("[red]Aucun résultat.[/red]"); return
+
+    console.print(_matches_table(data, f"📅 Matchs {club.upper()} — {season}"))
 
 
 @app.command()
 def form(
     club: str   = typer.Option("FCSM", "--club",   "-c"),
-    season: str = typer.Option("2025", "--season", "-s"),
+    season: str = typer.Option(CURRENT_SEASON, "--season", "-s"),
     last: int   = typer.Option(5,      "--last",   "-n"),
 ):
     """📈 Forme récente d'un club (W/D/L)."""
     data = DB.form(club=club, season=season, last=last)
+    if data is None:
+        console.print(f"[red]Club '{club}' introuvable.[/red]"); return
 
     colors = {"W": "green", "D": "yellow", "L": "red"}
     form_colored = " ".join(f"[{colors[c]}]{c}[/{colors[c]}]" for c in data["form_string"])
@@ -180,5 +206,169 @@ def form(
     )
 
 
+# Panneau du mode watch → table dont dépendent ses données
+WATCH_PANELS = {"classement": "matches", "matches": "matches", "buteurs": "goals"}
+
+
+async def _watch(club: str, season: str, interval: float, last: int, top: int):
+    await DB._ensure_db()
+    panels: dict[str, Table] = {}
+    seen: dict[str, tuple] = {}
+    form_string = ""
+
+    with Live(console=console, auto_refresh=False) as live:
+        while True:
+            # Session courte à chaque tour : aucune transaction de lecture ne reste ouverte entre deux polls
+            async with AsyncSessionLocal() as db:
+                fp = await DB._fingerprint(db, season)
+                changed = [name for name, table in WATCH_PANELS.items() if fp[table] != seen.get(table)]
+                # Seules les vues dont la table a bougé sont recalculées et redessinées
+                if "classement" in changed:
+                    panels["classement"] = _classement_table(await DB._classement(db, season), season)
+                if "matches" in changed:
+                    data = await DB._matches(db, club, season, last)
+                    form_string = "".join(m["result"] for m in data[:5])
+                    panels["matches"] = _matches_table(data, f"📅 Matchs {club.upper()} — {season}")
+                if "buteurs" in changed:
+                    data = (await DB._buteurs_club(db, club, season))[:top]
+                    panels["buteurs"] = _buteurs_table(data, f"⚽ Buteurs {club.upper()} — {season}")
+            if changed:
+                seen.update(fp)
+                header = (
+                    f"[bold]📺 fcsmtop watch[/bold] — {club.upper()} — saison {season} — "
+                    f"forme [bold]{form_string or '—'}[/bold] — "
+                    f"[dim]mis à jour {datetime.now():%H:%M:%S} ({', '.join(changed)})[/dim]"
+                )
+                live.update(
+                    Group(header, panels["classement"], Columns([panels["matches"], panels["buteurs"]])),
+                    refresh=True,
+                )
+            await asyncio.sleep(interval)
+
+
+@app.command()
+def search(
+    query: str  = typer.Argument(..., help="Joueur, club ou ville (accents et fautes tolérés)"),
+    kind: str   = typer.Option(None, "--kind", "-k", help="club | player"),
+    top: int    = typer.Option(10,   "--top",  "-n"),
+):
+    """🔎 Recherche un joueur ou un club (« evreux », « Sochau », « ngatta »)."""
+    data = DB.search(query, limit=top, kind=kind)
+    if not data:
+        console.print("[red]Aucun résultat.[/red]"); return
+
+    t = Table(title=f"🔎 « {query} »", box=box.ROUNDED, header_style="bold yellow")
+    t.add_column("Type",    width=8, style="dim")
+    t.add_column("Id",      justify="right", style="dim")
+    t.add_column("Nom",     style="bold")
+    t.add_column("Détail")
+    t.add_column("Score",   justify="right", style="green")
+    for r in data:
+        t.add_row("Club" if r["kind"] == "club" else "Joueur", str(r["id"]), r["label"], r["detail"], f"{r['score']:.2f}")
+    console.print(t)
+
+
+@app.command()
+def watch(
+    club: str   = typer.Option("FCSM", "--club",   "-c"),
+    season: str = typer.Option(CURRENT_SEASON, "--season", "-s"),
+    interval: float = typer.Option(2.0, "--interval", "-i", help="Secondes entre deux vérifications"),
+    last: int   = typer.Option(5,      "--last",   "-n"),
+    top: int    = typer.Option(8,      "--top"),
+):
+    """📺 Tableau de bord en direct (classement, résultats, buteurs) — Ctrl+C pour quitter."""
+    try:
+        asyncio.run(_watch(club, season, interval, last, top))
+    except KeyboardInterrupt:
+        pass
+
+
+# ── Rapport ──────────────────────────────────────────────────────────────────
+MD_COLUMNS = {
+    "classement": [("rank", "#"), ("team", "Équipe"), ("played", "J"), ("won", "G"), ("drawn", "N"),
+                   ("lost", "P"), ("goals_for", "BP"), ("goals_against", "BC"), ("goal_diff", "+/-"), ("points", "Pts")],
+    "buteurs": [("rank", "#"), ("full_name", "Joueur"), ("team_short", "Club"), ("goals", "Buts"),
+                ("penalties", "Pen."), ("assists", "P.D.")],
+    "passeurs": [("rank", "#"), ("full_name", "Joueur"), ("team", "Club"), ("assists", "Passes D.")],
+    "matches": [("matchday", "J."), ("match_date", "Date"), ("home_team", "Domicile"), ("home_score", ""),
+                ("away_score", ""), ("away_team", "Extérieur"), ("result", "Résultat")],
+}
+
+
+def _md_table(rows: list[dict], columns: list[tuple[str, str]]) -> str:
+    if not rows:
+        return "_Aucun résultat._\n"
+    lines = ["| " + " | ".join(h for _, h in columns) + " |", "|" + "---|" * len(columns)]
+    lines += ["| " + " | ".join(str(r.get(k, "")) for k, _ in columns) + " |" for r in rows]
+    return "\n".join(lines) + "\n"
+
+
+def _report_markdown(data: dict) -> str:
+    out = [f"# ⚽ Rapport fcsmtop — {datetime.now():%Y-%m-%d}\n"]
+    for season, views in data.items():
+        out.append(f"## Saison {season}\n")
+        out += ["### 📊 Classement National\n", _md_table(views["classement"], MD_COLUMNS["classement"])]
+        out += ["### ⚽ Buteurs National\n", _md_table(views["buteurs"], MD_COLUMNS["buteurs"])]
+        out += ["### 🎯 Passeurs National\n", _md_table(views["passeurs"], MD_COLUMNS["passeurs"])]
+        for club, c in views["clubs"].items():
+            f = c["form"]
+            out.append(f"### {club}\n")
+            out.append(f"Forme : **{f['form_string'] or '—'}** — {f['wins']}V {f['draws']}N {f['losses']}D, "
+                       f"{f['goals_scored']} buts marqués / {f['goals_conceded']} encaissés\n")
+            out += ["#### Buteurs\n", _md_table(c["buteurs"], MD_COLUMNS["buteurs"])]
+            out += ["#### Passeurs\n", _md_table(c["passeurs"], MD_COLUMNS["passeurs"])]
+            out += ["#### Derniers matchs\n", _md_table(c["matches"], MD_COLUMNS["matches"])]
+    return "\n".join(out)
+
+
+def _report_rich(data: dict, out: Console):
+    for season, views in data.items():
+        out.rule(f"[bold]Saison {season}[/bold]")
+        out.print(_classement_table(views["classement"], season))
+        out.print(_buteurs_table(views["buteurs"], f"⚽ Buteurs Championnat National — Saison {season}"))
+        out.print(_passeurs_table(views["passeurs"], f"🎯 Passeurs National — Saison {season}"))
+        for club, c in views["clubs"].items():
+            out.print(f"\n[bold]📈 Forme {club}[/bold] : {c['form']['form_string'] or '—'}")
+            out.print(_buteurs_table(c["buteurs"], f"⚽ Buteurs {club} — Saison {season}"))
+            out.print(_passeurs_table(c["passeurs"], f"🎯 Passeurs {club} — Saison {season}"))
+            out.print(_matches_table(c["matches"], f"📅 Matchs {club} — {season}"))
+
+
+@app.command()
+def report(
+    club: list[str]   = typer.Option(["FCSM"], "--club",   "-c", help="Club(s) — option répétable"),
+    season: list[str] = typer.Option([CURRENT_SEASON], "--season", "-s", help="Saison(s) — option répétable"),
+    fmt: str          = typer.Option("rich",   "--format", "-f", help="rich | json | markdown"),
+    output: str       = typer.Option(None,     "--output", "-o", help="Fichier de sortie (défaut : stdout)"),
+    top: int          = typer.Option(10,       "--top",    "-n"),
+    last: int         = typer.Option(10,       "--last"),
+):
+    """🗒️  Rapport complet (classement, buteurs, passeurs, matchs, forme) — idéal en cron hebdomadaire."""
+    if fmt not in ("rich", "json", "markdown"):
+        console.print(f"[red]Format inconnu : {fmt} (rich | json | markdown)[/red]")
+        raise typer.Exit(1)
+
+    data = DB.report(clubs=club, seasons=season, top=top, last=last)
+
+    if fmt == "json":
+        text = json.dumps(data, ensure_ascii=False, indent=2)
+    elif fmt == "markdown":
+        text = _report_markdown(data)
+    else:
+        if output:
+            with open(output, "w", encoding="utf-8") as f:
+                _report_rich(data, Console(file=f, width=120))
+        else:
+            _report_rich(data, console)
+        return
+
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(text)
+        console.print(f"✅ Rapport écrit dans {output}")
+    else:
+        print(text)
+
+
 if __name__ == "__main__":
     app()
@@ -0,0 +1,179 @@
+"""Archive des saisons closes dans un fichier colonnaire compressé (voir `api.archive`).
+
+Usage :
+    python scripts/archive_season.py 2023 2024          # fige les saisons dans archives/ (lignes conservées)
+    python scripts/archive_season.py 2023 --purge       # + retire leurs lignes des tables vivantes
+    python scripts/archive_season.py --closed --purge   # toutes les saisons closes encore en base
+    python scripts/archive_season.py 2023 --restore     # réinsère les lignes en base et supprime l'archive
+
+Seule une saison close (antérieure à CURRENT_SEASON) peut être archivée. Le
+fichier est relu et comparé à la base avant toute purge ; l'API et le CLI
+lisent ensuite la saison depuis l'archive (classements, buteurs, matchs,
+forme, effectifs, fiches joueurs, analyses et exports), sans changement d'URL
+ni de commande.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///./fcsmtop.db")
+
+import numpy as np
+from sqlalchemy import delete, func, insert, select
+
+from api import archive
+from api.cache import cache
+from api.database import AsyncSessionLocal, init_db
+from api.models import Assist, Card, Goal, Match
+from api.seasons import closed
+from api.teams import registry as teams
+
+CHUNK = 5000
+NULL = -1
+
+
+def _ints(values, dtype=np.int32) -> np.ndarray:
+    return np.array([NULL if v is None else v for v in values], dtype=dtype)
+
+
+async def _read(db, season: str) -> dict[str, dict[str, np.ndarray]]:
+    """Tables de la saison en colonnes, triées par id (NULL codés comme dans l'archive)."""
+    in_season = select(Match.id).where(Match.season == season)
+    queries = {
+        "matches": select(Match.id, Match.matchday, Match.match_date, Match.home_team_id, Match.away_team_id,
+                          Match.home_score, Match.away_score, Match.played).where(Match.season == season),
+        "goals": select(Goal.id, Goal.match_id, Goal.scorer_id, Goal.minute, Goal.own_goal, Goal.penalty)
+        .where(Goal.match_id.in_(in_season)),
+        "assists": select(Assist.id, Assist.match_id, Assist.player_id, Assist.minute).where(Assist.match_id.in_(in_season)),
+        "cards": select(Card.id, Card.match_id, Card.player_id, Card.card_type == "red", Card.minute)
+        .where(Card.match_id.in_(in_season)),
+    }
+    tables = {}
+    for table, stmt in queries.items():
+        rows = (await db.execute(stmt.order_by(stmt.selected_columns[0]))).all()
+        columns = {}
+        for i, name in enumerate(archive.TABLES[table]):
+            values = [r[i] for r in rows]
+            if name == "match_date":
+                columns[name] = np.array([v or "NaT" for v in values], dtype="datetime64[D]")
+            elif name in ("played", "own_goal", "penalty", "red"):
+                columns[name] = np.array([bool(v) for v in values], dtype=bool)
+            else:
+                columns[name] = _ints(values)
+        tables[table] = columns
+    return tables
+
+
+def _same(a: dict, b: dict) -> bool:
+    # Comparaison octet à octet : NaT != NaT pour NumPy
+    return all(
+        a[t][c].dtype == b[t][c].dtype and a[t][c].tobytes() == b[t][c].tobytes()
+        for t, columns in archive.TABLES.items() for c in columns
+    )
+
+
+async def freeze(season: str, purge: bool) -> str:
+    async with AsyncSessionLocal() as db:
+        await teams.ensure(db)
+        n = await db.scalar(select(func.count(Match.id)).where(Match.season == season))
+        if not n:
+            return "déjà archivée" if archive.has(season) else "aucun match en base"
+        tables = await _read(db, season)
+        home, away = tables["matches"]["home_team_id"], tables["matches"]["away_team_id"]
+        team_ids = sorted(set(home.tolist()) | set(away.tolist()))
+        leagues = sorted({teams.get(t).league for t in home.tolist()})
+        header = archive.write(season, tables, leagues, team_ids)
+
+        # Relecture complète avant de toucher à la base
+        written = archive.open_season(season)
+        if not _same(tables, {t: written.table(t) for t in archive.TABLES}):
+            os.remove(archive.path(season))
+            raise RuntimeError(f"Archive {season} illisible ou incomplète — base inchangée")
+
+        size = os.path.getsize(archive.path(season))
+        rows = sum(t["rows"] for t in header["tables"].values())
+        status = f"{rows} lignes → {archive.path(season)} ({size / 1024:.0f} Kio)"
+        if purge:
+            in_season = select(Match.id).where(Match.season == season)
+            for model in (Card, Assist, Goal):
+                await db.execute(delete(model).where(model.match_id.in_(in_season)))
+            await db.execute(delete(Match).where(Match.season == season))
+            await db.commit()
+            status += ", lignes retirées de la base"
+    cache.bump_leagues(season, leagues)
+    return status
+
+
+async def restore(season: str) -> str:
+    if not archive.has(season):
+        return "pas d'archive"
+    a = archive.open_season(season)
+
+    def rows(table: str) -> list[dict]:
+        columns = a.table(table)
+        out = []
+        for values in zip(*(c.tolist() for c in columns.values())):
+            row = dict(zip(columns, values))
+            for name, value in row.items():
+                if value == NULL and name in ("home_score", "away_score", "minute"):
+                    row[name] = None
+            out.append(row)
+        return out
+
+    matches = rows("matches")
+    for m in matches:
+        m["season"] = season
+    cards = rows("cards")
+    for c in cards:
+        c["card_type"] = "red" if c.pop("red") else "yellow"
+    async with AsyncSessionLocal() as db:
+        if await db.scalar(select(func.count(Match.id)).where(Match.season == season)):
+            return "des matchs de cette saison sont déjà en base — restauration annulée"
+        for model, data in ((Match, matches), (Goal, rows("goals")), (Assist, rows("assists")), (Card, cards)):
+            for i in range(0, len(data), CHUNK):
+                await db.execute(insert(model), data[i:i + CHUNK])
+        await db.commit()
+    os.remove(archive.path(season))
+    cache.bump_leagues(season, a.header["leagues"])
+    return f"{len(matches)} matchs réinsérés, archive supprimée"
+
+
+async def run(seasons: list[str], closed_only: bool, purge: bool, do_restore: bool) -> None:
+    await init_db()
+    if closed_only:
+        async with AsyncSessionLocal() as db:
+            seasons = list(await db.scalars(select(Match.season).distinct().order_by(Match.season)))
+        seasons = [s for s in seasons if closed(s)]
+    icon = "♻️ " if do_restore else "📦"
+    for season in seasons:
+        t0 = time.perf_counter()
+        if do_restore:
+            status = await restore(season)
+        elif not closed(season):
+            status = "saison non close — ignorée (voir CURRENT_SEASON)"
+        else:
+            status = await freeze(season, purge)
+        print(f"  {icon} {season} : {status} ({time.perf_counter() - t0:.2f} s)")
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Archive colonnaire des saisons closes")
+    p.add_argument("seasons", nargs="*", help="Saisons à archiver (ex. 2023 2024)")
+    p.add_argument("--closed", action="store_true", help="Toutes les saisons closes encore en base")
+    p.add_argument("--purge", action="store_true", help="Retire les lignes archivées des tables vivantes")
+    p.add_argument("--restore", action="store_true", help="Réinsère les saisons en base depuis leur archive")
+    args = p.parse_args(argv)
+    if not args.seasons and not args.closed:
+        p.error("indiquer des saisons ou --closed")
+    asyncio.run(run(args.seasons, args.closed, args.purge, args.restore))
+    print(f"✅ Archives dans {archive.ARCHIVE_DIR}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Prépare le frontend pour la production : noms hashés + variantes précompressées.
+
+Usage :
+    python scripts/build_static.py
+
+Produit `web/dist/` :
+    static/app.<hash>.js, static/style.<hash>.css (+ .gz, + .br si brotli est installé)
+    index.html, fcsm.html (références réécrites vers les noms hashés, + .gz / .br)
+    manifest.json (nom d'origine → nom hashé)
+
+L'API sert `web/dist/` en priorité s'il existe ; les fichiers hashés partent avec
+`Cache-Control: immutable`, les variantes compressées sans aucun coût CPU.
+"""
+import gzip
+import hashlib
+import json
+import os
+import shutil
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WEB = os.path.join(ROOT, "web")
+DIST = os.path.join(WEB, "dist")
+PAGES = ["index.html", "fcsm.html"]
+COMPRESSIBLE = (".js", ".css", ".html", ".json", ".svg")
+
+
+def precompress(path: str) -> None:
+    with open(path, "rb") as f:
+        data = f.read()
+    # mtime=0 : sortie identique d'un build à l'autre
+    with open(path + ".gz", "wb") as f:
+        f.write(gzip.compress(data, compresslevel=9, mtime=0))
+    if brotli is not None:
+        with open(path + ".br", "wb") as f:
+            f.write(brotli.compress(data, quality=11))
+
+
+def build() -> dict:
+    # Seuls les assets repartent de zéro : les pages prérendues (scripts/prerender.py) sont conservées
+    shutil.rmtree(os.path.join(DIST, "static"), ignore_errors=True)
+    os.makedirs(os.path.join(DIST, "static"))
+
+    manifest = {}
+    src_static = os.path.join(WEB, "static")
+    for name in sorted(os.listdir(src_static)):
+        src = os.path.join(src_static, name)
+        if not os.path.isfile(src):
+            continue
+        with open(src, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()[:8]
+        stem, ext = os.path.splitext(name)
+        hashed = f"{stem}.{digest}{ext}"
+        dst = os.path.join(DIST, "static", hashed)
+        shutil.copyfile(src, dst)
+        if ext in COMPRESSIBLE:
+            precompress(dst)
+        manifest[name] = hashed
+
+    for page in PAGES:
+        with open(os.path.join(WEB, page), encoding="utf-8") as f:
+            html = f.read()
+        for name, hashed in manifest.items():
+            html = html.replace(f"/static/{name}", f"/static/{hashed}")
+        dst = os.path.join(DIST, page)
+        with open(dst, "w", encoding="utf-8") as f:
+            f.write(html)
+        precompress(dst)
+
+    with open(os.path.join(DIST, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+if __name__ == "__main__":
+    manifest = build()
+    encodings = "gzip + brotli" if brotli is not None else "gzip (brotli non installé)"
+    print(f"✅ {len(manifest)} assets hashés, {len(PAGES)} pages — précompression {encodings} → {DIST}")
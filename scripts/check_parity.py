@@ -0,0 +1,115 @@
+"""Vérifie que l'API et le CLI renvoient exactement les mêmes données.
+
+Usage :
+    python scripts/check_parity.py                      # base synthétique temporaire (2 ligues)
+    python scripts/check_parity.py --leagues 3 --seasons 2
+    python scripts/check_parity.py --database-url sqlite+aiosqlite:///./fcsmtop.db   # base existante (lecture seule)
+
+Chaque vue est lue via l'API (client ASGI in-process) puis via les fonctions
+de `cli/db.py`, sur la même base ; toute différence est affichée et le script
+sort en erreur (code 1) — utilisable en CI.
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+LIMIT = 50
+
+
+def views(season: str, clubs: list[str]) -> list[tuple[str, str, callable]]:
+    """(nom, URL de l'API, appel CLI équivalent prenant la session)."""
+    from cli import db as DB
+
+    out = [
+        ("classement", f"/api/v1/national/classement?season={season}",
+         lambda db: DB._classement(db, season)),
+        ("buteurs", f"/api/v1/national/buteurs?season={season}&limit={LIMIT}",
+         lambda db: DB._buteurs_national(db, season, LIMIT)),
+        ("passeurs", f"/api/v1/national/passeurs?season={season}&limit={LIMIT}",
+         lambda db: DB._passeurs(db, None, season, LIMIT)),
+    ]
+    for club in clubs:
+        out += [
+            (f"{club} buteurs", f"/api/v1/clubs/{club}/buteurs?season={season}",
+             lambda db, c=club: DB._buteurs_club(db, c, season)),
+            (f"{club} passeurs", f"/api/v1/clubs/{club}/passeurs?season={season}",
+             lambda db, c=club: DB._passeurs(db, c, season, 1000)),
+            (f"{club} matchs", f"/api/v1/clubs/{club}/matches?season={season}&last=38",
+             lambda db, c=club: DB._matches(db, c, season, 38)),
+            (f"{club} forme", f"/api/v1/clubs/{club}/form?season={season}&last=5",
+             lambda db, c=club: DB._form(db, c, season, 5)),
+        ]
+    return out
+
+
+async def compare(seasons: list[str], clubs: list[str]) -> int:
+    import httpx
+    from api.database import AsyncSessionLocal
+    from api.main import app
+    from cli import db as DB
+
+    await DB._ensure_db()
+    failures = 0
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app), \
+            httpx.AsyncClient(transport=transport, base_url="http://parity") as client, \
+            AsyncSessionLocal() as db:
+        for season in seasons:
+            for name, url, cli_call in views(season, clubs):
+                response = await client.get(url)
+                api_rows = response.json() if response.status_code == 200 else f"HTTP {response.status_code}"
+                cli_rows = await cli_call(db)
+                if api_rows == cli_rows:
+                    size = len(cli_rows) if isinstance(cli_rows, list) else 1
+                    print(f"  ✅ {season} {name:<20} {size} ligne(s)")
+                    continue
+                failures += 1
+                print(f"  ❌ {season} {name:<20} API ≠ CLI")
+                print(f"     API : {str(api_rows)[:300]}")
+                print(f"     CLI : {str(cli_rows)[:300]}")
+    return failures
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Parité des résultats API / CLI")
+    p.add_argument("--leagues", type=int, default=2)
+    p.add_argument("--teams", type=int, default=16)
+    p.add_argument("--seasons", type=int, default=2)
+    p.add_argument("--seed", type=int, default=7)
+    p.add_argument("--club", action="append", help="Club(s) à comparer (défaut : FCSM, ORL, RST)")
+    p.add_argument("--database-url", default=None, help="Base existante à comparer (non modifiée)")
+    args = p.parse_args(argv)
+
+    tmpdir = None
+    if args.database_url is None:
+        tmpdir = tempfile.mkdtemp(prefix="fcsmtop-parity-")
+        args.database_url = f"sqlite+aiosqlite:///{os.path.join(tmpdir, 'parity.db')}"
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ.setdefault("CACHE_URL", "memory://")
+
+    last_season = 2025
+    if tmpdir:
+        from scripts.generate_data import generate
+        asyncio.run(generate(leagues=args.leagues, teams=args.teams, seasons=args.seasons,
+                             last_season=last_season, seed=args.seed, reset=True, verbose=False))
+    seasons = [str(last_season - i) for i in range(args.seasons)]
+
+    try:
+        failures = asyncio.run(compare(seasons, args.club or ["FCSM", "ORL", "RST"]))
+    finally:
+        if tmpdir:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+    if failures:
+        sys.exit(f"❌ {failures} vue(s) divergente(s) entre l'API et le CLI")
+    print("✅ API et CLI renvoient les mêmes résultats")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,347 @@
+"""Génère un jeu de données synthétique réaliste et volumineux (stress tests, benchmarks).
+
+Usage :
+    python scripts/generate_data.py --reset
+    python scripts/generate_data.py --leagues 3 --teams 18 --seasons 30 --seed 42 --reset
+
+Données cohérentes entre elles : calendrier aller-retour (méthode du cercle),
+buts conformes aux scores (dont c.s.c. et penalties), passes décisives,
+cartons et minutes triées, transferts entre clubs à chaque intersaison. Le
+tirage est déterministe pour une graine donnée ; le chargement se fait saison
+par saison en insertions groupées, la mémoire reste donc bornée même pour des
+millions d'événements.
+"""
+import argparse
+import asyncio
+import math
+import os
+import random
+import sys
+import time
+import unicodedata
+from datetime import date, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///./fcsmtop.db")
+
+from sqlalchemy import bindparam, insert, select, func, update
+
+from api.cache import ALL, cache
+from api.database import Base, engine
+from api.models import Team, Player, Match, Goal, Assist, Card
+
+CHUNK = 10_000
+
+LEAGUES = ["National", "National 2 A", "National 2 B", "National 2 C", "Ligue 2", "National 3"]
+
+# Le National réel en tête pour que FCSM & co existent toujours
+REAL_TEAMS = [
+    ("FC Sochaux-Montbéliard", "FCSM", "Montbéliard"), ("US Orléans", "ORL", "Orléans"),
+    ("Rouen FC", "ROU", "Rouen"), ("Red Star FC", "RST", "Saint-Ouen"),
+    ("Avranches FC", "AVR", "Avranches"), ("Villefranche Beaujolais", "VIL", "Villefranche"),
+    ("Marignane Gignac FC", "MGF", "Marignane"), ("Concarneau FC", "CON", "Concarneau"),
+    ("Châteauroux", "CHT", "Châteauroux"), ("Béziers FC", "BEZ", "Béziers"),
+    ("Versailles FC", "VER", "Versailles"), ("Grenoble Foot 38", "GRE", "Grenoble"),
+    ("Dijon FCO", "DIJ", "Dijon"), ("Évreux FC 27", "EVR", "Évreux"),
+    ("Annecy FC", "ANN", "Annecy"), ("Bergerac Périgord FC", "BER", "Bergerac"),
+]
+
+CITIES = [
+    "Épinal", "Besançon", "Belfort", "Mulhouse", "Colmar", "Nancy", "Metz", "Reims", "Troyes",
+    "Amiens", "Lens", "Calais", "Boulogne", "Dunkerque", "Caen", "Laval", "Le Mans", "Angers",
+    "Cholet", "Niort", "Poitiers", "Limoges", "Tours", "Blois", "Bourges", "Nevers", "Auxerre",
+    "Mâcon", "Bourg-en-Bresse", "Chambéry", "Valence", "Nîmes", "Sète", "Agde", "Fréjus",
+    "Hyères", "Toulon", "Aubagne", "Martigues", "Istres", "Arles", "Alès", "Rodez", "Albi",
+    "Tarbes", "Pau", "Bayonne", "Mont-de-Marsan", "Périgueux", "Brive", "Aurillac", "Le Puy",
+    "Saint-Étienne", "Roanne", "Vichy", "Montluçon", "Moulins", "Quimper", "Lorient", "Vannes",
+    "Saint-Brieuc", "Saint-Malo", "Fougères", "Vitré", "Cherbourg", "Granville", "Alençon",
+    "Chartres", "Dreux", "Évry", "Créteil", "Fleury", "Sedan", "Charleville", "Thionville",
+]
+PREFIXES = ["FC", "US", "AS", "Stade", "Olympique", "SC", "AC", "Racing"]
+
+FIRST_NAMES = [
+    "Lucas", "Hugo", "Théo", "Nathan", "Mathis", "Enzo", "Louis", "Gabriel", "Jules", "Raphaël",
+    "Kévin", "Maxime", "Julien", "Yanis", "Adam", "Moussa", "Ibrahim", "Mamadou", "Sékou",
+    "Élie", "Jérémy", "Rémi", "Loïc", "Anthony", "Bastien", "Florian", "Aymen", "Samir",
+    "Yacine", "Karim", "Ousmane", "Cheick", "Aurélien", "Grégory", "Benoît", "Cédric", "Noé",
+]
+LAST_NAMES = [
+    "Martin", "Bernard", "Dubois", "Thomas", "Robert", "Richard", "Petit", "Durand", "Leroy",
+    "Moreau", "Simon", "Laurent", "Lefèvre", "Michel", "Garcia", "David", "Bertrand", "Roux",
+    "Vincent", "Fournier", "Morel", "Girard", "André", "Mercier", "Dupont", "Lambert", "Bonnet",
+    "François", "Martinez", "Traoré", "Diallo", "Koné", "Camara", "Cissé", "N'Diaye", "Sylla",
+    "Bâ", "Touré", "Mendes", "Gonçalves", "Da Silva", "Benali", "Haddad", "Lévêque", "Géry",
+    "N'Gatta", "Le Gall", "Le Goff", "Saint-Martin", "Tavares dos Santos",
+]
+NATIONALITIES = ["Français"] * 8 + ["Malien", "Sénégalais", "Ivoirien", "Marocain", "Algérien", "Portugais"]
+
+# Effectif type : 3 gardiens, 8 défenseurs, 8 milieux, 5 attaquants
+SQUAD = ["Gardien"] * 3 + ["Défenseur"] * 8 + ["Milieu"] * 8 + ["Attaquant"] * 5
+SCORING_WEIGHT = {"Gardien": 0.0, "Défenseur": 0.15, "Milieu": 0.35, "Attaquant": 1.0}
+ASSIST_WEIGHT = {"Gardien": 0.02, "Défenseur": 0.4, "Milieu": 1.0, "Attaquant": 0.6}
+TURNOVER = 0.25  # part de l'effectif transférée à chaque intersaison
+
+
+def round_robin(team_ids: list[int]) -> list[list[tuple[int, int]]]:
+    """Calendrier aller-retour par la méthode du cercle : une liste de journées."""
+    ids = list(team_ids)
+    if len(ids) % 2:
+        ids.append(None)  # exempt
+    n = len(ids)
+    first_leg = []
+    for r in range(n - 1):
+        day = []
+        for i in range(n // 2):
+            home, away = ids[i], ids[n - 1 - i]
+            if home is not None and away is not None:
+                day.append((home, away) if r % 2 == 0 else (away, home))
+        first_leg.append(day)
+        ids.insert(1, ids.pop())
+    return first_leg + [[(a, h) for h, a in day] for day in first_leg]
+
+
+def poisson(rng: random.Random, lam: float) -> int:
+    limit, k, p = math.exp(-lam), 0, 1.0
+    while True:
+        p *= rng.random()
+        if p <= limit:
+            return k
+        k += 1
+
+
+def _minutes(rng: random.Random, n: int) -> list[int]:
+    # Légère surreprésentation des fins de mi-temps (45+, 90+ ramenés à 45 / 90)
+    return sorted(rng.choice((45, 90)) if rng.random() < 0.08 else rng.randint(1, 90) for _ in range(n))
+
+
+class Generator:
+    """Construit les lignes à insérer ; garde les compteurs d'identifiants."""
+
+    def __init__(self, rng: random.Random, goals_per_match: float):
+        self.rng = rng
+        self.goals_per_match = goals_per_match
+        self.ids = {"team": 0, "player": 0, "match": 0, "goal": 0, "assist": 0, "card": 0}
+        self.squads: dict[int, list[tuple[int, str]]] = {}  # team_id -> [(player_id, position)]
+        self.penalty_takers: dict[int, int] = {}
+
+    def _next(self, kind: str) -> int:
+        self.ids[kind] += 1
+        return self.ids[kind]
+
+    def teams(self, leagues: list[str], per_league: int) -> tuple[list[dict], dict[str, list[int]]]:
+        rows, by_league, used_short, used_names = [], {}, set(), set()
+        real = list(REAL_TEAMS)
+        cities = list(CITIES)
+        self.rng.shuffle(cities)
+        for league in leagues:
+            by_league[league] = []
+            for _ in range(per_league):
+                if real:
+                    name, short, city = real.pop(0)
+                else:
+                    city = cities.pop() if cities else f"Ville {self.ids['team'] + 1}"
+                    name = f"{self.rng.choice(PREFIXES)} {city}"
+                    while name in used_names:
+                        name = f"{name} {self.ids['team'] + 1}"
+                    ascii_city = unicodedata.normalize("NFKD", city).encode("ascii", "ignore").decode()
+                    base = "".join(c for c in ascii_city.upper() if c.isalpha())[:3] or "EQP"
+                    short, n = base, 1
+                    while short in used_short:
+                        n += 1
+                        short = f"{base[:3]}{n}"
+                tid = self._next("team")
+                used_short.add(short)
+                used_names.add(name)
+                rows.append({"id": tid, "name": name, "short_name": short, "city": city, "league": league})
+                by_league[league].append(tid)
+        return rows, by_league
+
+    def _player(self, team_id: int, position: str, number: int) -> dict:
+        pid = self._next("player")
+        self.squads[team_id].append((pid, position))
+        return {
+            "id": pid, "first_name": self.rng.choice(FIRST_NAMES), "last_name": self.rng.choice(LAST_NAMES),
+            "position": position, "nationality": self.rng.choice(NATIONALITIES),
+            "birth_date": date(self.rng.randint(1988, 2006), self.rng.randint(1, 12), self.rng.randint(1, 28)),
+            "number": number, "team_id": team_id,
+        }
+
+    def squad_changes(self, team_ids: list[int]) -> tuple[list[dict], list[dict]]:
+        """Effectif initial, puis mercato à chaque intersaison : (joueurs créés, transferts).
+
+        Un joueur qui quitte son club en rejoint un autre de la ligue au même
+        poste ; `team_id` reste ainsi l'effectif actuel du joueur. Faute de
+        place ailleurs à son poste, il reste dans son club.
+        """
+        rows, moves = [], []
+        departures, vacancies = [], []  # (joueur, poste, club quitté) ; (club, poste, numéro)
+        for tid in team_ids:
+            squad = self.squads.get(tid)
+            if squad is None:
+                self.squads[tid] = []
+                rows += [self._player(tid, pos, n + 1) for n, pos in enumerate(SQUAD)]
+                continue
+            for slot, member in enumerate(list(squad)):
+                if self.rng.random() < TURNOVER:
+                    squad.remove(member)
+                    departures.append((member[0], member[1], tid))
+                    vacancies.append((tid, member[1], slot + 1))
+        self.rng.shuffle(departures)
+        for tid, position, number in vacancies:
+            candidates = [d for d in departures if d[1] == position]
+            pid, _, origin = next((d for d in candidates if d[2] != tid), candidates[0])
+            departures.remove((pid, position, origin))
+            self.squads[tid].append((pid, position))
+            moves.append({"pid": pid, "tid": tid, "num": number})
+        for tid in team_ids:
+            attackers = [pid for pid, pos in self.squads[tid] if pos == "Attaquant"]
+            self.penalty_takers[tid] = self.rng.choice(attackers)
+        return rows, moves
+
+    def _pick(self, team_id: int, weights: dict, exclude: int = None) -> int:
+        squad = [(pid, pos) for pid, pos in self.squads[team_id] if pid != exclude]
+        return self.rng.choices([pid for pid, _ in squad], [weights[pos] for _, pos in squad])[0]
+
+    def season(self, year: int, team_ids: list[int]) -> dict[str, list[dict]]:
+        rng = self.rng
+        strength = {t: (rng.gauss(1, 0.15), rng.gauss(1, 0.15)) for t in team_ids}  # (attaque, défense)
+        order = list(team_ids)
+        rng.shuffle(order)
+        out = {"matches": [], "goals": [], "assists": [], "cards": []}
+        kickoff = date(year - 1, 8, 1)
+        kickoff += timedelta(days=(4 - kickoff.weekday()) % 7)  # premier vendredi d'août
+
+        for md, day in enumerate(round_robin(order), start=1):
+            # Trêve hivernale après la 17e journée
+            base_date = kickoff + timedelta(weeks=md - 1 + (3 if md > 17 else 0))
+            for home, away in day:
+                mid = self._next("match")
+                lam_home = self.goals_per_match * 0.56 * strength[home][0] / max(strength[away][1], 0.5)
+                lam_away = self.goals_per_match * 0.44 * strength[away][0] / max(strength[home][1], 0.5)
+                hs, as_ = poisson(rng, max(lam_home, 0.1)), poisson(rng, max(lam_away, 0.1))
+                out["matches"].append({
+                    "id": mid, "season": str(year), "matchday": md,
+                    "match_date": base_date + timedelta(days=rng.choice((0, 0, 1, 3))),
+                    "home_team_id": home, "away_team_id": away,
+                    "home_score": hs, "away_score": as_, "played": True,
+                })
+                self._goals(out, mid, home, away, hs)
+                self._goals(out, mid, away, home, as_)
+                self._cards(out, mid, home)
+                self._cards(out, mid, away)
+        return out
+
+    def _goals(self, out: dict, mid: int, team: int, opponent: int, count: int) -> None:
+        rng = self.rng
+        for minute in _minutes(rng, count):
+            roll = rng.random()
+            if roll < 0.03:
+                # Contre son camp : le buteur est un adversaire, le but compte pour `team`
+                scorer, own_goal, penalty = self._pick(opponent, SCORING_WEIGHT | {"Défenseur": 1.0}), True, False
+            elif roll < 0.13:
+                scorer, own_goal, penalty = self.penalty_takers[team], False, True
+            else:
+                scorer, own_goal, penalty = self._pick(team, SCORING_WEIGHT), False, False
+            out["goals"].append({"id": self._next("goal"), "match_id": mid, "scorer_id": scorer,
+                                 "minute": minute, "own_goal": own_goal, "penalty": penalty})
+            if not own_goal and not penalty and rng.random() < 0.72:
+                out["assists"].append({"id": self._next("assist"), "match_id": mid,
+                                       "player_id": self._pick(team, ASSIST_WEIGHT, exclude=scorer),
+                                       "minute": minute})
+
+    def _cards(self, out: dict, mid: int, team: int) -> None:
+        yellows = poisson(self.rng, 1.9)
+        reds = 1 if self.rng.random() < 0.07 else 0
+        for card_type, n in (("yellow", yellows), ("red", reds)):
+            for minute in _minutes(self.rng, n):
+                out["cards"].append({"id": self._next("card"), "match_id": mid, "card_type": card_type,
+                                     "player_id": self._pick(team, {p: 1.0 for p in SCORING_WEIGHT}),
+                                     "minute": minute})
+
+
+async def _bulk(conn, model, rows: list[dict]) -> None:
+    for i in range(0, len(rows), CHUNK):
+        await conn.execute(insert(model), rows[i:i + CHUNK])
+
+
+async def generate(
+    leagues: int = 1,
+    teams: int = 18,
+    seasons: int = 1,
+    last_season: int = 2025,
+    goals_per_match: float = 2.6,
+    seed: int = 42,
+    reset: bool = False,
+    verbose: bool = True,
+) -> dict:
+    """Génère et charge les données. Retourne les volumes insérés par table."""
+    if leagues > len(LEAGUES):
+        raise ValueError(f"{len(LEAGUES)} ligues au maximum")
+    gen = Generator(random.Random(seed), goals_per_match)
+    totals = {"teams": 0, "players": 0, "matches": 0, "goals": 0, "assists": 0, "cards": 0}
+
+    async with engine.begin() as conn:
+        if reset:
+            await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        if await conn.scalar(select(func.count(Team.id))):
+            raise RuntimeError("La base contient déjà des données — relancer avec --reset")
+        if engine.dialect.name == "sqlite":
+            # Chargement initial : la durabilité n'a pas d'intérêt tant que la base n'est pas prête
+            await conn.exec_driver_sql("PRAGMA synchronous = OFF")
+
+        team_rows, by_league = gen.teams(LEAGUES[:leagues], teams)
+        await _bulk(conn, Team, team_rows)
+        totals["teams"] = len(team_rows)
+
+        for year in range(last_season - seasons + 1, last_season + 1):
+            t0 = time.perf_counter()
+            for team_ids in by_league.values():
+                players, moves = gen.squad_changes(team_ids)
+                await _bulk(conn, Player, players)
+                if moves:
+                    await conn.execute(
+                        update(Player).where(Player.id == bindparam("pid"))
+                        .values(team_id=bindparam("tid"), number=bindparam("num")),
+                        moves,
+                    )
+                totals["players"] += len(players)
+                rows = gen.season(year, team_ids)
+                for model, key in ((Match, "matches"), (Goal, "goals"), (Assist, "assists"), (Card, "cards")):
+                    await _bulk(conn, model, rows[key])
+                    totals[key] += len(rows[key])
+            if verbose:
+                print(f"  saison {year} chargée ({time.perf_counter() - t0:.2f} s)")
+
+    cache.bump(ALL)
+    return totals
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Génère un jeu de données synthétique fcsmtop")
+    p.add_argument("--leagues", type=int, default=1, help=f"Nombre de ligues (1-{len(LEAGUES)})")
+    p.add_argument("--teams", type=int, default=18, help="Équipes par ligue")
+    p.add_argument("--seasons", type=int, default=1, help="Nombre de saisons jusqu'à --last-season")
+    p.add_argument("--last-season", type=int, default=2025)
+    p.add_argument("--goals-per-match", type=float, default=2.6)
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--reset", action="store_true", help="Supprime et recrée toutes les tables")
+    args = p.parse_args(argv)
+
+    t0 = time.perf_counter()
+    try:
+        totals = asyncio.run(generate(
+            leagues=args.leagues, teams=args.teams, seasons=args.seasons, last_season=args.last_season,
+            goals_per_match=args.goals_per_match, seed=args.seed, reset=args.reset,
+        ))
+    except (RuntimeError, ValueError) as e:
+        sys.exit(f"❌ {e}")
+    events = totals["goals"] + totals["assists"] + totals["cards"]
+    print(f"✅ {totals} — {events} événements en {time.perf_counter() - t0:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,338 @@
+"""Prérendu statique des pages (National, clubs, saisons) avec reconstruction incrémentale.
+
+Usage :
+    python scripts/prerender.py                  # toutes les saisons, seules les pages modifiées
+    python scripts/prerender.py --season 2025    # une saison
+    python scripts/prerender.py --force          # tout reconstruire
+
+Produit dans `web/dist/` (après `scripts/build_static.py`, lancé si besoin) :
+    index.html, fcsm.html                        saison courante, tableaux déjà remplis
+    saisons/<saison>/index.html                  classement + buteurs de la saison
+    saisons/<saison>/clubs/<club>/index.html     page club de la saison
+    data/<saison>/national/*.json, data/<saison>/clubs/<CLUB>/*.json
+    prerender.json                               empreintes du dernier build
+
+Les données viennent des mêmes requêtes que l'API (`api.services`) et sont
+embarquées dans chaque page : aucun appel API à l'affichage, tout peut partir
+sur un hébergement statique ou un CDN. Une page n'est régénérée que si
+l'empreinte de sa saison (page National) ou de son club (page club) a changé
+depuis le build précédent, si les gabarits ont changé, ou si le fichier a été
+écrasé entre-temps.
+"""
+import argparse
+import asyncio
+import hashlib
+import html
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///./fcsmtop.db")
+
+from api import columnar, services
+from api.database import AsyncSessionLocal, init_db
+from api.teams import TeamInfo, registry as teams
+from scripts import build_static
+from scripts.build_static import DIST, WEB, precompress
+
+MANIFEST = os.path.join(DIST, "prerender.json")
+TOP_SCORERS = 10
+LAST_MATCHES = 10
+FORM_LAST = 5
+
+
+def _season_label(season: str) -> str:
+    return f"{int(season) - 1}-{season}" if season.isdigit() else season
+
+
+def _fingerprint(*parts) -> str:
+    return hashlib.sha256(json.dumps(parts, default=str).encode()).hexdigest()[:16]
+
+
+def _templates_version(assets: dict) -> str:
+    """Change si une page source, un asset ou ce script change : tout est alors reconstruit."""
+    h = hashlib.sha256(json.dumps(assets, sort_keys=True).encode())
+    for path in (os.path.join(WEB, "index.html"), os.path.join(WEB, "fcsm.html"), os.path.abspath(__file__)):
+        with open(path, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()[:16]
+
+
+def _load_assets() -> dict:
+    path = os.path.join(DIST, "manifest.json")
+    if not os.path.exists(path):
+        return build_static.build()
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _template(page: str, assets: dict) -> str:
+    with open(os.path.join(WEB, page), encoding="utf-8") as f:
+        out = f.read()
+    for name, hashed in assets.items():
+        out = out.replace(f"/static/{name}", f"/static/{hashed}")
+    return out
+
+
+# ── Lignes de tableau (mêmes gabarits que web/static/app.js) ───────────────────
+e = html.escape
+
+
+def _classement_rows(rows: list[dict]) -> str:
+    return "".join(
+        f'<tr class="{"fcsm" if r["team_short"] == "FCSM" else ""}"><td>{r["rank"]}</td><td>{e(r["team"])}</td>'
+        f'<td>{r["played"]}</td><td style="color:var(--green)">{r["won"]}</td>'
+        f'<td style="color:var(--yellow)">{r["drawn"]}</td><td style="color:var(--red)">{r["lost"]}</td>'
+        f'<td>{r["goals_for"]}</td><td>{r["goals_against"]}</td>'
+        f'<td>{"+" if r["goal_diff"] > 0 else ""}{r["goal_diff"]}</td><td><strong>{r["points"]}</strong></td></tr>'
+        for r in rows
+    )
+
+
+def _buteurs_rows(rows: list[dict]) -> str:
+    return "".join(
+        f'<tr><td>{r["rank"]}</td><td><strong>{e(r["full_name"])}</strong></td><td>{e(r["team_short"])}</td>'
+        f'<td style="color:var(--green);font-weight:700">{r["goals"]}</td><td>{r["assists"]}</td></tr>'
+        for r in rows
+    )
+
+
+def _club_buteurs_rows(rows: list[dict]) -> str:
+    return "".join(
+        f'<tr><td>{r["rank"]}</td><td><strong>{e(r["full_name"])}</strong></td>'
+        f'<td style="color:var(--green);font-weight:700">{r["goals"]}</td>'
+        f'<td style="color:var(--text-muted)">{r["penalties"] or "—"}</td></tr>'
+        for r in rows
+    )
+
+
+def _passeurs_rows(rows: list[dict]) -> str:
+    return "".join(
+        f'<tr><td>{r["rank"]}</td><td><strong>{e(r["full_name"])}</strong></td>'
+        f'<td style="color:var(--primary);font-weight:700">{r["assists"]}</td></tr>'
+        for r in rows
+    )
+
+
+def _matches_rows(rows: list[dict]) -> str:
+    badges = {"W": "✓ V", "D": "= N", "L": "✗ D"}
+
+    def badge(result):
+        return f'<span class="badge badge-{result}">{badges[result]}</span>' if result else "—"
+
+    def score(value):
+        return "?" if value is None else value
+
+    return "".join(
+        f'<tr><td>{m["matchday"]}</td><td>{(m["match_date"] or "")[:10]}</td><td>{e(m["home_team"])}</td>'
+        f'<td style="font-weight:700;text-align:center">{score(m["home_score"])} - {score(m["away_score"])}</td>'
+        f'<td>{e(m["away_team"])}</td><td>{badge(m["result"])}</td></tr>'
+        for m in rows
+    )
+
+
+def _form_html(form: dict) -> tuple[str, str]:
+    balls = "".join(f'<div class="form-ball {c}">{c}</div>' for c in form["form_string"])
+    stats = (
+        f'<span><strong style="color:var(--green)">{form["wins"]}V</strong></span>'
+        f'<span><strong style="color:var(--yellow)">{form["draws"]}N</strong></span>'
+        f'<span><strong style="color:var(--red)">{form["losses"]}D</strong></span>'
+        f'<span>BP : <strong>{form["goals_scored"]}</strong></span>'
+        f'<span>BC : <strong>{form["goals_conceded"]}</strong></span>'
+    )
+    return balls, stats
+
+
+def _fill(page: str, element_id: str, content: str) -> str:
+    """Insère `content` dans l'élément vide `id=element_id` du gabarit."""
+    start = page.find(f'id="{element_id}"')
+    if start < 0:
+        raise ValueError(f"Élément #{element_id} introuvable dans le gabarit")
+    end = page.index(">", start) + 1
+    return page[:end] + content + page[end:]
+
+
+def _embed(page: str, season: str, data: dict, club: str | None = None) -> str:
+    """Données embarquées avant app.js : `get()` les lit au lieu d'appeler l'API."""
+    payload = json.dumps(data, ensure_ascii=False).replace("</", "<\\/")
+    script = f"<script>const SEASON = {json.dumps(season)};"
+    if club:
+        script += f" const CLUB = {json.dumps(club)};"
+    script += f" const STATIC_DATA = {payload};</script>\n  "
+    marker = '<script src="/static/app'
+    return page.replace(marker, script + marker, 1)
+
+
+def _links(page: str, home: str, fcsm: str) -> str:
+    return page.replace('<a href="/"', f'<a href="{home}"').replace('<a href="/fcsm"', f'<a href="{fcsm}"')
+
+
+# ── Données (mêmes vues que l'API) ──────────────────────────────────────────
+def _rows(items) -> list[dict]:
+    return [r.model_dump(mode="json") for r in items]
+
+
+async def _national_data(db, season: str) -> dict:
+    return {
+        "/national/classement": _rows(await columnar.standings(db, season)),
+        "/national/buteurs": _rows(await columnar.scorers(db, season, TOP_SCORERS)),
+    }
+
+
+async def _club_data(db, team: TeamInfo, season: str) -> dict:
+    form = await columnar.club_form(db, team, season, FORM_LAST, with_matches=False)
+    prefix = f"/clubs/{team.short_name}"
+    return {
+        f"{prefix}/form": form.model_dump(mode="json", exclude={"matches"}),
+        f"{prefix}/buteurs": _rows(await columnar.club_scorers(db, team, season)),
+        f"{prefix}/passeurs": _rows(await columnar.club_assists(db, team, season)),
+        f"{prefix}/matches": _rows(await columnar.club_matches(db, team, season, LAST_MATCHES)),
+    }
+
+
+def _render_national(template: str, season: str, data: dict, home: str, fcsm: str) -> str:
+    page = template.replace("Championnat National 2024-2025", f"Championnat National {_season_label(season)}")
+    page = _fill(page, "tbody-classement", _classement_rows(data["/national/classement"]))
+    page = _fill(page, "tbody-buteurs", _buteurs_rows(data["/national/buteurs"]))
+    for section in ("classement", "buteurs"):
+        page = page.replace(f'id="loading-{section}" class="loading"', f'id="loading-{section}" class="loading hidden"')
+        page = page.replace(f'id="table-{section}" class="hidden"', f'id="table-{section}"')
+    return _embed(_links(page, home, fcsm), season, data)
+
+
+def _render_club(template: str, team: TeamInfo, season: str, data: dict, home: str, fcsm: str) -> str:
+    short, prefix = team.short_name, f"/clubs/{team.short_name}"
+    page = template.replace("FC Sochaux-Montbéliard 2024-2025", f"{e(team.name)} {_season_label(season)}")
+    if short != "FCSM":
+        page = (page.replace("<title>fcsmtop — FC Sochaux-Montbéliard</title>", f"<title>fcsmtop — {e(team.name)}</title>")
+                .replace("🟡 FCSM <span", f"{e(short)} <span")
+                .replace("Buteurs FCSM", f"Buteurs {e(short)}")
+                .replace("Passeurs FCSM", f"Passeurs {e(short)}"))
+    balls, stats = _form_html(data[f"{prefix}/form"])
+    page = _fill(page, "form-display", balls)
+    page = _fill(page, "form-stats", stats)
+    page = _fill(page, "tbody-fcsm-buteurs", _club_buteurs_rows(data[f"{prefix}/buteurs"]))
+    page = _fill(page, "tbody-fcsm-passeurs", _passeurs_rows(data[f"{prefix}/passeurs"]))
+    page = _fill(page, "tbody-fcsm-matches", _matches_rows(data[f"{prefix}/matches"]))
+    return _embed(_links(page, home, fcsm), season, data, club=short)
+
+
+# ── Build incrémental ─────────────────────────────────────────────────────────
+def _write(rel_path: str, content: str) -> str:
+    path = os.path.join(DIST, rel_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+    if rel_path.endswith((".html", ".json")):
+        precompress(path)
+    return hashlib.sha256(content.encode()).hexdigest()[:16]
+
+
+def _sha(rel_path: str):
+    try:
+        with open(os.path.join(DIST, rel_path), "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()[:16]
+    except FileNotFoundError:
+        return None
+
+
+class Build:
+    def __init__(self, previous: dict, force: bool):
+        self.previous = previous
+        self.force = force
+        self.pages: dict[str, dict] = {}
+        self.written = self.skipped = 0
+
+    def _fresh(self, rel_path: str, fingerprint: str) -> bool:
+        entry = self.previous.get(rel_path)
+        return (not self.force and entry is not None and entry["fingerprint"] == fingerprint
+                and _sha(rel_path) == entry["sha"])
+
+    def up_to_date(self, pages: list[tuple], fingerprint: str) -> bool:
+        """Vrai si toutes les pages (mêmes données) sont à jour ; sinon elles sont toutes à régénérer."""
+        if not all(self._fresh(path, fingerprint) for path, *_ in pages):
+            return False
+        for path, *_ in pages:
+            self.pages[path] = self.previous[path]
+        self.skipped += len(pages)
+        return True
+
+    def write(self, rel_path: str, fingerprint: str, content: str) -> None:
+        self.pages[rel_path] = {"fingerprint": fingerprint, "sha": _write(rel_path, content)}
+        self.written += 1
+
+    def write_data(self, season: str, data: dict) -> None:
+        for api_path, rows in data.items():
+            _write(f"data/{season}{api_path}.json", json.dumps(rows, ensure_ascii=False))
+
+
+async def prerender(seasons: list[str] | None, force: bool) -> dict:
+    t0 = time.perf_counter()
+    await init_db()
+    assets = _load_assets()
+    version = _templates_version(assets)
+    national_tpl, club_tpl = _template("index.html", assets), _template("fcsm.html", assets)
+
+    previous = {}
+    if os.path.exists(MANIFEST):
+        with open(MANIFEST, encoding="utf-8") as f:
+            previous = json.load(f).get("pages", {})
+    build = Build(previous, force)
+
+    async with AsyncSessionLocal() as db:
+        await teams.ensure(db)
+        known = await services.seasons(db)
+        current = known[0] if known else None
+        for season in seasons or known:
+            base = f"/saisons/{season}"
+            season_fp = _fingerprint(version, await services.season_fingerprint(db, season))
+            # (chemin, liens de navigation) ; la saison courante alimente aussi / et /fcsm
+            national_pages = [(f"saisons/{season}/index.html", f"{base}/", f"{base}/clubs/fcsm/")]
+            if season == current:
+                national_pages.append(("index.html", "/", "/fcsm"))
+            if not build.up_to_date(national_pages, season_fp):
+                data = await _national_data(db, season)
+                build.write_data(season, data)
+                for path, home, fcsm in national_pages:
+                    build.write(path, season_fp, _render_national(national_tpl, season, data, home, fcsm))
+
+            for team_id, club_fp in (await services.club_fingerprints(db, season)).items():
+                team = teams.get(team_id)
+                if team is None:
+                    continue
+                club_fp = _fingerprint(version, club_fp)
+                club_pages = [(f"saisons/{season}/clubs/{team.short_name.lower()}/index.html", f"{base}/", f"{base}/clubs/fcsm/")]
+                if season == current and team.short_name == "FCSM":
+                    club_pages.append(("fcsm.html", "/", "/fcsm"))
+                if build.up_to_date(club_pages, club_fp):
+                    continue
+                data = await _club_data(db, team, season)
+                build.write_data(season, data)
+                for path, home, fcsm in club_pages:
+                    build.write(path, club_fp, _render_club(club_tpl, team, season, data, home, fcsm))
+
+    # Pages des saisons non reconstruites cette fois-ci : conservées telles quelles
+    pages = {**previous, **build.pages} if seasons else build.pages
+    with open(MANIFEST, "w", encoding="utf-8") as f:
+        json.dump({"version": version, "pages": pages}, f, indent=1, sort_keys=True)
+    return {"written": build.written, "skipped": build.skipped, "seconds": round(time.perf_counter() - t0, 2)}
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Prérendu statique incrémental des pages")
+    p.add_argument("--season", action="append", help="Saison(s) à prérendre (défaut : toutes)")
+    p.add_argument("--force", action="store_true", help="Ignore les empreintes et reconstruit tout")
+    args = p.parse_args(argv)
+
+    summary = asyncio.run(prerender(args.season, args.force))
+    print(f"✅ {summary['written']} page(s) générée(s), {summary['skipped']} inchangée(s) "
+          f"en {summary['seconds']} s → {DIST}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""Réconcilie les fiches joueurs de plusieurs sources (base, data/players.json, data/scorers.json).
+
+Usage :
+    python scripts/reconcile.py                 # écrit data/reconciled/players.json + conflicts.json
+    python scripts/reconcile.py --apply         # + met à jour / crée les joueurs en base
+    python scripts/reconcile.py --source fff=exports/fff.json
+
+Les noms sont normalisés (accents, traits d'union, ordre prénom/nom) et
+rapprochés par club via un index haché (`api.normalize.Reconciler`) :
+chargement linéaire, même avec des milliers de joueurs et de nombreuses
+sources. Chaque joueur de la base ancre sa propre entité : `--apply` met à
+jour ce joueur précis, jamais un homonyme. Pour chaque champ, la source la
+plus fraîche (« après J29 ») puis la plus prioritaire l'emporte ; la base
+compte pour fraîche de la dernière journée jouée en base. Les divergences
+sont écrites dans conflicts.json pour relecture.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///./fcsmtop.db")
+
+from sqlalchemy import func, select
+
+from api.cache import ALL, cache
+from api.database import AsyncSessionLocal, init_db
+from api.models import Match, Player
+from api.normalize import Reconciler, team_key
+from api.seasons import CURRENT_SEASON
+from api.teams import registry as teams
+
+DATA = os.path.join(ROOT, "data")
+# Sources aux noms complets d'abord : les formes abrégées (« B. Fofana ») s'y rattachent ensuite
+DEFAULT_SOURCES = [
+    ("players.json", os.path.join(DATA, "players.json")),
+    ("scorers.json", os.path.join(DATA, "scorers.json")),
+]
+PLAYER_FIELDS = ("position", "nationality", "number")
+
+
+def _load_json(path: str) -> list[dict]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _team_key(team: str) -> str:
+    """Code court du club quand il est connu (« Sochaux », « FC Sochaux-Montbéliard » → « FCSM »)."""
+    info = teams.resolve(team or "")
+    return team_key(info.short_name if info else team)
+
+
+async def _base_players(rec: Reconciler) -> int:
+    """Ajoute les joueurs de la base comme source « base », chacun ancré sur son id ; retourne leur nombre."""
+    n = 0
+    async with AsyncSessionLocal() as db:
+        await teams.ensure(db)
+        # La base est à jour de sa dernière journée jouée : une source plus ancienne ne la contredit pas
+        matchday = await db.scalar(
+            select(func.max(Match.matchday)).where(Match.season == CURRENT_SEASON, Match.played.is_(True))
+        )
+        source = f"base — après J{matchday or 0}"
+        for p in (await db.execute(select(Player))).scalars():
+            rec.add(source, {
+                "first_name": p.first_name, "last_name": p.last_name, "team": teams.short_name(p.team_id),
+                "position": p.position, "nationality": p.nationality, "number": p.number,
+            }, player_id=p.id)
+            n += 1
+    return n
+
+
+async def _apply(merged: list[dict]) -> tuple[int, int]:
+    updated = created = 0
+    async with AsyncSessionLocal() as db:
+        await teams.ensure(db)
+        existing = {p.id: p for p in (await db.execute(select(Player))).scalars()}
+        for row in merged:
+            team = teams.resolve(row["team"] or "")
+            if team is None:
+                continue
+            player = existing.get(row["player_id"])
+            if player is None:
+                db.add(Player(
+                    first_name=row["first_name"], last_name=row["last_name"], team_id=team.id,
+                    position=row["position"] or "?", nationality=row["nationality"] or "Français",
+                    number=row["number"],
+                ))
+                created += 1
+                continue
+            changes = {f: row[f] for f in PLAYER_FIELDS if row[f] is not None and getattr(player, f) != row[f]}
+            if player.team_id != team.id:
+                changes["team_id"] = team.id
+            for name, value in changes.items():
+                setattr(player, name, value)
+            updated += bool(changes)
+        await db.commit()
+    if created or updated:
+        cache.bump(ALL)
+    return updated, created
+
+
+async def reconcile(sources: list[tuple[str, str]], out_dir: str, use_base: bool, apply: bool) -> dict:
+    t0 = time.perf_counter()
+    rec, n_records = Reconciler(), 0
+    if use_base:
+        await init_db()
+        rec = Reconciler(team_key=_team_key)  # noms de clubs résolus par le registre des équipes
+        n_records = await _base_players(rec)
+    for name, path in sources:
+        rows = _load_json(path)
+        rec.add_many(name, rows)
+        n_records += len(rows)
+
+    merged, conflicts = rec.merge()
+    os.makedirs(out_dir, exist_ok=True)
+    with open(os.path.join(out_dir, "players.json"), "w", encoding="utf-8") as f:
+        json.dump(merged, f, indent=2, ensure_ascii=False)
+    with open(os.path.join(out_dir, "conflicts.json"), "w", encoding="utf-8") as f:
+        json.dump({"conflicts": [c.as_dict() for c in conflicts], "ambiguous": rec.ambiguous},
+                  f, indent=2, ensure_ascii=False)
+
+    summary = {"records": n_records, "players": len(merged), "conflicts": len(conflicts),
+               "ambiguous": len(rec.ambiguous), "seconds": round(time.perf_counter() - t0, 3)}
+    if apply:
+        summary["updated"], summary["created"] = await _apply(merged)
+    return summary
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Réconciliation multi-sources des fiches joueurs")
+    p.add_argument("--source", action="append", default=[], metavar="NOM=CHEMIN",
+                   help="Source JSON supplémentaire (le nom sert à la priorité : fff, aiscore…)")
+    p.add_argument("--out-dir", default=os.path.join(DATA, "reconciled"))
+    p.add_argument("--no-base", action="store_true", help="Ne pas inclure les joueurs déjà en base")
+    p.add_argument("--apply", action="store_true", help="Écrit le résultat en base (joueurs créés / mis à jour)")
+    args = p.parse_args(argv)
+
+    sources = DEFAULT_SOURCES + [tuple(s.split("=", 1)) for s in args.source]
+    summary = asyncio.run(reconcile(sources, args.out_dir, not args.no_base, args.apply))
+    print(f"✅ {summary['records']} fiches → {summary['players']} joueurs en {summary['seconds']} s — "
+          f"{summary['conflicts']} conflit(s), {summary['ambiguous']} forme(s) ambiguë(s) → {args.out_dir}")
+    if args.apply:
+        print(f"💾 Base : {summary['updated']} joueur(s) mis à jour, {summary['created']} créé(s)")
+
+
+if __name__ == "__main__":
+    main()
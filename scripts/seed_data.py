@@ -16,6 +16,7 @@ if ROOT not in sys.path:
 
 os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///./fcsmtop.db")
 
+from api.cache import cache
 from api.database import AsyncSessionLocal, init_db
 from api.models import Team, Player, Match, Goal, Assist
 
@@ -187,6 +188,7 @@ async def seed():
                     db.add(Assist(match_id=match.id, player_id=assister.id))
 
         await db.commit()
+        cache.bump_leagues("2025", ["National"])
         print(f"✅ Données chargées : {len(TEAMS)} équipes, {len(FCSM_PLAYERS)} joueurs FCSM, "
               f"{len(MATCHES_DATA)} matchs, {len(FCSM_GOALS)} buts")
 
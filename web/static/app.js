@@ -1,6 +1,10 @@
 const API = '/api/v1';
+// Pages prérendues (scripts/prerender.py) : saison, club et données embarqués
+const SEASON_ID = typeof SEASON !== 'undefined' ? SEASON : '2025';
+const CLUB_ID = typeof CLUB !== 'undefined' ? CLUB : 'FCSM';
 
 async function get(path, params = {}) {
+  if (typeof STATIC_DATA !== 'undefined' && path in STATIC_DATA) return STATIC_DATA[path];
   const url = new URL(API + path, window.location.origin);
   Object.entries(params).forEach(([k, v]) => url.searchParams.set(k, v));
   const r = await fetch(url);
@@ -16,7 +20,7 @@ function resultBadge(r) {
 async function loadNational() {
   // Classement
   try {
-    const data = await get('/national/classement', { season: '2025' });
+    const data = await get('/national/classement', { season: SEASON_ID });
     const tbody = document.getElementById('tbody-classement');
     tbody.innerHTML = data.map(row => `
       <tr class="${row.team_short === 'FCSM' ? 'fcsm' : ''}">
@@ -38,7 +42,7 @@ async function loadNational() {
 
   // Top buteurs + chart
   try {
-    const data = await get('/national/buteurs', { season: '2025', limit: 10 });
+    const data = await get('/national/buteurs', { season: SEASON_ID, limit: 10 });
     const tbody = document.getElementById('tbody-buteurs');
     tbody.innerHTML = data.map(row => `
       <tr>
@@ -79,7 +83,7 @@ async function loadNational() {
 async function loadFCSM() {
   // Forme
   try {
-    const data = await get('/clubs/FCSM/form', { season: '2025', last: 5 });
+    const data = await get(`/clubs/${CLUB_ID}/form`, { season: SEASON_ID, last: 5, include: '' });
     const balls = document.getElementById('form-display');
     balls.innerHTML = data.form_string.split('').map(c =>
       `<div class="form-ball ${c}">${c}</div>`
@@ -95,7 +99,7 @@ async function loadFCSM() {
 
   // Buteurs FCSM
   try {
-    const data = await get('/clubs/FCSM/buteurs', { season: '2025' });
+    const data = await get(`/clubs/${CLUB_ID}/buteurs`, { season: SEASON_ID });
     const tbody = document.getElementById('tbody-fcsm-buteurs');
     tbody.innerHTML = data.map(r => `
       <tr>
@@ -125,7 +129,7 @@ async function loadFCSM() {
 
   // Passeurs FCSM
   try {
-    const data = await get('/clubs/FCSM/passeurs', { season: '2025' });
+    const data = await get(`/clubs/${CLUB_ID}/passeurs`, { season: SEASON_ID });
     const tbody = document.getElementById('tbody-fcsm-passeurs');
     tbody.innerHTML = data.map(r => `
       <tr>
@@ -138,7 +142,7 @@ async function loadFCSM() {
 
   // Derniers matchs
   try {
-    const data = await get('/clubs/FCSM/matches', { season: '2025', last: 10 });
+    const data = await get(`/clubs/${CLUB_ID}/matches`, { season: SEASON_ID, last: 10 });
     const tbody = document.getElementById('tbody-fcsm-matches');
     tbody.innerHTML = data.map(m => `
       <tr>